@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Refresh the committed HTML benchmark pages in ``html/`` from the URLs in ``pages.txt``.
+
+The benchmarks only read the committed pages, so their results do not depend on
+what the sites serve on the day. This fetches each page once, as the crawler would,
+writes it unmodified and records where it came from and when in
+``html/captured.json``. Commit the results:
+
+    python benchmarks/corpus/capture.py
+    python benchmarks/corpus/capture.py --only grants_search
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from acquire.pipeline.crawler import USER_AGENT
+
+CORPUS_DIR = Path(__file__).parent
+
+
+def read_manifest(path: Path) -> dict[str, str]:
+    pages = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            name, url = line.split(maxsplit=1)
+            pages[name] = url
+    return pages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--manifest", type=Path, default=CORPUS_DIR / "pages.txt")
+    parser.add_argument("--output", type=Path, default=CORPUS_DIR / "html")
+    parser.add_argument("--only", action="append", default=[], help="Capture only these names; repeatable")
+    args = parser.parse_args()
+
+    pages = read_manifest(args.manifest)
+    if args.only:
+        pages = {name: url for name, url in pages.items() if name in args.only}
+    sources_path = args.output / "captured.json"
+    sources = json.loads(sources_path.read_text()) if sources_path.exists() else {}
+
+    failed = 0
+    with httpx.Client(timeout=30.0, follow_redirects=True, headers={"User-Agent": USER_AGENT}) as client:
+        for name, url in pages.items():
+            try:
+                resp = client.get(url)
+                resp.raise_for_status()
+            except httpx.HTTPError as e:
+                print(f"{name:<28} FAILED {e}", file=sys.stderr)
+                failed += 1
+                continue
+            args.output.mkdir(parents=True, exist_ok=True)
+            (args.output / f"{name}.html").write_text(resp.text, encoding="utf-8")
+            sources[name] = {
+                "url": url,
+                "final_url": str(resp.url),
+                "captured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "bytes": len(resp.content),
+            }
+            print(f"{name:<28} {len(resp.content) / 1024:>7.0f} KiB  {resp.url}")
+
+    if len(pages) > failed:
+        sources_path.write_text(json.dumps(sources, indent=2, sort_keys=True) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Measure SQLite commit throughput under concurrent webhook and pipeline load.
+
+Runs the same workload against an engine with SQLAlchemy defaults and one built by
+``acquire.storage.database.build_engine`` (WAL, busy_timeout, pool sizing), each on
+a fresh database file:
+
+    python benchmarks/db_commit_throughput.py --webhooks 8 --pipelines 8 --seconds 10
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from acquire.models.db import ChangeEvent, PipelineStatus
+from acquire.storage import repository
+from acquire.storage.database import build_engine
+
+PIPELINE_STAGES = [
+    PipelineStatus.FETCHED,
+    PipelineStatus.TRIAGED,
+    PipelineStatus.CLASSIFIED,
+    PipelineStatus.ENRICHED,
+    PipelineStatus.NOTIFIED,
+]
+
+
+class Counters:
+    def __init__(self) -> None:
+        self.commits = 0
+        self.locked = 0
+
+
+async def _webhook_worker(factory, counters: Counters, deadline: float) -> None:
+    """Insert events as fast as possible, like a burst of changedetection.io webhooks."""
+    n = 0
+    while time.perf_counter() < deadline:
+        try:
+            async with factory() as session:
+                await repository.create_event(session, watch_uuid=f"bench-{n}", watch_url="https://example.gov")
+            counters.commits += 1
+        except OperationalError:
+            counters.locked += 1
+        n += 1
+
+
+async def _pipeline_worker(factory, counters: Counters, deadline: float) -> None:
+    """Walk recent events through every stage, committing after each one like the orchestrator."""
+    while time.perf_counter() < deadline:
+        async with factory() as session:
+            result = await session.execute(
+                select(ChangeEvent)
+                .where(ChangeEvent.pipeline_status == PipelineStatus.RECEIVED.value)
+                .order_by(ChangeEvent.id.desc())
+                .limit(1)
+            )
+            event = result.scalars().first()
+            if event is None:
+                await asyncio.sleep(0.001)
+                continue
+            for status in PIPELINE_STAGES:
+                event.pipeline_status = status.value
+                event.summary = "x" * 500
+                try:
+                    await repository.update_event(session, event)
+                    await repository.record_cost(session, "bench/model", 100, 50, 0.0001, event_id=event.id)
+                    counters.commits += 2
+                except OperationalError:
+                    counters.locked += 1
+                    await session.rollback()
+                    break
+
+
+async def _run(label: str, engine, webhooks: int, pipelines: int, seconds: float) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    counters = Counters()
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(_webhook_worker(factory, counters, deadline) for _ in range(webhooks)),
+        *(_pipeline_worker(factory, counters, deadline) for _ in range(pipelines)),
+    )
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+
+    print(
+        f"{label:>8}: {counters.commits:>7} commits in {elapsed:5.1f}s "
+        f"= {counters.commits / elapsed:8.1f} commits/s, {counters.locked} 'database is locked' errors"
+    )
+
+
+async def main(webhooks: int, pipelines: int, seconds: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        default_url = f"sqlite+aiosqlite:///{Path(tmp) / 'default.db'}"
+        tuned_url = f"sqlite+aiosqlite:///{Path(tmp) / 'tuned.db'}"
+        await _run("default", create_async_engine(default_url), webhooks, pipelines, seconds)
+        await _run("tuned", build_engine(tuned_url), webhooks, pipelines, seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite commit throughput benchmark")
+    parser.add_argument("--webhooks", type=int, default=8, help="Concurrent webhook inserters")
+    parser.add_argument("--pipelines", type=int, default=8, help="Concurrent pipeline updaters")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.webhooks, args.pipelines, args.seconds))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Compare HTML-to-text backends on the pages in ``benchmarks/corpus/html``.
+
+The committed pages are synthetic reconstructions of agency page structure, not
+saved agency pages, so the results compare backends with each other but do not
+reflect real pages (see ``benchmarks/corpus/README.md``; ``capture.py`` replaces
+them with real captures). For each page and each installed backend, reports the
+median extraction time, the extracted characters and the tokens the text costs in
+an LLM prompt. ``legacy`` is the pre-backend extractor (one line per text node),
+kept here as the baseline:
+
+    python benchmarks/html_extraction.py --repeat 50
+"""
+
+import argparse
+import json
+import statistics
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+from acquire.pipeline.extraction import BACKENDS, SKIP_TAGS, html_to_text
+
+CORPUS_DIR = Path(__file__).parent / "corpus" / "html"
+
+
+class _LegacyExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self._pieces: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self._skip_depth > 0:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth == 0 and data.strip():
+            self._pieces.append(data.strip())
+
+
+def _legacy_text(html: str) -> str:
+    parser = _LegacyExtractor()
+    parser.feed(html)
+    return "\n".join(parser._pieces)
+
+
+def _token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text)), "cl100k_base"
+    except Exception:
+        # tiktoken fetches its BPE files on first use; estimate when offline
+        return lambda text: len(text) // 4, "chars/4 estimate"
+
+
+def _time(fn, html: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR)
+    args = parser.parse_args()
+
+    count_tokens, token_source = _token_counter()
+    extractors = {"legacy": _legacy_text}
+    extractors.update({name: (lambda html, name=name: html_to_text(html, backend=name)) for name in sorted(BACKENDS)})
+
+    paths = sorted(args.corpus.glob("*.html"))
+    if not paths:
+        raise SystemExit(f"No pages in {args.corpus}; restore them from git or run benchmarks/corpus/capture.py")
+
+    sources_path = args.corpus / "captured.json"
+    sources = json.loads(sources_path.read_text()) if sources_path.exists() else {}
+    synthetic = [path.stem for path in paths if not sources.get(path.stem, {}).get("captured_at")]
+    if synthetic:
+        print(f"note: {len(synthetic)} of {len(paths)} pages are synthetic, not captured: {', '.join(synthetic)}")
+    print(f"tokens: {token_source}")
+    print(f"{'page':<32} {'backend':<11} {'KiB':>6} {'ms':>8} {'chars':>7} {'tokens':>7}")
+    totals: dict[str, list[float]] = {name: [0.0, 0] for name in extractors}
+    for path in paths:
+        html = path.read_text(encoding="utf-8")
+        for name, fn in extractors.items():
+            ms = _time(fn, html, args.repeat)
+            text = fn(html)
+            tokens = count_tokens(text)
+            totals[name][0] += ms
+            totals[name][1] += tokens
+            print(f"{path.stem:<32} {name:<11} {len(html) / 1024:>6.0f} {ms:>8.2f} {len(text):>7} {tokens:>7}")
+
+    print()
+    for name, (ms, tokens) in totals.items():
+        print(f"{'total':<32} {name:<11} {'':>6} {ms:>8.2f} {'':>7} {tokens:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""In-process stand-ins for changedetection.io, OpenRouter and Slack.
+
+Each factory returns a FastAPI app plus the counters the load test reports. The
+fakes answer just the endpoints the pipeline calls, with deterministic content.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+PREVIOUS_SNAPSHOT = """USDA Rural Development
+Programs and services for rural communities.
+Contact your state office for assistance."""
+
+ADDED_LINES = """Notice of Funding Opportunity: ReConnect Round {n} is now open.
+Applications for broadband deployment grants are due {month} 15, 2026.
+Read the NOFO at https://www.grants.gov/search-results-detail/{n}
+Related solicitation: https://sam.gov/opp/{uuid}/view"""
+
+MONTHS = ["January", "February", "March", "April", "May", "June"]
+
+
+class Counters:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+
+    def __repr__(self) -> str:
+        return f"{self.requests} requests, {self.errors} injected errors"
+
+
+async def _sleep(latency_ms: float, jitter: float, rng: random.Random) -> None:
+    if latency_ms > 0:
+        await asyncio.sleep(latency_ms / 1000 * rng.uniform(1 - jitter, 1 + jitter))
+
+
+def cdio_app(latency_ms: float = 20, jitter: float = 0.5, seed: int = 1) -> tuple[FastAPI, Counters]:
+    """The changedetection.io history API: every watch has two snapshots."""
+    app = FastAPI()
+    counters = Counters()
+    rng = random.Random(seed)
+
+    def snapshot(uuid: str, timestamp: str) -> str:
+        if timestamp == "1000":
+            return PREVIOUS_SNAPSHOT
+        n = int(hashlib.sha256(uuid.encode()).hexdigest()[:6], 16)
+        return PREVIOUS_SNAPSHOT + "\n" + ADDED_LINES.format(n=n, month=MONTHS[n % len(MONTHS)], uuid=uuid)
+
+    @app.get("/api/v1/watch/{uuid}/history")
+    async def history(uuid: str):
+        counters.requests += 1
+        await _sleep(latency_ms, jitter, rng)
+        return {"1000": "", "2000": ""}
+
+    @app.get("/api/v1/watch/{uuid}/history/{timestamp}")
+    async def history_entry(uuid: str, timestamp: str):
+        counters.requests += 1
+        await _sleep(latency_ms, jitter, rng)
+        return PlainTextResponse(snapshot(uuid, "2000" if timestamp == "latest" else timestamp))
+
+    return app, counters
+
+
+def _completion(prompt: str) -> dict:
+    """A plausible answer for whichever pipeline prompt this is."""
+    digest = hashlib.sha256(prompt.encode()).hexdigest()[:8]
+    if "Quickly assess" in prompt:
+        return {"meaningful": True, "triage_reasoning": "New funding opportunity", "discovered_links": []}
+    if '"classification"' in prompt:
+        return {
+            "classification": "RFP",
+            "confidence": 0.9,
+            "reasoning": "Open funding opportunity with a due date",
+            "key_signals": ["NOFO", "due date"],
+        }
+    return {
+        # Unique per event so notification de-duplication does not suppress it
+        "summary": f"ReConnect funding round is open ({digest})",
+        "recommended_actions": ["Review the NOFO"],
+        "urgency": "HIGH",
+        "key_dates": [],
+        "relevant_agencies": ["USDA"],
+    }
+
+
+def openrouter_app(
+    latency_ms: float = 800, jitter: float = 0.5, error_rate: float = 0.0, seed: int = 1
+) -> tuple[FastAPI, Counters]:
+    """An OpenAI-compatible chat completions endpoint with latency and error injection.
+
+    ``error_rate`` of requests fail, alternating between 429 and 500.
+    """
+    app = FastAPI()
+    counters = Counters()
+    rng = random.Random(seed)
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        counters.requests += 1
+        body = await request.json()
+        await _sleep(latency_ms, jitter, rng)
+        if rng.random() < error_rate:
+            counters.errors += 1
+            status = 429 if counters.errors % 2 else 500
+            return JSONResponse({"error": {"message": "injected failure"}}, status_code=status)
+
+        prompt = body["messages"][-1]["content"]
+        content = json.dumps(_completion(prompt))
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "model": body.get("model", "fake/model"),
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    return app, counters
+
+
+def slack_app(latency_ms: float = 50, jitter: float = 0.5, seed: int = 1) -> tuple[FastAPI, Counters]:
+    """A Slack incoming webhook that accepts every message."""
+    app = FastAPI()
+    counters = Counters()
+    rng = random.Random(seed)
+
+    @app.post("/services/{path:path}")
+    async def incoming_webhook(path: str):
+        counters.requests += 1
+        await _sleep(latency_ms, jitter, rng)
+        return PlainTextResponse("ok")
+
+    return app, counters
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Drive /webhooks/change at target rates against local fakes and report throughput.
+
+The API (with its delivery loops) and fake changedetection.io, OpenRouter and
+Slack servers all run in this process on loopback ports, against a fresh SQLite
+file. Each rate step fires webhooks open-loop for ``--seconds``, waits for the
+pipelines to finish, then reports events/s, p50/p95/p99 latencies per stage,
+commit and write-statement times (which include SQLite busy waits), 'database
+is locked' errors and peak memory. Raising the rate until events/s stops
+following it finds the saturation point:
+
+    python benchmarks/loadtest/run.py --rates 2,5,10,20 --seconds 20 --llm-latency-ms 800
+
+Application logs go to ``--log-file``.
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import socket
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+import uvicorn
+from sqlalchemy import event as sa_event
+from sqlalchemy.exc import OperationalError
+
+from fakes import cdio_app, openrouter_app, slack_app
+
+STAGES = ["webhook", "fetch_diff", "triage", "classify", "enrich", "pipeline", "commit", "db_write"]
+WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+class Recorder:
+    """Latency samples in seconds, by stage."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.locked = 0
+        self.crashed = 0
+        self.finished: set[int] = set()
+
+    def reset(self) -> None:
+        self.samples.clear()
+        self.locked = 0
+        self.crashed = 0
+
+    def timed(self, stage: str, fn):
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self.samples[stage].append(time.perf_counter() - start)
+
+        return wrapper
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float, float]:
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def _bind() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+def _url(sock: socket.socket) -> str:
+    host, port = sock.getsockname()
+    return f"http://{host}:{port}"
+
+
+async def _serve(app, sock: socket.socket, lifespan: str = "off") -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, log_level="critical", access_log=False, lifespan=lifespan))
+    server.task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        if server.task.done():
+            server.task.result()
+        await asyncio.sleep(0.01)
+    return server
+
+
+def _instrument(recorder: Recorder) -> None:
+    """Wrap the pipeline stages, session commits and SQLite writes with timers."""
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from acquire.api import webhooks
+    from acquire.pipeline import orchestrator
+    from acquire.storage.database import get_engine
+
+    for stage in ("fetch_diff", "triage", "classify", "enrich"):
+        setattr(orchestrator, stage, recorder.timed(stage, getattr(orchestrator, stage)))
+
+    run_pipeline = recorder.timed("pipeline", webhooks._run_pipeline)
+
+    async def tracked_pipeline(event_id: int):
+        try:
+            await run_pipeline(event_id)
+        except Exception:
+            recorder.crashed += 1
+        finally:
+            recorder.finished.add(event_id)
+
+    webhooks._run_pipeline = tracked_pipeline
+    AsyncSession.commit = recorder.timed("commit", AsyncSession.commit)
+
+    engine = get_engine().sync_engine
+
+    @sa_event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["write_started"] = time.perf_counter() if statement.lstrip().upper().startswith(WRITE_VERBS) else None
+
+    @sa_event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("write_started", None)
+        if started is not None:
+            recorder.samples["db_write"].append(time.perf_counter() - started)
+
+    @sa_event.listens_for(engine, "handle_error")
+    def _error(context):
+        if isinstance(context.original_exception, Exception) and "locked" in str(context.original_exception):
+            recorder.locked += 1
+
+
+async def _fire(client: httpx.AsyncClient, recorder: Recorder, n: int, event_ids: list[int], failures: list[int]):
+    start = time.perf_counter()
+    try:
+        resp = await client.post("/webhooks/change", json={
+            "watch_uuid": f"load-{n}",
+            "watch_url": f"https://www.rd.usda.gov/programs/{n}",
+        })
+        resp.raise_for_status()
+        event_ids.append(resp.json()["event_id"])
+    except httpx.HTTPError:
+        failures.append(n)
+    finally:
+        recorder.samples["webhook"].append(time.perf_counter() - start)
+
+
+async def _step(client, recorder: Recorder, rate: float, seconds: float, drain: float, offset: int, out) -> int:
+    from sqlalchemy import func, select
+
+    from acquire.models.db import ChangeEvent
+    from acquire.storage.database import get_session_factory
+
+    recorder.reset()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+    event_ids: list[int] = []
+    failures: list[int] = []
+    total = int(rate * seconds)
+    start = time.perf_counter()
+    sends = []
+    for i in range(total):
+        # Open loop: webhooks arrive on schedule whether or not the app keeps up
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        sends.append(asyncio.create_task(_fire(client, recorder, offset + i, event_ids, failures)))
+    await asyncio.gather(*sends)
+
+    deadline = time.perf_counter() + drain
+    while not recorder.finished.issuperset(event_ids) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    done = len(recorder.finished.intersection(event_ids))
+
+    async with get_session_factory()() as session:
+        rows = await session.execute(
+            select(ChangeEvent.pipeline_status, func.count())
+            .where(ChangeEvent.id.in_(event_ids))
+            .group_by(ChangeEvent.pipeline_status)
+        )
+        statuses = ", ".join(f"{status} {count}" for status, count in sorted(rows.all()))
+
+    print(f"\n== {rate:g} events/s offered for {seconds:g}s ==", file=out)
+    print(
+        f"events: {len(event_ids)} accepted, {len(failures)} rejected, {done} pipelines finished "
+        f"in {elapsed:.1f}s = {done / elapsed:.2f} events/s",
+        file=out,
+    )
+    print(f"statuses: {statuses or '-'}; {recorder.crashed} pipelines raised", file=out)
+    print(f"{'stage':<12} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}", file=out)
+    for stage in STAGES:
+        samples = recorder.samples.get(stage, [])
+        p50, p95, p99 = _percentiles(samples)
+        peak = max(samples, default=0.0)
+        print(
+            f"{stage:<12} {len(samples):>6} {p50 * 1000:>9.1f} {p95 * 1000:>9.1f} {p99 * 1000:>9.1f} {peak * 1000:>9.1f}",
+            file=out,
+        )
+    write_wait = sum(recorder.samples.get("db_write", []))
+    print(f"db: {write_wait:.2f}s in write statements, {recorder.locked} 'database is locked' errors", file=out)
+    memory = f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB"
+    if tracemalloc.is_tracing():
+        memory += f", peak Python heap this step {tracemalloc.get_traced_memory()[1] / 2**20:.0f} MiB"
+    print(f"memory: {memory}", file=out)
+    return offset + total
+
+
+async def main(args: argparse.Namespace) -> None:
+    out = sys.stdout
+    sockets = {name: _bind() for name in ("api", "cdio", "openrouter", "slack")}
+    tmp = tempfile.TemporaryDirectory()
+    os.environ.update({
+        "DATABASE_URL": f"sqlite+aiosqlite:///{Path(tmp.name) / 'loadtest.db'}",
+        "CDIO_BASE_URL": _url(sockets["cdio"]),
+        "OPENROUTER_BASE_URL": _url(sockets["openrouter"]),
+        "OPENROUTER_API_KEY": "loadtest",
+        "SLACK_WEBHOOK_URL": f"{_url(sockets['slack'])}/services/T0/B0/loadtest",
+        "DAILY_BUDGET_USD": "1000000",
+        "WEBHOOK_SECRET": "",
+    })
+    # The application logs through print(); send it to the log file, keep the report here
+    sys.stdout = open(args.log_file, "w")
+
+    from acquire.config import get_settings
+
+    get_settings.cache_clear()
+    from acquire.main import app
+
+    cdio, cdio_counters = cdio_app(args.cdio_latency_ms, args.jitter)
+    llm, llm_counters = openrouter_app(args.llm_latency_ms, args.jitter, args.llm_error_rate)
+    slack, slack_counters = slack_app(args.slack_latency_ms, args.jitter)
+    servers = [
+        await _serve(cdio, sockets["cdio"]),
+        await _serve(llm, sockets["openrouter"]),
+        await _serve(slack, sockets["slack"]),
+        await _serve(app, sockets["api"], lifespan="on"),
+    ]
+
+    recorder = Recorder()
+    _instrument(recorder)
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    limits = httpx.Limits(max_connections=args.max_connections)
+    try:
+        async with httpx.AsyncClient(base_url=_url(sockets["api"]), limits=limits, timeout=60.0) as client:
+            offset = 0
+            for rate in args.rates:
+                offset = await _step(client, recorder, rate, args.seconds, args.drain_seconds, offset, out)
+        print(f"\ncdio: {cdio_counters}; openrouter: {llm_counters}; slack: {slack_counters}", file=out)
+    finally:
+        for server in reversed(servers):
+            server.should_exit = True
+            try:
+                await server.task
+            except OperationalError:
+                pass
+        sys.stdout.close()
+        sys.stdout = out
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rates", type=lambda s: [float(r) for r in s.split(",")], default=[2.0, 5.0, 10.0],
+                        help="Comma-separated webhook rates (events/s), one step each")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Duration of each rate step")
+    parser.add_argument("--drain-seconds", type=float, default=120.0, help="Wait this long for pipelines after a step")
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fraction of LLM calls answered 429/500")
+    parser.add_argument("--cdio-latency-ms", type=float, default=20.0)
+    parser.add_argument("--slack-latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter", type=float, default=0.5, help="Latencies vary uniformly by this fraction")
+    parser.add_argument("--max-connections", type=int, default=200, help="Load generator connection limit")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also report the Python heap peak (slower)")
+    parser.add_argument("--log-file", default=os.devnull)
+    asyncio.run(main(parser.parse_args()))
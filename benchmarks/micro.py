@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Microbenchmarks for the pipeline's pure-CPU functions that run on the event loop.
+
+Covers ``fetcher._compute_diff``, ``extraction.html_to_text`` (once per installed
+backend), ``llm.client._extract_json`` and ``notifier._build_slack_blocks``, each on
+a small, median and huge input built deterministically from ``benchmarks/corpus``
+(synthetic pages, see its README). Results can be written as JSON and a later run
+compared against them; the comparison exits 1 when any case's median
+slows down by more than ``--threshold``:
+
+    python benchmarks/micro.py --output baseline.json
+    python benchmarks/micro.py --baseline baseline.json --threshold 1.15
+"""
+
+import argparse
+import functools
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+from acquire.config import get_settings
+from acquire.llm.client import _extract_json
+from acquire.models.db import ChangeEvent
+from acquire.pipeline.extraction import BACKENDS, html_to_text
+from acquire.pipeline.fetcher import _compute_diff
+from acquire.pipeline.notifier import _build_slack_blocks
+
+CORPUS_DIR = Path(__file__).parent / "corpus" / "html"
+SIZES = ("small", "median", "huge")
+HUGE_BYTES = 2 * 1024 * 1024
+
+
+def _pages() -> list[str]:
+    pages = [path.read_text(encoding="utf-8") for path in sorted(CORPUS_DIR.glob("*.html"))]
+    if not pages:
+        raise SystemExit(f"No pages in {CORPUS_DIR}; restore them from git or run benchmarks/corpus/capture.py")
+    return pages
+
+
+def _tile(text: str, size: int) -> str:
+    return (text * (size // len(text) + 1))[:size]
+
+
+def _edit(text: str, rng: random.Random, fraction: float) -> str:
+    """Replace a fraction of the lines, as a page update would."""
+    lines = text.splitlines()
+    for i in rng.sample(range(len(lines)), max(1, int(len(lines) * fraction))):
+        lines[i] = f"Updated {rng.randrange(10**6)}: {lines[i][::-1]}"
+    return "\n".join(lines)
+
+
+@functools.cache
+def html_inputs() -> dict[str, str]:
+    pages = sorted(_pages(), key=len)
+    return {
+        "small": "<html><body><h1>Program update</h1><p>Applications are due <b>May 15</b>.</p></body></html>",
+        "median": pages[len(pages) // 2],
+        "huge": _tile("".join(pages), HUGE_BYTES),
+    }
+
+
+@functools.cache
+def diff_inputs() -> dict[str, tuple[str, str]]:
+    rng = random.Random(46)
+    texts = {size: html_to_text(html, backend="stdlib") for size, html in html_inputs().items()}
+    # Tiled text repeats lines; number them so the huge snapshot has distinct lines
+    texts["huge"] = "\n".join(f"{i} {line}" for i, line in enumerate(texts["huge"].splitlines()))
+    return {size: (text, _edit(text, rng, 0.05)) for size, text in texts.items()}
+
+
+@functools.cache
+def json_inputs() -> dict[str, str]:
+    enrichment = {
+        "summary": "USDA opened ReConnect Round 6 with $700M for rural broadband deployment.",
+        "recommended_actions": [f"Action {i}: review eligibility and partner requirements" for i in range(6)],
+        "urgency": "HIGH",
+        "key_dates": ["2026-05-15: application deadline", "2026-03-01: webinar"],
+        "relevant_agencies": ["USDA", "RUS"],
+    }
+    huge = {**enrichment, "recommended_actions": [f"Action {i}: " + "x" * 200 for i in range(2000)]}
+    return {
+        # Parsed directly
+        "small": json.dumps({"meaningful": True, "triage_reasoning": "New NOFO", "discovered_links": []}),
+        # Markdown fences: the second strategy
+        "median": "```json\n" + json.dumps(enrichment, indent=2) + "\n```",
+        # Prose around the object: falls through to the brace search
+        "huge": "Here is the analysis you asked for.\n" + json.dumps(huge, indent=2) + "\nLet me know if you need more.",
+    }
+
+
+@functools.cache
+def urgency_emoji() -> dict:
+    return get_settings().load_yaml_config().get("slack", {}).get("urgency_emoji", {})
+
+
+@functools.cache
+def slack_inputs() -> dict[str, ChangeEvent]:
+    def event(n_items: int, summary_chars: int) -> ChangeEvent:
+        return ChangeEvent(
+            id=1,
+            watch_uuid="bench",
+            watch_url="https://www.rd.usda.gov/programs-services/telecommunications-programs/reconnect-loan-and-grant-program",
+            classification="RFP",
+            urgency="HIGH",
+            summary=_tile("ReConnect Round 6 is open for applications. ", summary_chars),
+            recommended_actions=[f"Review requirement {i}" for i in range(n_items)],
+            key_dates=[f"2026-05-{i % 28 + 1:02d}: milestone {i}" for i in range(n_items)],
+            relevant_agencies=[f"Agency {i}" for i in range(n_items)],
+        )
+
+    return {"small": event(1, 80), "median": event(4, 600), "huge": event(200, 20000)}
+
+
+def cases() -> dict[str, tuple]:
+    """Benchmark name -> (function, callable returning its positional args).
+
+    Inputs are built on first use, so cases left out by ``--filter`` never read the corpus.
+    """
+    result = {}
+    for size in SIZES:
+        result[f"compute_diff/{size}"] = (_compute_diff, lambda size=size: diff_inputs()[size])
+    # One case per installed backend, so a baseline is only ever compared with the same backend
+    for backend in sorted(BACKENDS):
+        for size in SIZES:
+            result[f"html_to_text[{backend}]/{size}"] = (
+                html_to_text,
+                lambda size=size, backend=backend: (html_inputs()[size], backend),
+            )
+    for size in SIZES:
+        result[f"extract_json/{size}"] = (_extract_json, lambda size=size: (json_inputs()[size],))
+    # The emoji map is read from settings.yaml up front so only block building is timed
+    for size in SIZES:
+        result[f"build_slack_blocks/{size}"] = (
+            _build_slack_blocks,
+            lambda size=size: (slack_inputs()[size], urgency_emoji()),
+        )
+    return result
+
+
+def measure(fn, args: tuple, repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(lambda: fn(*args))
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    rounds = [timer.timeit(number) / number for _ in range(repeat)]
+    return {
+        "median_us": statistics.median(rounds) * 1e6,
+        "min_us": min(rounds) * 1e6,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print each case against the baseline; return the names that regressed."""
+    regressed = []
+    missing = sorted(set(baseline.get("html_backends", [])) - set(BACKENDS))
+    if missing:
+        print(f"\nHTML backends in the baseline but not installed here, not compared: {', '.join(missing)}")
+    print(f"\n{'case':<34} {'baseline us':>12} {'now us':>12} {'ratio':>7}")
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<34} {'-':>12} {result['median_us']:>12.1f} {'new':>7}")
+            continue
+        ratio = result["median_us"] / before["median_us"]
+        flag = "  SLOWER" if ratio > threshold else ""
+        print(f"{name:<34} {before['median_us']:>12.1f} {result['median_us']:>12.1f} {ratio:>7.2f}{flag}")
+        if ratio > threshold:
+            regressed.append(name)
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="Timing rounds per case; the median is reported")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Seconds each round runs at least")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare against results saved with --output")
+    parser.add_argument("--threshold", type=float, default=1.10, help="Median ratio counted as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<34} {'median us':>12} {'min us':>12} {'loops':>7}")
+    for name, (fn, build_args) in cases().items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(fn, build_args(), args.repeat, args.min_time)
+        r = results[name]
+        print(f"{name:<34} {r['median_us']:>12.1f} {r['min_us']:>12.1f} {r['number']:>7}")
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "html_backends": sorted(BACKENDS),
+            "results": results,
+        }, indent=2) + "\n")
+
+    if args.baseline:
+        regressed = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} case(s) slower than {args.threshold:.2f}x baseline: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Restore archived diff/snapshot text (and deleted rows) from the retention archive."""
+
+import argparse
+import asyncio
+from datetime import date
+
+from acquire.config import get_settings
+from acquire.storage.database import init_db, get_session_factory
+from acquire.storage.retention import iter_archived_events, restore_event
+from acquire.utils.logging import setup_logging
+
+
+async def main(event_ids: set[int], start: date | None, end: date | None):
+    setup_logging()
+    await init_db()
+
+    archive_dir = get_settings().load_yaml_config().get("retention", {}).get("archive_dir", "data/archive")
+
+    # Later records for the same id supersede earlier ones
+    latest = {}
+    for record in iter_archived_events(archive_dir, start, end):
+        if not event_ids or record["id"] in event_ids:
+            latest[record["id"]] = record
+
+    factory = get_session_factory()
+    async with factory() as session:
+        for record in latest.values():
+            await restore_event(session, record)
+            print(f"Restored event {record['id']}: {record['watch_url']}")
+
+    print(f"Restored {len(latest)} event(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Restore events from the retention archive")
+    parser.add_argument("event_ids", type=int, nargs="*", help="Event ids to restore (default: all in range)")
+    parser.add_argument("--start", type=date.fromisoformat, help="First received date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Day after the last received date")
+    args = parser.parse_args()
+    asyncio.run(main(set(args.event_ids), args.start, args.end))
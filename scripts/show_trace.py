@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Print an event's trace from the tracing file exporter as an indented timeline."""
+
+import argparse
+import json
+from collections import defaultdict
+
+from acquire.utils.tracing import event_trace_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show where time went for an event")
+    parser.add_argument("event_id", type=int, help="The event, or the parent of a child event")
+    parser.add_argument("--file", default="data/traces.jsonl")
+    args = parser.parse_args()
+
+    trace_id = event_trace_id(args.event_id)
+    spans = []
+    with open(args.file, encoding="utf-8") as f:
+        for line in f:
+            span = json.loads(line)
+            if span["trace_id"] == trace_id:
+                spans.append(span)
+    if not spans:
+        print(f"No spans for event {args.event_id} in {args.file}")
+        return
+
+    ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    for span in spans:
+        children[span["parent_span_id"] if span["parent_span_id"] in ids else None].append(span)
+    start = min(span["start_ns"] for span in spans)
+
+    def show(span, depth):
+        offset_ms = (span["start_ns"] - start) / 1e6
+        attributes = " ".join(
+            f"{k}={v}" for k, v in span["attributes"].items() if v is not None and k not in ("parent_event_id",)
+        )
+        error = f"  ERROR {span['error']}" if span["error"] else ""
+        print(f"{offset_ms:>10.1f} {span['duration_ms']:>10.1f}  {'  ' * depth}{span['name']}  {attributes}{error}")
+        for child in sorted(children[span["span_id"]], key=lambda s: s["start_ns"]):
+            show(child, depth + 1)
+
+    print(f"{'start ms':>10} {'took ms':>10}  span")
+    for root in sorted(children[None], key=lambda s: s["start_ns"]):
+        show(root, 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import structlog
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from acquire.config import get_settings
+from acquire.models.schemas import ProfilingStatus, ProfilingUpdate
+from acquire.utils.profiling import get_loop_monitor, get_profiler
+
+logger = structlog.get_logger()
+
+router = APIRouter(prefix="/admin")
+
+
+def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    token = get_settings().admin_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+    if x_admin_token != token:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def _status() -> ProfilingStatus:
+    profiler = get_profiler()
+    return ProfilingStatus(
+        pipeline_rate=profiler.rates["pipeline"],
+        request_rate=profiler.rates["request"],
+        output_dir=str(profiler.output_dir),
+        profiles_written=profiler.written,
+        loop_lag=get_loop_monitor().stats(),
+    )
+
+
+@router.get("/profiling", response_model=ProfilingStatus, dependencies=[Depends(require_admin)])
+async def profiling_status():
+    return _status()
+
+
+@router.put("/profiling", response_model=ProfilingStatus, dependencies=[Depends(require_admin)])
+async def update_profiling(update: ProfilingUpdate):
+    get_profiler().set_rates(pipeline=update.pipeline_rate, request=update.request_rate)
+    logger.info("profiling_updated", pipeline_rate=update.pipeline_rate, request_rate=update.request_rate)
+    return _status()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from acquire.api.admin import require_admin
+from acquire.models.schemas import EventDeadline, EventPage, EventSearchHit
+from acquire.storage.database import get_session, get_session_factory
+from acquire.storage import repository
+
+# Event data is read with the admin token
+router = APIRouter(prefix="/events", dependencies=[Depends(require_admin)])
+
+EXPORT_BATCH_SIZE = 500
+
+
+def encode_cursor(received_at: datetime, event_id: int) -> str:
+    raw = json.dumps([received_at.isoformat(), event_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        received_at, event_id = json.loads(raw)
+        return datetime.fromisoformat(received_at), int(event_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    """A bound without an offset is taken as UTC, like the stored received_at."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_fields(fields: str | None) -> list[str] | None:
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(repository.EVENT_LIST_COLUMNS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+class EventFilters:
+    """Query parameters shared by the listing and the export."""
+
+    def __init__(
+        self,
+        status: list[str] | None = Query(None, description="Pipeline status; repeat for several"),
+        classification: list[str] | None = Query(None),
+        urgency: list[str] | None = Query(None),
+        watch_uuid: str | None = Query(None),
+        since: datetime | None = Query(None, description="Received at or after"),
+        until: datetime | None = Query(None, description="Received before"),
+        fields: str | None = Query(None, description="Comma-separated columns to return"),
+    ):
+        self.columns = _parse_fields(fields)
+        self.filters = {
+            "status": status,
+            "classification": classification,
+            "urgency": urgency,
+            "watch_uuid": watch_uuid,
+            "since": _as_utc(since),
+            "until": _as_utc(until),
+        }
+
+
+@router.get("", response_model=EventPage)
+async def list_events(
+    filters: EventFilters = Depends(),
+    cursor: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    session: AsyncSession = Depends(get_session),
+):
+    after = decode_cursor(cursor) if cursor else None
+    rows = await repository.list_events(
+        session, columns=filters.columns, after=after, limit=limit + 1, **filters.filters
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["received_at"], rows[-1]["id"])
+    return EventPage(items=jsonable_encoder(rows), next_cursor=next_cursor)
+
+
+@router.get("/export")
+async def export_events(
+    filters: EventFilters = Depends(),
+    factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """Stream every matching event as NDJSON, newest first.
+
+    Each batch is read in its own short session, so a long export neither holds
+    a read transaction open nor buffers the result set in memory.
+    """
+
+    async def lines():
+        after = None
+        while True:
+            async with factory() as session:
+                rows = await repository.list_events(
+                    session, columns=filters.columns, after=after, limit=EXPORT_BATCH_SIZE, **filters.filters
+                )
+            for row in rows:
+                yield json.dumps(jsonable_encoder(row)) + "\n"
+            if len(rows) < EXPORT_BATCH_SIZE:
+                return
+            after = (rows[-1]["received_at"], rows[-1]["id"])
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/search", response_model=list[EventSearchHit])
+async def search_events(
+    q: str = Query(..., min_length=1, description="Words to find; all must match. Use term* for prefixes."),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+):
+    return await repository.search_events(session, q, limit=limit)
+
+
+@router.get("/by-agency", response_model=list[dict])
+async def events_by_agency(
+    agency: str = Query(..., min_length=1, description="Agency name as enrichment lists it; case-insensitive"),
+    limit: int = Query(100, ge=1, le=500),
+    session: AsyncSession = Depends(get_session),
+):
+    """Most recent events naming ``agency`` among their relevant agencies."""
+    events = await repository.find_events_by_agency(session, agency, limit=limit)
+    return jsonable_encoder([{name: getattr(event, name) for name in repository.EVENT_LIST_COLUMNS} for event in events])
+
+
+@router.get("/deadlines", response_model=list[EventDeadline])
+async def upcoming_deadlines(
+    days: int = Query(14, ge=1, le=365, description="Key dates from today up to this many days ahead"),
+    session: AsyncSession = Depends(get_session),
+):
+    """Key dates falling in the next ``days`` days, soonest first; one item per date."""
+    return [
+        EventDeadline(
+            event_id=event.id,
+            key_date=key_date,
+            watch_url=event.watch_url,
+            classification=event.classification,
+            urgency=event.urgency,
+            summary=event.summary,
+        )
+        for event, key_date in await repository.find_upcoming_deadlines(session, days=days)
+    ]
@@ -8,13 +8,20 @@ from acquire.config import get_settings
 from acquire.models.schemas import WebhookPayload
 from acquire.storage.database import get_session
 from acquire.storage import repository
-from acquire.pipeline.orchestrator import run_pipeline
+from acquire.utils import profiling
 
 logger = structlog.get_logger()
 
 router = APIRouter(prefix="/webhooks")
 
 
+async def _run_pipeline(event_id: int) -> None:
+    # The orchestrator imports every pipeline stage (jinja2, httpx, the crawler); load it on first use
+    from acquire.pipeline.orchestrator import run_pipeline
+
+    await run_pipeline(event_id)
+
+
 @router.post("/change")
 async def receive_change(
     payload: WebhookPayload,
@@ -29,19 +36,25 @@ async def receive_change(
         if x_webhook_secret != settings.webhook_secret:
             raise HTTPException(status_code=401, detail="Invalid webhook secret")
 
-    event = await repository.create_event(
-        session,
-        watch_uuid=payload.watch_uuid,
-        watch_url=payload.watch_url,
-    )
-
-    logger.info(
-        "webhook_received",
-        event_id=event.id,
-        watch_uuid=payload.watch_uuid,
-        watch_url=payload.watch_url,
-    )
-
-    background_tasks.add_task(run_pipeline, event.id)
-
-    return {"status": "accepted", "event_id": event.id}
+    # Opened after authentication, so rejected requests are never profiled
+    async with profiling.profile("request", path="/webhooks/change") as profile:
+        event = await repository.create_event(
+            session,
+            watch_uuid=payload.watch_uuid,
+            watch_url=payload.watch_url,
+        )
+        if profile is not None:
+            profile.label(event_id=event.id)
+
+        logger.info(
+            "webhook_received",
+            event_id=event.id,
+            watch_uuid=payload.watch_uuid,
+            watch_url=payload.watch_url,
+        )
+
+        # In worker mode the event is picked up by an acquire-worker process instead
+        if not settings.load_yaml_config().get("worker", {}).get("enabled", False):
+            background_tasks.add_task(_run_pipeline, event.id)
+
+        return {"status": "accepted", "event_id": event.id}
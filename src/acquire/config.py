@@ -5,7 +5,7 @@ from functools import lru_cache
 
 import yaml
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
@@ -25,6 +25,7 @@ class Settings(BaseSettings):
 
     # OpenRouter
     openrouter_api_key: str = ""
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"
     openrouter_model: str = "anthropic/claude-sonnet-4"
 
     # Slack
@@ -36,18 +37,46 @@ class Settings(BaseSettings):
     # Webhook auth
     webhook_secret: str = ""
 
+    # /admin endpoints; disabled while empty
+    admin_token: str = ""
+
     # Database
     database_url: str = "sqlite+aiosqlite:///data/acquire.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_busy_timeout_ms: int = 5000
+    db_mmap_size: int = 256 * 1024 * 1024
 
     # Pipeline
     min_diff_length: int = 50
 
+    # Logging: console (colored, synchronous) or json (rendered on a writer thread)
+    log_format: str = "console"
+    log_level: str = "debug"
+    log_debug_sample_rate: float = 1.0  # fraction of debug records kept
+
+    # Profiling: fraction of pipeline runs / webhook requests profiled (adjustable via /admin/profiling)
+    profile_pipeline_rate: float = 0.0
+    profile_request_rate: float = 0.0
+
+    # (path, mtime_ns, parsed settings.yaml); callers must not mutate the dict
+    _yaml_cache: tuple[Path, int, dict] | None = PrivateAttr(default=None)
+
     def load_yaml_config(self) -> dict:
+        """Parsed settings.yaml, re-read only when the file's mtime changes."""
         settings_path = CONFIG_DIR / "settings.yaml"
-        if settings_path.exists():
-            with open(settings_path) as f:
-                return yaml.safe_load(f)
-        return {}
+        try:
+            mtime = settings_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        cached = self._yaml_cache
+        if cached is not None and cached[0] == settings_path and cached[1] == mtime:
+            return cached[2]
+        with open(settings_path) as f:
+            config = yaml.safe_load(f) or {}
+        self._yaml_cache = (settings_path, mtime, config)
+        return config
 
 
 @lru_cache
@@ -1,16 +1,44 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import re
+import weakref
 
 import structlog
 import httpx
 
 from acquire.config import get_settings
+from acquire.utils import tracing
 
 logger = structlog.get_logger()
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+# One pooled client per event loop: a client's connections belong to the loop that opened them
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.AsyncClient:
+    """The pooled OpenRouter client for the running event loop; connections are reused across calls."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(timeout=120.0, transport=tracing.transport())
+    return client
+
+
+async def close_client() -> None:
+    """Close the running loop's client, if it has one."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def open_connection() -> None:
+    """Connect (DNS, TCP, TLS) to the OpenRouter API ahead of the first completion."""
+    try:
+        await get_client().head(get_settings().openrouter_base_url)
+    except httpx.HTTPError as e:
+        logger.warning("llm_warm_up_failed", error=str(e)[:200])
 
 
 def _extract_json(text: str) -> dict | str:
@@ -74,10 +102,9 @@ async def chat_completion(
         "X-Title": "RC/RD Acquire",
     }
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        resp = await client.post(OPENROUTER_URL, json=body, headers=headers)
-        resp.raise_for_status()
-        data = resp.json()
+    resp = await get_client().post(f"{settings.openrouter_base_url.rstrip('/')}/chat/completions", json=body, headers=headers)
+    resp.raise_for_status()
+    data = resp.json()
 
     choice = data["choices"][0]
     usage = data.get("usage", {})
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
-from jinja2 import Template
-
 from acquire.config import CONFIG_DIR
 
+PROMPT_NAMES = ("triage", "classify", "enrich")
+
+
+@lru_cache(maxsize=32)
+def _compile(path: Path, mtime_ns: int):
+    # jinja2 is only needed once a pipeline runs; an edited file has a new mtime and recompiles
+    from jinja2 import Template
+
+    return Template(path.read_text())
+
+
+def get_template(name: str):
+    path = CONFIG_DIR / "prompts" / f"{name}.md"
+    return _compile(path, path.stat().st_mtime_ns)
+
 
 def load_prompt(name: str, **kwargs) -> str:
     """Load a prompt template from config/prompts/{name}.md and render with kwargs."""
-    path = CONFIG_DIR / "prompts" / f"{name}.md"
-    template_text = path.read_text()
-    template = Template(template_text)
-    return template.render(**kwargs)
+    return get_template(name).render(**kwargs)
@@ -1,23 +1,52 @@
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
+import asyncio
+import sys
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
+from acquire.pipeline.delivery import delivery_loop
+from acquire.pipeline.digest import digest_loop
 from acquire.storage.database import init_db
+from acquire.storage.retention import retention_loop
 from acquire.utils.logging import setup_logging
+from acquire.utils.profiling import loop_lag_loop
+from acquire.utils.tracing import setup_tracing, shutdown_tracing
+from acquire.warmup import open_connections, warm_up, warm_up_config
 from acquire.api.webhooks import router as webhooks_router
 from acquire.api.health import router as health_router
+from acquire.api.events import router as events_router
+from acquire.api.admin import router as admin_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
+    setup_tracing()
     await init_db()
+    background_tasks = [
+        asyncio.create_task(retention_loop()),
+        asyncio.create_task(delivery_loop()),
+        asyncio.create_task(digest_loop()),
+        asyncio.create_task(loop_lag_loop()),
+    ]
+    if warm_up_config().get("enabled", True):
+        await warm_up()
+        background_tasks.append(asyncio.create_task(open_connections()))
     yield
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    if "acquire.llm.client" in sys.modules:
+        await sys.modules["acquire.llm.client"].close_client()
+    shutdown_tracing()
 
 
 app = FastAPI(title="RC/RD Acquire", version="0.1.0", lifespan=lifespan)
 
 app.include_router(webhooks_router)
 app.include_router(health_router)
+app.include_router(events_router)
+app.include_router(admin_router)
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from typing import Optional
 from enum import Enum
 
+from sqlalchemy import JSON, Column, Index, text
 from sqlmodel import SQLModel, Field
 
 
@@ -18,6 +19,27 @@ class PipelineStatus(str, Enum):
     ERROR = "error"
 
 
+# Statuses whose pipeline has not finished; workers may claim these events
+CLAIMABLE_STATUSES = (
+    PipelineStatus.RECEIVED.value,
+    PipelineStatus.FETCHED.value,
+    PipelineStatus.TRIAGED.value,
+    PipelineStatus.CLASSIFIED.value,
+)
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"  # retries exhausted
+    SUPPRESSED = "suppressed"  # duplicate of an already-notified event
+
+
+class NotificationKind(str, Enum):
+    IMMEDIATE = "immediate"
+    DIGEST = "digest"
+
+
 class Classification(str, Enum):
     RFI = "RFI"
     RFP = "RFP"
@@ -33,19 +55,38 @@ class Urgency(str, Enum):
     LOW = "LOW"
 
 
+class ContentBlob(SQLModel, table=True):
+    """Deduplicated, compressed page/diff text keyed by its SHA-256."""
+
+    __tablename__ = "content_blobs"
+
+    hash: str = Field(primary_key=True)  # sha256 hex of the UTF-8 text
+    codec: str = "zlib"
+    size: int = 0  # uncompressed size in bytes
+    data: bytes
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
 class ChangeEvent(SQLModel, table=True):
     __tablename__ = "change_events"
+    __table_args__ = (
+        Index("ix_change_events_watch_uuid_received_at", "watch_uuid", "received_at"),
+        # json_each() over an array can't use an expression index; these partial
+        # indexes confine JSON queries to the rows that actually carry the field.
+        Index("ix_change_events_has_agencies", "received_at", sqlite_where=text("relevant_agencies IS NOT NULL")),
+        Index("ix_change_events_has_key_dates", "received_at", sqlite_where=text("key_dates IS NOT NULL")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
 
     # From webhook
     watch_uuid: str = Field(index=True)
     watch_url: str = ""
-    received_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    received_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), index=True)
 
-    # From changedetection.io fetch
-    diff_text: Optional[str] = None
-    snapshot_text: Optional[str] = None
+    # From changedetection.io fetch (content_blobs.hash; text is loaded on demand)
+    diff_hash: Optional[str] = Field(default=None, foreign_key="content_blobs.hash", index=True)
+    snapshot_hash: Optional[str] = Field(default=None, foreign_key="content_blobs.hash", index=True)
 
     # Classification
     classification: Optional[str] = None
@@ -56,34 +97,111 @@ class ChangeEvent(SQLModel, table=True):
 
     # Enrichment
     summary: Optional[str] = None
-    recommended_actions: Optional[str] = None  # JSON list stored as string
+    recommended_actions: Optional[list[str]] = Field(default=None, sa_column=Column(JSON(none_as_null=True)))
     urgency: Optional[str] = None
-    key_dates: Optional[str] = None  # JSON list stored as string
-    relevant_agencies: Optional[str] = None  # JSON list stored as string
+    key_dates: Optional[list[str]] = Field(default=None, sa_column=Column(JSON(none_as_null=True)))
+    relevant_agencies: Optional[list[str]] = Field(default=None, sa_column=Column(JSON(none_as_null=True)))
     enrichment_model: Optional[str] = None
     enrichment_tokens_used: Optional[int] = None
 
     # Triage
-    triage_result: Optional[str] = None  # JSON: {"meaningful": bool, "triage_reasoning": "..."}
+    # {"meaningful": bool, "triage_reasoning": "..."}
+    triage_result: Optional[dict] = Field(default=None, sa_column=Column(JSON(none_as_null=True)))
     triage_tokens_used: Optional[int] = None
-    discovered_links: Optional[str] = None  # JSON: [{"url": "...", "reason": "..."}]
+    # [{"url": "...", "reason": "..."}]
+    discovered_links: Optional[list[dict]] = Field(default=None, sa_column=Column(JSON(none_as_null=True)))
 
     # Parent-child linkage for discovered links
     parent_event_id: Optional[int] = Field(default=None, foreign_key="change_events.id", index=True)
 
     # Pipeline state
-    pipeline_status: str = PipelineStatus.RECEIVED.value
+    pipeline_status: str = Field(default=PipelineStatus.RECEIVED.value, index=True)
     error_message: Optional[str] = None
 
     # Slack
     slack_message_ts: Optional[str] = None
+    # Set when the notification was suppressed or threaded as a duplicate
+    duplicate_of_event_id: Optional[int] = Field(default=None, foreign_key="change_events.id")
+
+    # Worker lease: the process currently running this event's pipeline
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = Field(default=None, index=True)
+
+    # Retention: set once diff/snapshot text has been moved to the JSONL archive
+    archived_at: Optional[datetime] = None
+    # Set by a restore; the event is kept for another archive period from this time
+    restored_at: Optional[datetime] = None
+
+
+class NotificationOutbox(SQLModel, table=True):
+    """A notification owed for an event, written in the same transaction as its enrichment.
+
+    The delivery worker sends pending rows and retries failures with backoff;
+    ``idempotency_key`` keeps one row per event and destination.
+    """
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_due", "status", "kind", "next_attempt_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    event_id: int = Field(foreign_key="change_events.id", index=True)
+    destination: str = "slack"
+    kind: str = NotificationKind.IMMEDIATE.value
+    idempotency_key: str = Field(unique=True)  # "<event_id>:<destination>"
+    status: str = OutboxStatus.PENDING.value
+    attempts: int = 0
+    # Also pushed forward while a sender holds the row, so others skip it
+    next_attempt_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    last_error: Optional[str] = None
+    response: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    sent_at: Optional[datetime] = None
+
+
+class NotificationFingerprint(SQLModel, table=True):
+    """Fingerprint of a notified event, used to spot the same opportunity arriving again."""
+
+    __tablename__ = "notification_fingerprints"
+
+    fingerprint: str = Field(primary_key=True)  # sha256 hex
+    destination: str = Field(primary_key=True)
+    event_id: int = Field(foreign_key="change_events.id")
+    expires_at: datetime = Field(index=True)
+
+
+class CrawlCache(SQLModel, table=True):
+    """Last fetch of a discovered page, so it can be revalidated with a conditional GET."""
+
+    __tablename__ = "crawl_cache"
+
+    url: str = Field(primary_key=True)  # canonical URL
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    text: str = ""  # extracted text, at most max_chars long
+    max_chars: int = 0
+    validated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), index=True)
+
+
+class SeenUrl(SQLModel, table=True):
+    """A discovered link that already produced a child event, so rediscoveries are skipped."""
+
+    __tablename__ = "seen_urls"
+
+    url: str = Field(primary_key=True)  # canonical URL
+    event_id: int = Field(foreign_key="change_events.id")  # the child event it produced
+    expires_at: datetime = Field(index=True)
 
 
 class CostLedger(SQLModel, table=True):
     __tablename__ = "cost_ledger"
+    __table_args__ = (
+        Index("ix_cost_ledger_date_model", "date", "model"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    date: str = Field(index=True)  # YYYY-MM-DD
+    date: str  # YYYY-MM-DD
     model: str
     prompt_tokens: int = 0
     completion_tokens: int = 0
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, Field
 
 
 class WebhookPayload(BaseModel):
@@ -28,12 +30,61 @@ class DiscoveredLink(BaseModel):
     reason: str
 
 
+class LinkCandidate(BaseModel):
+    """A link found on the diff's added lines, offered to triage."""
+
+    url: str
+    text: str = ""
+    score: float = 0
+
+
 class TriageResult(BaseModel):
     meaningful: bool
     triage_reasoning: str
     discovered_links: list[DiscoveredLink] = []
 
 
+class EventSearchHit(BaseModel):
+    event_id: int
+    watch_url: str
+    received_at: datetime
+    pipeline_status: str
+    classification: str | None = None
+    urgency: str | None = None
+    summary: str | None = None
+    rank: float
+    snippet: str
+
+
+class EventDeadline(BaseModel):
+    event_id: int
+    key_date: str  # "YYYY-MM-DD: description"
+    watch_url: str
+    classification: str | None = None
+    urgency: str | None = None
+    summary: str | None = None
+
+
+class EventPage(BaseModel):
+    """One page of ``GET /events``; pass ``next_cursor`` back as ``cursor`` for the next page."""
+
+    items: list[dict]
+    next_cursor: str | None = None
+
+
+class ProfilingUpdate(BaseModel):
+    pipeline_rate: float | None = Field(None, ge=0, le=1)
+    request_rate: float | None = Field(None, ge=0, le=1)
+
+
+class ProfilingStatus(BaseModel):
+    pipeline_rate: float
+    request_rate: float
+    output_dir: str
+    profiles_written: int
+    loop_lag: dict
+
+
 class HealthResponse(BaseModel):
     status: str = "ok"
     version: str = "0.1.0"
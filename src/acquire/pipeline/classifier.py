@@ -21,7 +21,11 @@ async def classify(session: AsyncSession, event: ChangeEvent) -> ClassificationR
         logger.warning("classification_skipped_budget", event_id=event.id)
         return None
 
-    diff_text = (event.diff_text or event.snapshot_text or "")[:MAX_DIFF_CHARS]
+    diff_text = (
+        await repository.load_content(session, event.diff_hash)
+        or await repository.load_content(session, event.snapshot_hash)
+        or ""
+    )[:MAX_DIFF_CHARS]
 
     prompt = load_prompt(
         "classify",
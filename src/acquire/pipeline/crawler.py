@@ -1,67 +1,273 @@
 from __future__ import annotations
 
-from html.parser import HTMLParser
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
 
 import structlog
 import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acquire.config import get_settings
+from acquire.pipeline.extraction import get_extractor, html_to_text  # noqa: F401 (re-exported)
+from acquire.storage import repository
+from acquire.utils import tracing
+from acquire.utils.http import retry_after_seconds
+from acquire.utils.urls import canonicalize_url
 
 logger = structlog.get_logger()
 
-SKIP_TAGS = frozenset({"script", "style", "noscript", "svg", "head"})
+ALLOWED_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml", "text/plain"})
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+STREAM_CHUNK_CHARS = 16 * 1024
+USER_AGENT = "RC-RD-Acquire/0.1 (Government Procurement Monitor)"
+RETRY_STATUSES = frozenset({429, 503})
+
+
+class _HostState:
+    def __init__(self, max_per_host: int) -> None:
+        self.slots = asyncio.Semaphore(max_per_host)
+        self.pace_lock = asyncio.Lock()
+        self.next_request_at = 0.0
+        self.robots_lock = asyncio.Lock()
+        self.robots: RobotFileParser | None = None
+        self.robots_fetched_at = 0.0
+
+
+class CrawlScheduler:
+    """Politeness for page fetches: per-host concurrency caps, a minimum delay
+    between requests to a host, and a cached robots.txt check.
+
+    Requests over a cap wait their turn rather than failing. A host's delay is the
+    larger of ``min_delay`` and its robots.txt Crawl-delay, and grows to honour
+    Retry-After when the host throttles us.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_per_host: int = 2,
+        min_delay: float = 1.0,
+        respect_robots: bool = True,
+        robots_ttl: float = 24 * 3600,
+    ) -> None:
+        self.max_per_host = max_per_host
+        self.min_delay = min_delay
+        self.respect_robots = respect_robots
+        self.robots_ttl = robots_ttl
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._hosts: dict[str, _HostState] = {}
+
+    def _host(self, url: str) -> _HostState:
+        host = (urlsplit(url).hostname or "").lower()
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(self.max_per_host)
+        return self._hosts[host]
+
+    def _delay(self, host: _HostState) -> float:
+        crawl_delay = host.robots.crawl_delay(USER_AGENT) if host.robots else None
+        return max(self.min_delay, float(crawl_delay or 0))
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold a request slot for ``url``'s host, waiting for its caps and delay."""
+        host = self._host(url)
+        # Host first, so requests queued behind a busy host don't hold global slots
+        async with host.slots, self._slots:
+            async with host.pace_lock:
+                wait = host.next_request_at - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                host.next_request_at = time.monotonic() + self._delay(host)
+            yield
+
+    def back_off(self, url: str, seconds: float) -> None:
+        """Hold every request to ``url``'s host for at least ``seconds``."""
+        host = self._host(url)
+        host.next_request_at = max(host.next_request_at, time.monotonic() + seconds)
+
+    async def allowed(self, client: httpx.AsyncClient, url: str) -> bool:
+        """Whether robots.txt lets us fetch ``url``; robots.txt is cached per host."""
+        if not self.respect_robots:
+            return True
+        host = self._host(url)
+        async with host.robots_lock:
+            if host.robots is None or time.monotonic() - host.robots_fetched_at > self.robots_ttl:
+                host.robots = await self._fetch_robots(client, url)
+                host.robots_fetched_at = time.monotonic()
+        return host.robots.can_fetch(USER_AGENT, url)
+
+    async def _fetch_robots(self, client: httpx.AsyncClient, url: str) -> RobotFileParser:
+        parts = urlsplit(url)
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        try:
+            async with self.slot(robots_url):
+                resp = await client.get(robots_url)
+        except Exception as e:
+            logger.debug("robots_fetch_failed", url=robots_url, error=str(e)[:200])
+            parser.allow_all = True
+            return parser
+        # Same conventions as RobotFileParser.read()
+        if resp.status_code in (401, 403):
+            parser.disallow_all = True
+        elif resp.status_code >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(resp.text.splitlines())
+        return parser
 
 
-class _TextExtractor(HTMLParser):
-    """Strip HTML to plain text, skipping script/style/noscript tags."""
+_scheduler: CrawlScheduler | None = None
+_scheduler_loop: asyncio.AbstractEventLoop | None = None
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._pieces: list[str] = []
-        self._skip_depth = 0
 
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        if tag in SKIP_TAGS:
-            self._skip_depth += 1
+def _politeness_config() -> dict:
+    return get_settings().load_yaml_config().get("link_discovery", {}).get("politeness", {}) or {}
 
-    def handle_endtag(self, tag: str) -> None:
-        if tag in SKIP_TAGS and self._skip_depth > 0:
-            self._skip_depth -= 1
 
-    def handle_data(self, data: str) -> None:
-        if self._skip_depth == 0:
-            text = data.strip()
-            if text:
-                self._pieces.append(text)
+def get_scheduler() -> CrawlScheduler:
+    """The process-wide scheduler for the running event loop."""
+    global _scheduler, _scheduler_loop
+    loop = asyncio.get_running_loop()
+    if _scheduler is None or _scheduler_loop is not loop:
+        config = _politeness_config()
+        _scheduler = CrawlScheduler(
+            max_concurrency=config.get("max_concurrency", 8),
+            max_per_host=config.get("max_per_host", 2),
+            min_delay=config.get("min_delay_seconds", 1.0),
+            respect_robots=config.get("respect_robots", True),
+            robots_ttl=config.get("robots_ttl_hours", 24) * 3600,
+        )
+        _scheduler_loop = loop
+    return _scheduler
 
-    def get_text(self) -> str:
-        return "\n".join(self._pieces)
 
+def _reject_reason(resp: httpx.Response, max_bytes: int) -> str | None:
+    content_type = resp.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type and content_type not in ALLOWED_CONTENT_TYPES:
+        return f"content type {content_type}"
+    content_length = resp.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        return f"content length {content_length}"
+    return None
 
-def html_to_text(html: str) -> str:
-    """Convert HTML string to plain text."""
-    parser = _TextExtractor()
-    parser.feed(html)
-    return parser.get_text()
 
+def _retry_after(resp: httpx.Response) -> float:
+    max_wait = _politeness_config().get("max_retry_after_seconds", 60)
+    return retry_after_seconds(resp.headers.get("Retry-After"), 5, max_wait)
 
-async def fetch_page_text(url: str, max_chars: int = 8000) -> str | None:
-    """Fetch a URL and return plain text content, or None on failure."""
+
+def _cache_config() -> dict:
+    return get_settings().load_yaml_config().get("link_discovery", {}).get("cache", {}) or {}
+
+
+async def _read_text(resp: httpx.Response, url: str, max_chars: int, max_bytes: int) -> str:
+    is_html = "html" in resp.headers.get("content-type", "")
+    parser = get_extractor() if is_html else None
+    pieces: list[str] = []
+    text_length = 0
+    async for chunk in resp.aiter_text(STREAM_CHUNK_CHARS):
+        if parser:
+            parser.feed(chunk)
+            text_length = parser.text_length
+        else:
+            pieces.append(chunk)
+            text_length += len(chunk)
+        if text_length >= max_chars or resp.num_bytes_downloaded >= max_bytes:
+            logger.debug("page_fetch_truncated", url=url, bytes=resp.num_bytes_downloaded)
+            break
+
+    if parser:
+        parser.close()
+        return parser.get_text()[:max_chars]
+    return "".join(pieces)[:max_chars]
+
+
+async def fetch_page_text(
+    url: str,
+    max_chars: int = 8000,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    session: AsyncSession | None = None,
+) -> str | None:
+    """Fetch a URL and return plain text content, or None on failure.
+
+    The body is streamed: reading stops after ``max_bytes`` or once ``max_chars`` of
+    text have been extracted, and non-text content types are rejected from the
+    headers alone. Requests go through the shared CrawlScheduler, and 429/503
+    responses are retried after the host's Retry-After.
+
+    With a ``session`` the text is cached in crawl_cache under the canonical URL.
+    Within ``link_discovery.cache.ttl_hours`` it is returned without a request;
+    after that the page is revalidated with If-None-Match/If-Modified-Since and a
+    304 reuses the cached text without downloading or parsing anything.
+    """
+    cache_config = _cache_config()
+    use_cache = session is not None and cache_config.get("enabled", True)
+    key = canonicalize_url(url)
+    cached = None
+    headers = {}
+    if use_cache:
+        cached = await repository.get_crawl_cache(session, key)
+        if cached is not None and cached.max_chars < max_chars:
+            cached = None  # cached text was cut shorter than this caller wants
+        if cached is not None:
+            validated_at = cached.validated_at.replace(tzinfo=cached.validated_at.tzinfo or timezone.utc)
+            if datetime.now(timezone.utc) - validated_at < timedelta(hours=cache_config.get("ttl_hours", 24)):
+                logger.debug("crawl_cache_hit", url=url)
+                return cached.text[:max_chars] or None
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+    scheduler = get_scheduler()
+    retries = _politeness_config().get("max_retries", 2)
     try:
         async with httpx.AsyncClient(
             timeout=20.0,
             follow_redirects=True,
-            headers={"User-Agent": "RC-RD-Acquire/0.1 (Government Procurement Monitor)"},
+            transport=tracing.transport(),
+            headers={"User-Agent": USER_AGENT},
         ) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
+            if not await scheduler.allowed(client, url):
+                logger.info("page_fetch_disallowed", url=url, reason="robots.txt")
+                return None
 
-        content_type = resp.headers.get("content-type", "")
-        if "html" in content_type:
-            text = html_to_text(resp.text)
-        else:
-            text = resp.text
-
-        return text[:max_chars] if text else None
+            for attempt in range(retries + 1):
+                async with scheduler.slot(url), client.stream("GET", url, headers=headers) as resp:
+                    if resp.status_code in RETRY_STATUSES and attempt < retries:
+                        retry_after = _retry_after(resp)
+                        logger.info("page_fetch_throttled", url=url, status=resp.status_code, retry_after=retry_after)
+                        scheduler.back_off(url, retry_after)
+                        continue
+                    not_modified = resp.status_code == 304 and cached is not None
+                    if not not_modified:
+                        resp.raise_for_status()
+                        reason = _reject_reason(resp, max_bytes)
+                        if reason:
+                            logger.info("page_fetch_rejected", url=url, reason=reason)
+                            return None
+                        text = await _read_text(resp, url, max_chars, max_bytes)
+                    etag = resp.headers.get("etag")
+                    last_modified = resp.headers.get("last-modified")
+                    break
 
     except Exception as e:
         logger.warning("page_fetch_failed", url=url, error=str(e)[:200])
         return None
+
+    # The cache keeps the limit its text was cut to; the caller still gets at most max_chars
+    cached_chars = max_chars
+    if not_modified:
+        logger.info("crawl_cache_revalidated", url=url)
+        text = cached.text
+        cached_chars = cached.max_chars
+        etag = etag or cached.etag
+        last_modified = last_modified or cached.last_modified
+    if use_cache:
+        await repository.save_crawl_cache(session, key, text, cached_chars, etag=etag, last_modified=last_modified)
+    return text[:max_chars] or None
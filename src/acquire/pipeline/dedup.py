@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acquire.config import get_settings
+from acquire.models.db import ChangeEvent
+from acquire.storage import repository
+from acquire.utils.urls import canonicalize_url
+
+MODE_SUPPRESS = "suppress"
+MODE_THREAD = "thread"
+
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACE = re.compile(r"\s+")
+
+
+def dedup_config() -> dict:
+    return get_settings().load_yaml_config().get("notifications", {}).get("dedup", {}) or {}
+
+
+def normalize_summary(summary: str | None) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return _SPACE.sub(" ", _NON_WORD.sub(" ", (summary or "").lower())).strip()
+
+
+def _date_key(key_dates: list[str] | None) -> str:
+    return ",".join(sorted({d for entry in key_dates or [] for d in _ISO_DATE.findall(entry)}))
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def event_fingerprints(event: ChangeEvent) -> list[str]:
+    """Fingerprints identifying the opportunity an event announces.
+
+    One covers the canonical URL with the summary and dates; the other leaves the
+    URL out so a child page or mirror site with the same summary and dates matches.
+    """
+    summary = normalize_summary(event.summary)
+    dates = _date_key(event.key_dates)
+    fingerprints = [_digest("url", canonicalize_url(event.watch_url), summary, dates)]
+    if summary:
+        fingerprints.append(_digest("content", summary, dates))
+    return fingerprints
+
+
+async def claim_fingerprints(session: AsyncSession, event: ChangeEvent, destination: str, now: datetime) -> int | None:
+    """Return the earlier event this one duplicates at ``destination``, or None.
+
+    When it is not a duplicate its fingerprints are recorded (uncommitted), so later
+    events in the same batch match it too.
+    """
+    config = dedup_config()
+    if not config.get("enabled", False):
+        return None
+    fingerprints = event_fingerprints(event)
+    original = await repository.find_fingerprint(session, fingerprints, destination, now)
+    if original is not None and original != event.id:
+        return original
+    expires_at = now + timedelta(days=config.get("ttl_days", 14))
+    await repository.record_fingerprints(session, fingerprints, destination, event.id, expires_at)
+    return None
+
+
+async def release_fingerprints(session: AsyncSession, event: ChangeEvent, destination: str) -> None:
+    """Forget fingerprints claimed for a notification that was not delivered."""
+    if dedup_config().get("enabled", False):
+        await repository.delete_fingerprints(session, destination, event.id)
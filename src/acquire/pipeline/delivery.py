@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from acquire.config import get_settings
+from acquire.models.db import ChangeEvent, NotificationKind, NotificationOutbox, OutboxStatus, PipelineStatus
+from acquire.pipeline import dedup
+from acquire.pipeline.notifier import notify_duplicate, notify_slack
+from acquire.pipeline.routing import destination_url
+from acquire.storage import repository
+from acquire.storage.database import get_session_factory
+
+logger = structlog.get_logger()
+
+
+def notification_config() -> dict:
+    return get_settings().load_yaml_config().get("notifications", {}) or {}
+
+
+def backoff_delay(attempts: int, config: dict) -> float:
+    """Seconds to wait after the ``attempts``-th failed try: base * 2^(attempts-1), capped."""
+    base = config.get("backoff_base_seconds", 30)
+    return min(base * 2 ** max(attempts - 1, 0), config.get("backoff_max_seconds", 3600))
+
+
+async def mark_sent(session: AsyncSession, row: NotificationOutbox, response: str, now: datetime) -> None:
+    """Record a delivered row and move its event to NOTIFIED; the caller commits.
+
+    The event is NOTIFIED once any destination has it; each row keeps its own result.
+    """
+    row.status = OutboxStatus.SENT.value
+    row.response = response
+    row.sent_at = now
+    row.last_error = None
+    session.add(row)
+
+    event = await repository.get_event(session, row.event_id)
+    if event is not None and event.pipeline_status != PipelineStatus.NOTIFIED.value:
+        event.slack_message_ts = response
+        event.pipeline_status = PipelineStatus.NOTIFIED.value
+        session.add(event)
+
+
+def mark_failed(row: NotificationOutbox, error: str, config: dict, now: datetime, retry_at: datetime | None = None) -> None:
+    """Schedule the next attempt with backoff, or give up after ``max_attempts``."""
+    row.last_error = error[:500]
+    if row.attempts >= config.get("max_attempts", 6):
+        row.status = OutboxStatus.FAILED.value
+        logger.error("notification_failed", outbox_id=row.id, event_id=row.event_id, attempts=row.attempts)
+    else:
+        row.next_attempt_at = retry_at or now + timedelta(seconds=backoff_delay(row.attempts, config))
+        logger.warning(
+            "notification_retry_scheduled",
+            outbox_id=row.id,
+            event_id=row.event_id,
+            attempts=row.attempts,
+            next_attempt_at=row.next_attempt_at.isoformat(),
+        )
+
+
+def mark_suppressed(session: AsyncSession, row: NotificationOutbox, event: ChangeEvent, original_event_id: int) -> None:
+    row.status = OutboxStatus.SUPPRESSED.value
+    row.last_error = None
+    event.duplicate_of_event_id = original_event_id
+    session.add_all([row, event])
+    logger.info("notification_suppressed", event_id=event.id, original_event_id=original_event_id)
+
+
+async def _send(
+    row: NotificationOutbox, event: ChangeEvent, duplicate_of: int | None = None
+) -> tuple[str | None, str | None]:
+    """Post one outbox row. Returns (response, error); touches no database state."""
+    url = destination_url(row.destination)
+    if not url:
+        return None, f"No webhook URL configured for destination '{row.destination}'"
+    try:
+        if duplicate_of is not None:
+            response = await notify_duplicate(event, duplicate_of, url=url, destination=row.destination)
+        else:
+            response = await notify_slack(event, url=url, destination=row.destination)
+    except Exception as e:
+        return None, str(e)
+    return response, None if response else "Slack notification failed"
+
+
+async def deliver_pending(factory: async_sessionmaker[AsyncSession] | None = None) -> int:
+    """Send due immediate notifications. Returns the number delivered.
+
+    Rows are posted concurrently, so an event routed to several destinations takes
+    as long as the slowest one. Fingerprint claims are committed before posting and
+    results in a second commit, so no write transaction is held across the sends.
+    """
+    config = notification_config()
+    factory = factory or get_session_factory()
+
+    async with factory() as session:
+        rows = await repository.claim_notifications(
+            session,
+            NotificationKind.IMMEDIATE.value,
+            lease_seconds=config.get("lease_seconds", 60),
+            limit=config.get("batch_size", 20),
+        )
+        events = {row.event_id: await repository.get_event(session, row.event_id) for row in rows}
+        now = datetime.now(timezone.utc)
+        thread_duplicates = dedup.dedup_config().get("mode", dedup.MODE_SUPPRESS) == dedup.MODE_THREAD
+
+        sendable: list[tuple[NotificationOutbox, int | None]] = []
+        for row in rows:
+            event = events[row.event_id]
+            if event is None:
+                row.status = OutboxStatus.FAILED.value
+                row.last_error = "Event no longer exists"
+                session.add(row)
+                continue
+            duplicate_of = await dedup.claim_fingerprints(session, event, row.destination, now)
+            if duplicate_of is not None and not thread_duplicates:
+                mark_suppressed(session, row, event, duplicate_of)
+                continue
+            sendable.append((row, duplicate_of))
+        await session.commit()
+
+        results = await asyncio.gather(
+            *(_send(row, events[row.event_id], duplicate_of) for row, duplicate_of in sendable)
+        )
+
+        now = datetime.now(timezone.utc)
+        delivered = 0
+        for (row, duplicate_of), (response, error) in zip(sendable, results):
+            event = events[row.event_id]
+            if response:
+                await mark_sent(session, row, response, now)
+                if duplicate_of is not None:
+                    event.duplicate_of_event_id = duplicate_of
+                delivered += 1
+            else:
+                mark_failed(row, error, config, now)
+                session.add(row)
+                if duplicate_of is None:
+                    await dedup.release_fingerprints(session, event, row.destination)
+        await session.commit()
+
+    if rows:
+        logger.info("notifications_delivered", claimed=len(rows), delivered=delivered)
+    return delivered
+
+
+async def delivery_loop() -> None:
+    """Poll the outbox every ``notifications.poll_interval_seconds`` until cancelled."""
+    interval = notification_config().get("poll_interval_seconds", 2)
+    while True:
+        try:
+            await deliver_pending()
+        except Exception as e:
+            logger.exception("notification_delivery_error", error=str(e)[:200])
+        await asyncio.sleep(interval)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from acquire.config import get_settings
+from acquire.models.db import ChangeEvent, NotificationKind, NotificationOutbox, OutboxStatus
+from acquire.pipeline.dedup import claim_fingerprints, release_fingerprints
+from acquire.pipeline.delivery import mark_failed, mark_sent, mark_suppressed, notification_config
+from acquire.pipeline.notifier import _post_to_slack, _truncate
+from acquire.pipeline.routing import destination_url
+from acquire.storage import repository
+from acquire.storage.database import get_session_factory
+
+logger = structlog.get_logger()
+
+# Slack Block Kit limits
+MAX_BLOCKS_PER_MESSAGE = 50
+MAX_SECTION_CHARS = 3000
+MAX_HEADER_CHARS = 150
+
+
+def digest_config() -> dict:
+    return get_settings().load_yaml_config().get("slack", {}).get("digest", {}) or {}
+
+
+def should_digest(event: ChangeEvent) -> bool:
+    """Whether the event waits for the next digest instead of being sent immediately."""
+    config = digest_config()
+    if not config.get("enabled", False):
+        return False
+    return (event.urgency or "MEDIUM") in config.get("urgencies", ["MEDIUM", "LOW"])
+
+
+def _event_section(event: ChangeEvent, urgency_emoji: dict) -> dict:
+    urgency = event.urgency or "MEDIUM"
+    emoji = urgency_emoji.get(urgency, ":large_blue_circle:")
+    lines = [
+        f"{emoji} *{event.classification or 'UNKNOWN'}* ({urgency}) "
+        f"<{event.watch_url}|{_truncate(event.watch_url, 80)}>"
+    ]
+    if event.summary:
+        lines.append(event.summary)
+    if event.key_dates:
+        lines.append(":calendar: " + "; ".join(event.key_dates[:3]))
+    lines.append(f"Event #{event.id}")
+    return {
+        "type": "section",
+        "text": {"type": "mrkdwn", "text": _truncate("\n".join(lines), MAX_SECTION_CHARS)},
+    }
+
+
+def build_digest_messages(events: list[ChangeEvent]) -> list[tuple[list[ChangeEvent], dict]]:
+    """Split events into Slack payloads of at most 50 blocks, each paired with its events."""
+    urgency_emoji = get_settings().load_yaml_config().get("slack", {}).get("urgency_emoji", {})
+    # One header block per message, the rest are one section per event
+    per_message = MAX_BLOCKS_PER_MESSAGE - 1
+    chunks = [events[i : i + per_message] for i in range(0, len(events), per_message)]
+
+    messages = []
+    for number, chunk in enumerate(chunks, 1):
+        title = f":newspaper: Digest: {len(chunk)} update{'s' if len(chunk) != 1 else ''}"
+        if len(chunks) > 1:
+            title += f" ({number}/{len(chunks)})"
+        blocks = [{"type": "header", "text": {"type": "plain_text", "text": _truncate(title, MAX_HEADER_CHARS)}}]
+        blocks += [_event_section(event, urgency_emoji) for event in chunk]
+        messages.append((chunk, {"text": title, "blocks": blocks}))
+    return messages
+
+
+async def send_digest(factory: async_sessionmaker[AsyncSession] | None = None) -> int:
+    """Send pending digest notifications from the outbox. Returns the number of events delivered.
+
+    Rows in a message that fails are retried on the next run, up to
+    ``notifications.max_attempts``.
+    """
+    config = digest_config()
+    delivery_config = notification_config()
+    factory = factory or get_session_factory()
+    sent = 0
+
+    async with factory() as session:
+        rows = await repository.claim_notifications(
+            session,
+            NotificationKind.DIGEST.value,
+            lease_seconds=delivery_config.get("lease_seconds", 60),
+            limit=config.get("max_events", 500),
+        )
+        # One digest per destination; destinations are posted to concurrently.
+        # Duplicates of already-notified events are left out of the digest.
+        now = datetime.now(timezone.utc)
+        by_destination: dict[str, dict[int, NotificationOutbox]] = defaultdict(dict)
+        events = {}
+        for row in rows:
+            event = await repository.get_event(session, row.event_id)
+            if event is None:
+                row.status = OutboxStatus.FAILED.value
+                row.last_error = "Event no longer exists"
+                session.add(row)
+                continue
+            duplicate_of = await claim_fingerprints(session, event, row.destination, now)
+            if duplicate_of is not None:
+                mark_suppressed(session, row, event, duplicate_of)
+                continue
+            by_destination[row.destination][event.id] = row
+            events[event.id] = event
+        # Release the write lock before posting; results are written afterwards
+        await session.commit()
+
+        async def post(destination: str, chunk: list[ChangeEvent], payload: dict) -> tuple[str | None, str | None]:
+            # Never raises: every batch must be marked before the session commits
+            url = destination_url(destination)
+            if not url:
+                return None, f"No webhook URL configured for destination '{destination}'"
+            try:
+                response = await _post_to_slack(payload, url=url, destination=destination, digest_events=len(chunk))
+            except Exception as e:
+                return None, str(e)
+            return response, None if response else "Slack digest failed"
+
+        batches = [
+            (destination, chunk, payload)
+            for destination, destination_rows in by_destination.items()
+            for chunk, payload in build_digest_messages([events[event_id] for event_id in destination_rows])
+        ]
+        results = await asyncio.gather(*(post(*batch) for batch in batches))
+
+        now = datetime.now(timezone.utc)
+        for (destination, chunk, _), (response, error) in zip(batches, results):
+            for event in chunk:
+                row = by_destination[destination][event.id]
+                if response:
+                    await mark_sent(session, row, response, now)
+                else:
+                    # Due again immediately, so the next digest run picks it up
+                    mark_failed(row, error, delivery_config, now, retry_at=now)
+                    session.add(row)
+                    await release_fingerprints(session, event, destination)
+            sent += len(chunk) if response else 0
+        await session.commit()
+
+    if rows:
+        logger.info("slack_digest_sent", claimed=len(rows), sent=sent)
+    return sent
+
+
+async def release_digest_rows(factory: async_sessionmaker[AsyncSession] | None = None) -> int:
+    """Hand rows queued for the digest to immediate delivery. Returns the number moved."""
+    async with (factory or get_session_factory())() as session:
+        moved = await repository.requeue_notifications(
+            session, NotificationKind.DIGEST.value, NotificationKind.IMMEDIATE.value
+        )
+    if moved:
+        logger.info("slack_digest_rows_released", count=moved)
+    return moved
+
+
+async def digest_loop() -> None:
+    """Send the digest every ``slack.digest.interval_minutes`` until cancelled.
+
+    With the digest disabled, rows queued while it was enabled are sent immediately instead.
+    """
+    config = digest_config()
+    if not config.get("enabled", False):
+        try:
+            await release_digest_rows()
+        except Exception as e:
+            logger.exception("slack_digest_release_error", error=str(e)[:200])
+        return
+    interval = config.get("interval_minutes", 60) * 60
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await send_digest()
+        except Exception as e:
+            logger.exception("slack_digest_error", error=str(e)[:200])
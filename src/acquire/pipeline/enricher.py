@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import json
-
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,13 +22,16 @@ async def enrich(session: AsyncSession, event: ChangeEvent) -> EnrichmentResult
         logger.warning("enrichment_skipped_budget", event_id=event.id)
         return None
 
+    diff_text = await repository.load_content(session, event.diff_hash)
+    snapshot_text = await repository.load_content(session, event.snapshot_hash)
+
     prompt = load_prompt(
         "enrich",
         watch_url=event.watch_url,
         classification=event.classification,
         confidence=event.classification_confidence,
-        diff_text=(event.diff_text or "")[:MAX_DIFF_CHARS],
-        snapshot_text=(event.snapshot_text or "")[:MAX_SNAPSHOT_CHARS],
+        diff_text=(diff_text or "")[:MAX_DIFF_CHARS],
+        snapshot_text=(snapshot_text or "")[:MAX_SNAPSHOT_CHARS],
     )
 
     result = await chat_completion(
@@ -60,10 +61,10 @@ async def enrich(session: AsyncSession, event: ChangeEvent) -> EnrichmentResult
 
     # Update event
     event.summary = enrichment.summary
-    event.recommended_actions = json.dumps(enrichment.recommended_actions)
+    event.recommended_actions = enrichment.recommended_actions
     event.urgency = enrichment.urgency
-    event.key_dates = json.dumps(enrichment.key_dates) if enrichment.key_dates else None
-    event.relevant_agencies = json.dumps(enrichment.relevant_agencies) if enrichment.relevant_agencies else None
+    event.key_dates = enrichment.key_dates or None
+    event.relevant_agencies = enrichment.relevant_agencies or None
     event.enrichment_model = result["model"]
     event.enrichment_tokens_used = result["total_tokens"]
     event.pipeline_status = PipelineStatus.ENRICHED.value
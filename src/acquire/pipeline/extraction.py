@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from html.parser import HTMLParser
+
+from acquire.config import get_settings
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional: pip install rc-rd-acquire[fast-html]
+    LexborHTMLParser = None
+
+SKIP_TAGS = frozenset({"script", "style", "noscript", "svg", "head", "template"})
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+    "table", "tbody", "tfoot", "thead", "tr", "ul",
+})
+CELL_TAGS = frozenset({"td", "th"})
+
+# Backends emit this marker at block boundaries; whitespace inside text (including
+# newlines) is collapsed, and the markers become the line breaks.
+_BREAK = "\ue000"  # private-use character, never whitespace
+_BULLET = _BREAK + "- "
+_CELL = " | "
+# What StdlibExtractor appends for a start tag
+_START_PIECES = dict.fromkeys(BLOCK_TAGS, _BREAK) | dict.fromkeys(CELL_TAGS, _CELL) | {"li": _BULLET}
+
+
+def _normalize(raw: str) -> str:
+    lines = []
+    for line in raw.split(_BREAK):
+        # str.split() collapses the same whitespace as \s+, at a third of the cost
+        line = " ".join(line.split())
+        if line.startswith("|"):
+            line = line[1:].lstrip()
+        if line and line != "-":
+            lines.append(line)
+    return "\n".join(lines)
+
+
+class StdlibExtractor(HTMLParser):
+    """Pure-Python extractor; can be fed a page chunk by chunk as it downloads."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._pieces: list[str] = []
+        self._skip_depth = 0
+        self.text_length = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _START_PIECES:
+            self._pieces.append(_START_PIECES[tag])
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIP_TAGS and self._skip_depth > 0:
+            self._skip_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self._pieces.append(_BREAK)
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth == 0:
+            self._pieces.append(data)
+            self.text_length += len(data.strip())
+
+    def get_text(self) -> str:
+        return _normalize("".join(self._pieces))
+
+
+def _selectolax_text(html: str) -> str:
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(list(SKIP_TAGS))
+    root = tree.body or tree.root
+    if root is None:
+        return ""
+    for node in root.css("li"):
+        node.insert_before(_BULLET)
+    for node in root.css(",".join(sorted(BLOCK_TAGS - {"li"}))):
+        node.insert_before(_BREAK)
+        node.insert_after(_BREAK)
+    for node in root.css(",".join(sorted(CELL_TAGS))):
+        node.insert_before(_CELL)
+    return _normalize(root.text(deep=True, separator=""))
+
+
+class SelectolaxExtractor:
+    """C (lexbor) extractor with the same interface and output as StdlibExtractor.
+
+    lexbor parses whole documents, so fed chunks are buffered and re-parsed each
+    time the buffer doubles: ``text_length`` stays current for early stopping while
+    total parsing work stays within twice a single parse.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[str] = []
+        self._size = 0
+        self._parsed_size = 0
+        self._text: str | None = None
+        self.text_length = 0
+
+    def feed(self, data: str) -> None:
+        self._chunks.append(data)
+        self._size += len(data)
+        if self._size >= 2 * max(self._parsed_size, 4096):
+            self._parse()
+
+    def _parse(self) -> None:
+        self._text = _selectolax_text("".join(self._chunks))
+        self._parsed_size = self._size
+        self.text_length = len(self._text)
+
+    def close(self) -> None:
+        if self._parsed_size != self._size or self._text is None:
+            self._parse()
+
+    def get_text(self) -> str:
+        self.close()
+        return self._text or ""
+
+
+BACKENDS = {"stdlib": StdlibExtractor}
+if LexborHTMLParser is not None:
+    BACKENDS["selectolax"] = SelectolaxExtractor
+
+
+def _configured_backend() -> str:
+    return get_settings().load_yaml_config().get("link_discovery", {}).get("html_backend", "auto")
+
+
+def get_extractor(backend: str | None = None) -> StdlibExtractor | SelectolaxExtractor:
+    """A fresh extractor. ``auto`` prefers selectolax when it is installed."""
+    backend = backend or _configured_backend()
+    if backend == "auto":
+        backend = "selectolax" if "selectolax" in BACKENDS else "stdlib"
+    if backend not in BACKENDS:
+        raise ValueError(f"HTML backend '{backend}' is not available; choose from {sorted(BACKENDS)}")
+    return BACKENDS[backend]()
+
+
+def html_to_text(html: str, backend: str | None = None) -> str:
+    """Convert HTML to plain text, one line per block element."""
+    extractor = get_extractor(backend)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.get_text()
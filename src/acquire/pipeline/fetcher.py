@@ -4,6 +4,7 @@ import structlog
 import httpx
 
 from acquire.config import get_settings
+from acquire.utils import tracing
 
 logger = structlog.get_logger()
 
@@ -17,7 +18,7 @@ async def fetch_diff(watch_uuid: str) -> tuple[str | None, str | None]:
     base = settings.cdio_base_url.rstrip("/")
     headers = {"x-api-key": settings.cdio_api_key}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with httpx.AsyncClient(timeout=30.0, transport=tracing.transport()) as client:
         # Fetch latest snapshot
         snapshot_text = None
         try:
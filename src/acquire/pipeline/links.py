@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import html
+import re
+from urllib.parse import urljoin, urlsplit
+
+from acquire.config import get_settings
+from acquire.models.schemas import LinkCandidate
+from acquire.utils.urls import canonicalize_url
+
+# Defaults for link_discovery.candidates; weights are added up per link
+DEFAULT_DOMAINS = {"grants.gov": 5, "sam.gov": 5}
+DEFAULT_KEYWORDS = {
+    "nofo": 4, "foa": 3, "solicitation": 4, "funding opportunity": 4, "rfp": 3,
+    "rfi": 3, "request for proposals": 3, "request for information": 3,
+    "sources sought": 3, "broad agency announcement": 3, "baa": 2, "grant": 1,
+    "award": 1, "opportunity": 1,
+}
+ANCHOR_TEXT_CHARS = 120
+
+_MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\(\s*([^)\s]+)[^)]*\)")
+_HTML_LINK = re.compile(r"""<a\s[^>]*?href\s*=\s*["']([^"']+)["'][^>]*>(.*?)(?:</a>|$)""", re.IGNORECASE)
+_BARE_URL = re.compile(r"""https?://[^\s<>"'()\[\]]+""", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_SKIP_EXTENSIONS = (".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".woff", ".woff2")
+
+
+def candidate_config() -> dict:
+    return get_settings().load_yaml_config().get("link_discovery", {}).get("candidates", {})
+
+
+def _added_lines(diff_text: str, is_diff: bool) -> list[str]:
+    """Lines added by the diff; a first-detection snapshot is all new."""
+    lines = diff_text.splitlines()
+    if not is_diff:
+        return lines
+    return [line[1:] for line in lines if line.startswith("+")]
+
+
+def _anchor_text(text: str) -> str:
+    text = html.unescape(_TAG.sub(" ", text))
+    return " ".join(text.split())[:ANCHOR_TEXT_CHARS]
+
+
+def _links_in_line(line: str) -> list[tuple[str, str]]:
+    """(href, anchor text) pairs; a bare URL's anchor text is the rest of its line."""
+    links = [(m.group(2), m.group(1)) for m in _MARKDOWN_LINK.finditer(line)]
+    links += [(m.group(1), m.group(2)) for m in _HTML_LINK.finditer(line)]
+    rest = _HTML_LINK.sub(" ", _MARKDOWN_LINK.sub(" ", line))
+    context = _BARE_URL.sub(" ", rest)
+    links += [(m.group(0).rstrip(".,;:!?"), context) for m in _BARE_URL.finditer(rest)]
+    return [(html.unescape(href), _anchor_text(text)) for href, text in links]
+
+
+def _weight(host: str, domains: dict[str, float]) -> float:
+    return sum(weight for domain, weight in domains.items() if host == domain or host.endswith("." + domain))
+
+
+def _keyword_weight(text: str, keywords: dict[str, float]) -> float:
+    return sum(
+        weight for keyword, weight in keywords.items()
+        if re.search(rf"(?<![a-z0-9]){re.escape(keyword.lower())}(?![a-z0-9])", text)
+    )
+
+
+def extract_link_candidates(
+    diff_text: str, base_url: str, config: dict | None = None, is_diff: bool = True
+) -> list[LinkCandidate]:
+    """Links on the diff's added lines, scored by domain and keyword weights, best first.
+
+    With ``is_diff=False`` the text is a page snapshot and every line counts as added.
+    Relative links are resolved against ``base_url``. Links to the watched page itself,
+    static assets and links scoring below ``min_score`` are dropped.
+    """
+    config = candidate_config() if config is None else config
+    domains = config.get("domains", DEFAULT_DOMAINS)
+    keywords = config.get("keywords", DEFAULT_KEYWORDS)
+    min_score = config.get("min_score", 1)
+    max_candidates = config.get("max_candidates", 10)
+
+    own_url = canonicalize_url(base_url)
+    best: dict[str, LinkCandidate] = {}
+    for line in _added_lines(diff_text or "", is_diff):
+        for href, text in _links_in_line(line):
+            try:
+                url = urljoin(base_url, href)
+                parts = urlsplit(url)
+                parts.port  # raises for a port out of range
+            except ValueError:
+                continue  # malformed, e.g. an invalid IPv6 host
+            if parts.scheme not in ("http", "https") or parts.path.lower().endswith(_SKIP_EXTENSIONS):
+                continue
+            canonical = canonicalize_url(url)
+            if canonical == own_url:
+                continue
+            score = _weight(parts.hostname or "", domains) + _keyword_weight(
+                f"{text} {parts.path} {parts.query}".lower(), keywords
+            )
+            if score < min_score:
+                continue
+            if canonical not in best or score > best[canonical].score:
+                best[canonical] = LinkCandidate(url=url, text=text, score=score)
+
+    ranked = sorted(best.values(), key=lambda c: c.score, reverse=True)
+    return ranked[:max_candidates]
@@ -1,20 +1,26 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import time
 
 import structlog
-import httpx
 
 from acquire.config import get_settings
 from acquire.models.db import ChangeEvent
+from acquire.pipeline.routing import DEFAULT_DESTINATION, destination_config
+from acquire.utils import tracing
+from acquire.utils.http import retry_after_seconds
 
 logger = structlog.get_logger()
 
 
-def _build_slack_blocks(event: ChangeEvent) -> list[dict]:
-    """Build Slack Block Kit blocks for a change event notification."""
-    yaml_config = get_settings().load_yaml_config()
-    urgency_emoji = yaml_config.get("slack", {}).get("urgency_emoji", {})
+def _build_slack_blocks(event: ChangeEvent, urgency_emoji: dict | None = None) -> list[dict]:
+    """Build Slack Block Kit blocks for a change event notification.
+
+    ``urgency_emoji`` defaults to ``slack.urgency_emoji`` from settings.yaml.
+    """
+    if urgency_emoji is None:
+        urgency_emoji = get_settings().load_yaml_config().get("slack", {}).get("urgency_emoji", {})
 
     urgency = event.urgency or "MEDIUM"
     emoji = urgency_emoji.get(urgency, ":large_blue_circle:")
@@ -52,51 +58,33 @@ def _build_slack_blocks(event: ChangeEvent) -> list[dict]:
     blocks.append(divider)
 
     if event.recommended_actions:
-        try:
-            actions = json.loads(event.recommended_actions)
-        except (json.JSONDecodeError, TypeError):
-            actions = []
-
-        if actions:
-            action_text = "\n".join(f"{i}. {a}" for i, a in enumerate(actions, 1))
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f":clipboard: *Next Steps*\n{action_text}",
-                },
-            })
+        action_text = "\n".join(f"{i}. {a}" for i, a in enumerate(event.recommended_actions, 1))
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f":clipboard: *Next Steps*\n{action_text}",
+            },
+        })
 
     if event.key_dates:
-        try:
-            dates = json.loads(event.key_dates)
-        except (json.JSONDecodeError, TypeError):
-            dates = []
-
-        if dates:
-            date_text = "\n".join(f"  - {d}" for d in dates)
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f":calendar: *Key Dates*\n{date_text}",
-                },
-            })
+        date_text = "\n".join(f"  - {d}" for d in event.key_dates)
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f":calendar: *Key Dates*\n{date_text}",
+            },
+        })
 
     if event.relevant_agencies:
-        try:
-            agencies = json.loads(event.relevant_agencies)
-        except (json.JSONDecodeError, TypeError):
-            agencies = []
-
-        if agencies:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f":office: *Agencies*\n  {'  |  '.join(agencies)}",
-                },
-            })
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f":office: *Agencies*\n  {'  |  '.join(event.relevant_agencies)}",
+            },
+        })
 
     blocks.append(divider)
 
@@ -127,13 +115,77 @@ def _truncate(text: str, max_len: int) -> str:
     return text if len(text) <= max_len else text[: max_len - 3] + "..."
 
 
-async def notify_slack(event: ChangeEvent) -> str | None:
-    """Send a Slack notification for a change event. Returns message_ts if successful."""
-    settings = get_settings()
-    if not settings.slack_webhook_url:
-        logger.warning("slack_not_configured", event_id=event.id)
+class RateLimiter:
+    """Spaces calls at least ``interval`` seconds apart across all callers."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            delay = self._next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_at = time.monotonic() + self.interval
+
+
+_limiters: dict[str, RateLimiter] = {}
+
+# Slack answers 429 with Retry-After when the webhook rate limit is exceeded
+MAX_RATE_LIMIT_RETRIES = 2
+MAX_RETRY_AFTER_SECONDS = 30.0
+
+
+def _get_limiter(destination: str = DEFAULT_DESTINATION) -> RateLimiter:
+    """One limiter per destination, since each webhook is rate limited on its own."""
+    if destination not in _limiters:
+        default = get_settings().load_yaml_config().get("slack", {}).get("min_interval_seconds", 1.0)
+        _limiters[destination] = RateLimiter(destination_config(destination).get("min_interval_seconds", default))
+    return _limiters[destination]
+
+
+async def _post_to_slack(
+    payload: dict,
+    url: str | None = None,
+    destination: str = DEFAULT_DESTINATION,
+    **log_context,
+) -> str | None:
+    """POST a message to a Slack webhook, paced by the destination's rate limiter."""
+    url = url or get_settings().slack_webhook_url
+    if not url:
+        logger.warning("slack_not_configured", destination=destination, **log_context)
         return None
 
+    import httpx
+
+    async with httpx.AsyncClient(timeout=15.0, transport=tracing.transport()) as client:
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await _get_limiter(destination).wait()
+            resp = await client.post(url, json=payload)
+            if resp.status_code == 200:
+                return resp.text  # Webhook returns "ok"
+            if resp.status_code == 429 and attempt < MAX_RATE_LIMIT_RETRIES:
+                retry_after = retry_after_seconds(resp.headers.get("Retry-After"), 1, MAX_RETRY_AFTER_SECONDS)
+                logger.warning("slack_rate_limited", destination=destination, retry_after=retry_after, **log_context)
+                await asyncio.sleep(retry_after)
+                continue
+            logger.error(
+                "slack_failed",
+                destination=destination,
+                status=resp.status_code,
+                body=resp.text[:200],
+                **log_context,
+            )
+            return None
+    return None
+
+
+async def notify_slack(
+    event: ChangeEvent, url: str | None = None, destination: str = DEFAULT_DESTINATION
+) -> str | None:
+    """Send a Slack notification for a change event. Returns message_ts if successful."""
     blocks = _build_slack_blocks(event)
     urgency = event.urgency or "MEDIUM"
     classification = event.classification or "UNKNOWN"
@@ -142,16 +194,22 @@ async def notify_slack(event: ChangeEvent) -> str | None:
         "blocks": blocks,
     }
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.post(settings.slack_webhook_url, json=payload)
-        if resp.status_code == 200:
-            logger.info("slack_sent", event_id=event.id)
-            return resp.text  # Webhook returns "ok"
-        else:
-            logger.error(
-                "slack_failed",
-                event_id=event.id,
-                status=resp.status_code,
-                body=resp.text[:200],
-            )
-            return None
+    result = await _post_to_slack(payload, url=url, destination=destination, event_id=event.id)
+    if result:
+        logger.info("slack_sent", event_id=event.id, destination=destination)
+    return result
+
+
+async def notify_duplicate(
+    event: ChangeEvent, original_event_id: int, url: str | None = None, destination: str = DEFAULT_DESTINATION
+) -> str | None:
+    """Post a one-line pointer for an event that repeats an already-notified one."""
+    text = (
+        f":repeat: Also seen at <{event.watch_url}|{_truncate(event.watch_url, 80)}> "
+        f"(Event #{event.id}), same as Event #{original_event_id}"
+    )
+    payload = {"text": text, "blocks": [{"type": "context", "elements": [{"type": "mrkdwn", "text": text}]}]}
+    result = await _post_to_slack(payload, url=url, destination=destination, event_id=event.id)
+    if result:
+        logger.info("slack_duplicate_sent", event_id=event.id, original_event_id=original_event_id)
+    return result
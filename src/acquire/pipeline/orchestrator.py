@@ -1,137 +1,248 @@
 from __future__ import annotations
 
-import json
+import asyncio
+from datetime import datetime, timedelta, timezone
 
 import structlog
 
 from acquire.config import get_settings
-from acquire.models.db import PipelineStatus
+from acquire.models.db import ChangeEvent, NotificationKind, PipelineStatus
+from acquire.models.schemas import ClassificationResult, TriageResult
 from acquire.pipeline.fetcher import fetch_diff
 from acquire.pipeline.triage import triage
 from acquire.pipeline.classifier import classify
 from acquire.pipeline.enricher import enrich
 from acquire.pipeline.filter import should_enrich, should_notify, is_diff_too_small
-from acquire.pipeline.notifier import notify_slack
+from acquire.pipeline.digest import should_digest
+from acquire.pipeline.routing import route_event
 from acquire.pipeline.crawler import fetch_page_text
 from acquire.storage.database import get_session_factory
 from acquire.storage import repository
+from acquire.utils import profiling, tracing
+from acquire.utils.urls import canonicalize_url
 
 logger = structlog.get_logger()
 
 
-async def run_pipeline(event_id: int):
-    """Run the full pipeline for a change event. Called as a background task."""
+class LeaseLost(Exception):
+    """The worker's lease on the event ran out; another worker may be running it."""
+
+
+async def run_pipeline(event_id: int, lease_owner: str | None = None):
+    """Run the full pipeline for a change event. Called as a background task.
+
+    A worker passes its ``lease_owner``; every checkpoint then first checks that the
+    lease is still held, and the run's staged writes are rolled back once it is not.
+    """
     factory = get_session_factory()
+    pipeline_config = get_settings().load_yaml_config().get("pipeline", {})
+
+    async with profiling.profile("pipeline", event_id=event_id), factory() as session:
+        if pipeline_config.get("unit_of_work", True):
+            # Stage results and cost ledger rows are committed together at the
+            # checkpoints below instead of after every individual write.
+            repository.begin_unit_of_work(session)
 
-    async with factory() as session:
         event = await repository.get_event(session, event_id)
         if not event:
             logger.error("event_not_found", event_id=event_id)
             return
 
-        is_child = event.parent_event_id is not None
+        # A child run inline nests under its parent's link discovery span; one run
+        # by a worker joins the parent's trace through the derived ids
+        root_id = event.parent_event_id or event.id
+        with tracing.span(
+            "pipeline",
+            trace_id=tracing.event_trace_id(root_id),
+            parent_id=tracing.event_span_id(event.parent_event_id) if event.parent_event_id else None,
+            span_id=None if event.parent_event_id else tracing.event_span_id(event.id),
+            event_id=event.id,
+            parent_event_id=event.parent_event_id,
+        ) as pipeline_span:
+            await _run_stages(session, event, lease_owner)
+            if pipeline_span is not None:
+                pipeline_span.set(status=event.pipeline_status)
+
+
+def _saved_triage(event: ChangeEvent) -> TriageResult | None:
+    """Triage result an interrupted run already committed, so a resumed run skips the LLM call."""
+    if event.pipeline_status not in (PipelineStatus.TRIAGED.value, PipelineStatus.CLASSIFIED.value):
+        return None
+    if not event.triage_result:
+        return None
+    return TriageResult(**event.triage_result, discovered_links=event.discovered_links or [])
+
+
+def _saved_classification(event: ChangeEvent) -> ClassificationResult | None:
+    """Classification an interrupted run already committed."""
+    if event.pipeline_status != PipelineStatus.CLASSIFIED.value or not event.classification:
+        return None
+    return ClassificationResult(
+        classification=event.classification,
+        confidence=event.classification_confidence or 0.0,
+        reasoning=event.classification_reasoning or "",
+    )
 
-        try:
-            # Stage 1: Fetch diff from changedetection.io (skip if already fetched or child)
-            if event.pipeline_status == PipelineStatus.RECEIVED.value:
-                logger.info("pipeline_fetch", event_id=event_id)
+
+async def _checkpoint(session, event_id: int, lease_owner: str | None) -> None:
+    if lease_owner is not None and not await repository.holds_lease(session, event_id, lease_owner):
+        raise LeaseLost(f"Lease on event {event_id} is no longer held by {lease_owner}")
+    await repository.checkpoint(session)
+
+
+async def _run_stages(session, event, lease_owner: str | None = None):
+    event_id = event.id
+    is_child = event.parent_event_id is not None
+    discard = False
+
+    try:
+        # Stage 1: Fetch diff from changedetection.io (skip if already fetched or child)
+        if event.pipeline_status == PipelineStatus.RECEIVED.value:
+            logger.info("pipeline_fetch", event_id=event_id)
+            with tracing.span("fetch"):
                 diff_text, snapshot_text = await fetch_diff(event.watch_uuid)
-                event.diff_text = diff_text
-                event.snapshot_text = snapshot_text
+                event.diff_hash = await repository.put_content(session, diff_text)
+                event.snapshot_hash = await repository.put_content(session, snapshot_text)
                 event.pipeline_status = PipelineStatus.FETCHED.value
                 await repository.update_event(session, event)
+                await _checkpoint(session, event_id, lease_owner)
 
-            # Stage 2: Filter trivially small diffs
-            if is_diff_too_small(event.diff_text) and not event.snapshot_text:
-                logger.info("pipeline_filtered_small_diff", event_id=event_id)
-                event.pipeline_status = PipelineStatus.FILTERED_OUT.value
-                event.error_message = "Diff too small"
-                await repository.update_event(session, event)
-                return
+        # Stage 2: Filter trivially small diffs
+        diff_text = await repository.load_content(session, event.diff_hash)
+        if is_diff_too_small(diff_text) and not event.snapshot_hash:
+            logger.info("pipeline_filtered_small_diff", event_id=event_id)
+            event.pipeline_status = PipelineStatus.FILTERED_OUT.value
+            event.error_message = "Diff too small"
+            await repository.update_event(session, event)
+            return
 
-            # Stage 3: Triage (skip for child events — they already passed discovery)
-            triage_result = None
-            if not is_child:
+        # Stage 3: Triage (skip for child events — they already passed discovery)
+        triage_result = None
+        if not is_child:
+            # A reclaimed event keeps the triage its interrupted run committed
+            triage_result = _saved_triage(event)
+            if triage_result:
+                logger.info("pipeline_triage_resumed", event_id=event_id)
+            else:
                 logger.info("pipeline_triage", event_id=event_id)
-                triage_result = await triage(session, event)
-                if not triage_result:
-                    event.pipeline_status = PipelineStatus.ERROR.value
-                    event.error_message = "Triage failed or budget exceeded"
-                    await repository.update_event(session, event)
-                    return
-
-                if not triage_result.meaningful:
-                    logger.info(
-                        "pipeline_filtered_triage",
-                        event_id=event_id,
-                        reasoning=triage_result.triage_reasoning,
-                    )
-                    event.pipeline_status = PipelineStatus.FILTERED_OUT.value
-                    event.error_message = f"Triage: {triage_result.triage_reasoning}"
-                    await repository.update_event(session, event)
-                    # Still process discovered links even if parent is not meaningful
-                    await _process_discovered_links(session, event, triage_result)
-                    return
-
-            # Stage 4: Classify via LLM
-            logger.info("pipeline_classify", event_id=event_id)
-            classification = await classify(session, event)
-            if not classification:
+                with tracing.span("triage"):
+                    triage_result = await triage(session, event)
+                    if triage_result:
+                        await _checkpoint(session, event_id, lease_owner)
+            if not triage_result:
                 event.pipeline_status = PipelineStatus.ERROR.value
-                event.error_message = "Classification failed or budget exceeded"
+                event.error_message = "Triage failed or budget exceeded"
                 await repository.update_event(session, event)
                 return
 
-            # Stage 5: Filter non-actionable
-            if not should_enrich(classification.classification):
+            if not triage_result.meaningful:
                 logger.info(
-                    "pipeline_filtered_classification",
+                    "pipeline_filtered_triage",
                     event_id=event_id,
-                    classification=classification.classification,
+                    reasoning=triage_result.triage_reasoning,
                 )
                 event.pipeline_status = PipelineStatus.FILTERED_OUT.value
+                event.error_message = f"Triage: {triage_result.triage_reasoning}"
                 await repository.update_event(session, event)
+                await _checkpoint(session, event_id, lease_owner)
+                # Still process discovered links even if parent is not meaningful
+                await _process_discovered_links(session, event, triage_result)
                 return
 
-            # Stage 6: Enrich via LLM
-            logger.info("pipeline_enrich", event_id=event_id)
+        # Stage 4: Classify via LLM (unless a previous run already classified the event)
+        classification = _saved_classification(event)
+        if classification:
+            logger.info("pipeline_classify_resumed", event_id=event_id)
+        else:
+            logger.info("pipeline_classify", event_id=event_id)
+            with tracing.span("classify"):
+                classification = await classify(session, event)
+                if classification:
+                    await _checkpoint(session, event_id, lease_owner)
+        if not classification:
+            event.pipeline_status = PipelineStatus.ERROR.value
+            event.error_message = "Classification failed or budget exceeded"
+            await repository.update_event(session, event)
+            return
+
+        # Stage 5: Filter non-actionable
+        if not should_enrich(classification.classification):
+            logger.info(
+                "pipeline_filtered_classification",
+                event_id=event_id,
+                classification=classification.classification,
+            )
+            event.pipeline_status = PipelineStatus.FILTERED_OUT.value
+            await repository.update_event(session, event)
+            return
+
+        # Stage 6: Enrich via LLM
+        logger.info("pipeline_enrich", event_id=event_id)
+        with tracing.span("enrich"):
             enrichment = await enrich(session, event)
-            if not enrichment:
-                event.pipeline_status = PipelineStatus.ERROR.value
-                event.error_message = "Enrichment failed or budget exceeded"
-                await repository.update_event(session, event)
-                return
+        if not enrichment:
+            event.pipeline_status = PipelineStatus.ERROR.value
+            event.error_message = "Enrichment failed or budget exceeded"
+            await repository.update_event(session, event)
+            return
 
-            # Stage 7: Notify via Slack
+        # Stage 7: Queue a notification per routed destination in the outbox; they
+        # commit with the enrichment and the delivery worker sends them (lower
+        # urgencies via the digest)
+        with tracing.span("notify_queue"):
             if should_notify(classification.classification):
-                logger.info("pipeline_notify", event_id=event_id)
-                result = await notify_slack(event)
-                if result:
-                    event.slack_message_ts = result
-                    event.pipeline_status = PipelineStatus.NOTIFIED.value
-                else:
-                    event.pipeline_status = PipelineStatus.ERROR.value
-                    event.error_message = "Slack notification failed"
-                await repository.update_event(session, event)
-            else:
-                event.pipeline_status = PipelineStatus.ENRICHED.value
-                await repository.update_event(session, event)
+                kind = NotificationKind.DIGEST if should_digest(event) else NotificationKind.IMMEDIATE
+                destinations = route_event(event)
+                logger.info("pipeline_notify_queued", event_id=event_id, kind=kind.value, destinations=destinations)
+                for destination in destinations:
+                    await repository.enqueue_notification(session, event.id, kind.value, destination)
+            event.pipeline_status = PipelineStatus.ENRICHED.value
+            await repository.update_event(session, event)
+            await _checkpoint(session, event_id, lease_owner)
 
-            # Stage 8: Process discovered links (parent events only)
-            if triage_result and not is_child:
-                await _process_discovered_links(session, event, triage_result)
+        # Stage 8: Process discovered links (parent events only)
+        if triage_result and not is_child:
+            await _process_discovered_links(session, event, triage_result)
 
-            logger.info("pipeline_complete", event_id=event_id, status=event.pipeline_status)
+        logger.info("pipeline_complete", event_id=event_id, status=event.pipeline_status)
 
-        except Exception as e:
-            logger.exception("pipeline_error", event_id=event_id, error=str(e))
-            event.pipeline_status = PipelineStatus.ERROR.value
-            event.error_message = str(e)[:500]
-            await repository.update_event(session, event)
+    except asyncio.CancelledError:
+        # The worker cancels the run once its lease is lost: another worker may own
+        # the event by now, so nothing this run staged is committed
+        logger.warning("pipeline_cancelled", event_id=event_id, owner=lease_owner)
+        discard = True
+        raise
+
+    except LeaseLost as e:
+        logger.warning("pipeline_lease_lost", event_id=event_id, owner=lease_owner, error=str(e))
+        discard = True
+
+    except Exception as e:
+        logger.exception("pipeline_error", event_id=event_id, error=str(e))
+        event.pipeline_status = PipelineStatus.ERROR.value
+        event.error_message = str(e)[:500]
+        await repository.update_event(session, event)
+
+    finally:
+        if discard:
+            await session.rollback()
+        else:
+            # Persist whatever terminal state the early returns staged
+            try:
+                await _checkpoint(session, event_id, lease_owner)
+            except LeaseLost as e:
+                logger.warning("pipeline_lease_lost", event_id=event_id, owner=lease_owner, error=str(e))
+                await session.rollback()
+
+
+async def _fetch_link(url: str, max_chars: int, max_bytes: int) -> str | None:
+    # Own session for the crawl cache: links are fetched concurrently
+    async with get_session_factory()() as cache_session:
+        return await fetch_page_text(url, max_chars=max_chars, max_bytes=max_bytes, session=cache_session)
 
 
 async def _process_discovered_links(session, parent_event, triage_result):
-    """Fetch each discovered link, create a child event, and run the pipeline on it."""
+    """Fetch the discovered links concurrently, then create a child event and run the pipeline for each."""
     yaml_config = get_settings().load_yaml_config()
     link_config = yaml_config.get("link_discovery", {})
 
@@ -142,42 +253,70 @@ async def _process_discovered_links(session, parent_event, triage_result):
         return
 
     max_chars = link_config.get("max_page_fetch_chars", 8000)
+    max_bytes = link_config.get("max_page_fetch_bytes", 2 * 1024 * 1024)
+    worker_mode = yaml_config.get("worker", {}).get("enabled", False)
+    seen_ttl = timedelta(hours=link_config.get("seen_ttl_hours", 168))
+    now = datetime.now(timezone.utc)
 
+    # Links that differ only by tracking params, fragments or trailing slashes are
+    # one link; those already processed (from any event) skip the crawl and the LLM.
+    canonical: dict[str, object] = {}
     for link in triage_result.discovered_links:
-        try:
+        canonical.setdefault(canonicalize_url(link.url), link)
+    canonical.pop(canonicalize_url(parent_event.watch_url), None)
+    seen = await repository.find_seen_urls(session, list(canonical), now)
+    for url in seen:
+        logger.info("link_discovery_seen", parent_event_id=parent_event.id, url=url)
+    links = [(url, link) for url, link in canonical.items() if url not in seen]
+
+    if not links:
+        return
+
+    with tracing.span("link_discovery", links=len(links)):
+        for _, link in links:
             logger.info(
                 "link_discovery_fetch",
                 parent_event_id=parent_event.id,
                 url=link.url,
                 reason=link.reason,
             )
+        # The crawl scheduler keeps concurrent fetches polite per host
+        pages = await asyncio.gather(
+            *(_fetch_link(link.url, max_chars, max_bytes) for _, link in links), return_exceptions=True
+        )
 
-            page_text = await fetch_page_text(link.url, max_chars=max_chars)
-            if not page_text:
-                logger.info("link_discovery_empty", url=link.url)
-                continue
+        for (url, link), page_text in zip(links, pages):
+            try:
+                if isinstance(page_text, Exception):
+                    raise page_text
+                if not page_text:
+                    logger.info("link_discovery_empty", url=link.url)
+                    continue
 
-            child = await repository.create_child_event(
-                session,
-                parent=parent_event,
-                url=link.url,
-                page_text=page_text,
-            )
+                child = await repository.create_child_event(
+                    session,
+                    parent=parent_event,
+                    url=link.url,
+                    page_text=page_text,
+                )
+                await repository.mark_url_seen(session, url, child.id, now + seen_ttl)
 
-            logger.info(
-                "link_discovery_child_created",
-                parent_event_id=parent_event.id,
-                child_event_id=child.id,
-                url=link.url,
-            )
+                logger.info(
+                    "link_discovery_child_created",
+                    parent_event_id=parent_event.id,
+                    child_event_id=child.id,
+                    url=link.url,
+                )
 
-            # Run pipeline on child (will skip triage since is_child=True)
-            await run_pipeline(child.id)
+                # Run pipeline on child (will skip triage since is_child=True). In worker
+                # mode the child is left at FETCHED for any worker to claim.
+                if not worker_mode:
+                    await run_pipeline(child.id)
 
-        except Exception as e:
-            logger.warning(
-                "link_discovery_error",
-                parent_event_id=parent_event.id,
-                url=link.url,
-                error=str(e)[:200],
-            )
+            except Exception as e:
+                logger.warning(
+                    "link_discovery_error",
+                    parent_event_id=parent_event.id,
+                    url=link.url,
+                    error=str(e)[:200],
+                )
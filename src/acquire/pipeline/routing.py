@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+from urllib.parse import urlparse
+
+from acquire.config import get_settings
+from acquire.models.db import ChangeEvent
+
+DEFAULT_DESTINATION = "slack"
+
+
+def routing_config() -> dict:
+    return get_settings().load_yaml_config().get("notifications", {}) or {}
+
+
+def destination_config(name: str) -> dict:
+    return (routing_config().get("destinations") or {}).get(name) or {}
+
+
+def destination_url(name: str) -> str | None:
+    """Webhook URL for a destination: ``url``, else the env var named by ``url_env``.
+
+    The default destination falls back to ``Settings.slack_webhook_url``, which also
+    picks up SLACK_WEBHOOK_URL from ``.env``.
+    """
+    config = destination_config(name)
+    if config.get("url"):
+        return config["url"]
+    if config.get("url_env") and os.environ.get(config["url_env"]):
+        return os.environ[config["url_env"]]
+    if name == DEFAULT_DESTINATION:
+        return get_settings().slack_webhook_url or None
+    return None
+
+
+def _domain_matches(host: str, domains: list[str]) -> bool:
+    return any(host == d.lower() or host.endswith("." + d.lower()) for d in domains)
+
+
+def _rule_matches(rule: dict, event: ChangeEvent) -> bool:
+    if "classification" in rule and (event.classification or "").upper() not in {c.upper() for c in rule["classification"]}:
+        return False
+    if "urgency" in rule and (event.urgency or "MEDIUM").upper() not in {u.upper() for u in rule["urgency"]}:
+        return False
+    if "domain" in rule:
+        host = (urlparse(event.watch_url).hostname or "").lower()
+        if not _domain_matches(host, rule["domain"]):
+            return False
+    return True
+
+
+def route_event(event: ChangeEvent) -> list[str]:
+    """Destinations of every rule in ``notifications.routes`` that matches the event.
+
+    A rule matches when each of its classification/urgency/domain lists (if given)
+    contains the event's value. Without any routes, everything goes to the default
+    destination.
+    """
+    routes = routing_config().get("routes")
+    if not routes:
+        return [DEFAULT_DESTINATION]
+
+    destinations: list[str] = []
+    for rule in routes:
+        if _rule_matches(rule, event):
+            destinations += [d for d in rule.get("destinations", []) if d not in destinations]
+    return destinations
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import json
-
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,7 +9,9 @@ from acquire.llm.cost import check_budget, record_usage
 from acquire.llm.prompts import load_prompt
 from acquire.models.db import ChangeEvent, PipelineStatus
 from acquire.models.schemas import TriageResult
+from acquire.pipeline.links import extract_link_candidates
 from acquire.storage import repository
+from acquire.utils.urls import canonicalize_url
 
 logger = structlog.get_logger()
 
@@ -32,13 +32,23 @@ async def triage(session: AsyncSession, event: ChangeEvent) -> TriageResult | No
     link_config = yaml_config.get("link_discovery", {})
     max_links = link_config.get("max_links_per_event", 3)
 
-    diff_text = (event.diff_text or event.snapshot_text or "")[:MAX_DIFF_CHARS]
+    diff_text = await repository.load_content(session, event.diff_hash)
+    # A first detection has no diff, only the snapshot of the page; the fetcher then
+    # stores the snapshot as the diff too, so both hashes are the same
+    is_diff = bool(diff_text) and event.diff_hash != event.snapshot_hash
+    if not is_diff:
+        diff_text = await repository.load_content(session, event.snapshot_hash) or ""
+    # Links are found deterministically over the whole diff; the LLM only picks among them
+    candidates = (
+        extract_link_candidates(diff_text, event.watch_url, is_diff=is_diff) if link_config.get("enabled", True) else []
+    )
 
     prompt = load_prompt(
         "triage",
         watch_url=event.watch_url,
-        diff_text=diff_text,
+        diff_text=diff_text[:MAX_DIFF_CHARS],
         max_links=max_links,
+        candidates=candidates,
     )
 
     result = await chat_completion(
@@ -68,8 +78,11 @@ async def triage(session: AsyncSession, event: ChangeEvent) -> TriageResult | No
 
     triage_result = TriageResult(**content)
 
-    # Enforce max links limit
-    triage_result.discovered_links = triage_result.discovered_links[:max_links]
+    # Drop URLs that are not candidates (the model occasionally invents them), then enforce the limit
+    candidate_urls = {canonicalize_url(c.url) for c in candidates}
+    triage_result.discovered_links = [
+        link for link in triage_result.discovered_links if canonicalize_url(link.url) in candidate_urls
+    ][:max_links]
 
     # Record cost
     await record_usage(
@@ -81,14 +94,14 @@ async def triage(session: AsyncSession, event: ChangeEvent) -> TriageResult | No
     )
 
     # Update event with triage data
-    event.triage_result = json.dumps({
+    event.triage_result = {
         "meaningful": triage_result.meaningful,
         "triage_reasoning": triage_result.triage_reasoning,
-    })
+    }
     event.triage_tokens_used = result["total_tokens"]
-    event.discovered_links = json.dumps(
-        [{"url": l.url, "reason": l.reason} for l in triage_result.discovered_links]
-    ) if triage_result.discovered_links else None
+    event.discovered_links = [
+        {"url": l.url, "reason": l.reason} for l in triage_result.discovered_links
+    ] or None
     event.pipeline_status = PipelineStatus.TRIAGED.value
     await repository.update_event(session, event)
 
@@ -96,6 +109,7 @@ async def triage(session: AsyncSession, event: ChangeEvent) -> TriageResult | No
         "triaged",
         event_id=event.id,
         meaningful=triage_result.meaningful,
+        link_candidates=len(candidates),
         links_found=len(triage_result.discovered_links),
     )
 
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import uuid
+
+import structlog
+
+from acquire.config import get_settings
+from acquire.llm.client import close_client
+from acquire.pipeline.orchestrator import run_pipeline
+from acquire.storage import repository
+from acquire.storage.database import get_session_factory, init_db
+from acquire.utils.logging import setup_logging
+from acquire.utils.profiling import loop_lag_loop
+from acquire.utils.tracing import setup_tracing
+from acquire.warmup import open_connections, warm_up, warm_up_config
+
+logger = structlog.get_logger()
+
+
+def worker_config() -> dict:
+    return get_settings().load_yaml_config().get("worker", {}) or {}
+
+
+def _owner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+async def _heartbeat(event_id: int, owner: str, lease_seconds: float, interval: float, pipeline: asyncio.Task) -> None:
+    """Renew the lease every ``interval`` seconds; cancel the pipeline once the lease is lost.
+
+    A failed renewal (e.g. a locked database) is retried on the next beat until the
+    lease would have expired; another worker may claim the event from then on.
+    """
+    factory = get_session_factory()
+    expires = time.monotonic() + lease_seconds
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with factory() as session:
+                renewed = await repository.renew_lease(session, event_id, owner, lease_seconds)
+        except Exception as e:
+            logger.warning("worker_lease_renew_error", event_id=event_id, owner=owner, error=str(e)[:200])
+            renewed = None
+        if renewed:
+            expires = time.monotonic() + lease_seconds
+        elif renewed is False or time.monotonic() >= expires:
+            logger.warning("worker_lease_lost", event_id=event_id, owner=owner)
+            pipeline.cancel()
+            return
+
+
+async def _run_leased(event_id: int, owner: str, config: dict) -> None:
+    pipeline = asyncio.create_task(run_pipeline(event_id, lease_owner=owner))
+    heartbeat = asyncio.create_task(
+        _heartbeat(
+            event_id,
+            owner,
+            config.get("lease_seconds", 120),
+            config.get("heartbeat_seconds", 30),
+            pipeline,
+        )
+    )
+    try:
+        await pipeline
+    except asyncio.CancelledError:
+        # Cancelled by the heartbeat: the event now belongs to whoever claims it next
+        if asyncio.current_task().cancelling():
+            raise
+        logger.warning("worker_pipeline_abandoned", event_id=event_id, owner=owner)
+    finally:
+        heartbeat.cancel()
+        async with get_session_factory()() as session:
+            await repository.release_lease(session, event_id, owner)
+
+
+async def run_worker(stop: asyncio.Event | None = None) -> None:
+    """Claim and run pipelines until ``stop`` is set, then wait for in-flight events."""
+    config = worker_config()
+    stop = stop or asyncio.Event()
+    owner = _owner_id()
+    slots = asyncio.Semaphore(config.get("concurrency", 4))
+    running: set[asyncio.Task] = set()
+    factory = get_session_factory()
+
+    logger.info("worker_started", owner=owner, concurrency=config.get("concurrency", 4))
+
+    while not stop.is_set():
+        await slots.acquire()
+        try:
+            async with factory() as session:
+                event_id = await repository.claim_event(session, owner, config.get("lease_seconds", 120))
+        except Exception as e:
+            logger.exception("worker_claim_error", error=str(e)[:200])
+            event_id = None
+
+        if event_id is None:
+            slots.release()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=config.get("poll_interval_seconds", 2))
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        logger.info("worker_claimed", event_id=event_id, owner=owner)
+        task = asyncio.create_task(_run_leased(event_id, owner, config))
+        running.add(task)
+        task.add_done_callback(running.discard)
+        task.add_done_callback(lambda _: slots.release())
+
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+    logger.info("worker_stopped", owner=owner)
+
+
+async def _serve() -> None:
+    setup_logging()
+    setup_tracing()
+    await init_db()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    background_tasks = [asyncio.create_task(loop_lag_loop())]
+    if warm_up_config().get("enabled", True):
+        await warm_up()
+        background_tasks.append(asyncio.create_task(open_connections()))
+    await run_worker(stop)
+    for task in background_tasks:
+        task.cancel()
+    await close_client()
+
+
+def _process_main() -> None:
+    asyncio.run(_serve())
+
+
+def main() -> None:
+    """Entry point for ``acquire-worker``."""
+    parser = argparse.ArgumentParser(description="Claim and process change events outside the API process")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to start")
+    args = parser.parse_args()
+
+    if not worker_config().get("enabled", False):
+        # The API would also run pipelines inline, and those events carry no lease
+        raise SystemExit("worker.enabled is false in settings.yaml; enable it so the API only ingests")
+
+    if args.processes <= 1:
+        _process_main()
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_process_main, name=f"acquire-worker-{i}") for i in range(args.processes)]
+    for process in processes:
+        process.start()
+
+    def _forward(signum, frame):
+        # Children finish their in-flight events on SIGTERM
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, _forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from datetime import datetime, timezone
+
+CODEC_ZLIB = "zlib"
+COMPRESSION_LEVEL = 6
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest used as the content_blobs key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def decompress_text(data: bytes, codec: str = CODEC_ZLIB) -> str:
+    if codec != CODEC_ZLIB:
+        raise ValueError(f"Unknown content codec: {codec}")
+    return zlib.decompress(data).decode("utf-8")
+
+
+def sql_content_text(data: bytes | None, codec: str, max_chars: int) -> str | None:
+    """SQL function ``acquire_content(data, codec, max_chars)`` used by the search triggers.
+
+    Inflates at most ~4 bytes per wanted character, so indexing a huge page costs
+    no more than indexing its first ``max_chars`` characters.
+    """
+    if data is None or codec != CODEC_ZLIB:
+        return None
+    raw = zlib.decompressobj().decompress(data, max_chars * 4)
+    return raw.decode("utf-8", errors="ignore")[:max_chars]
+
+
+def blob_values(text: str) -> dict:
+    """Column values for a content_blobs row holding ``text``."""
+    raw = text.encode("utf-8")
+    return {
+        "hash": hashlib.sha256(raw).hexdigest(),
+        "codec": CODEC_ZLIB,
+        "size": len(raw),
+        "data": zlib.compress(raw, COMPRESSION_LEVEL),
+        "created_at": datetime.now(timezone.utc),
+    }
@@ -3,14 +3,71 @@ from __future__ import annotations
 from pathlib import Path
 
 from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import event, inspect, literal, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 
-from acquire.config import get_settings
+from acquire.config import Settings, get_settings
+from acquire.models.db import ContentBlob
+from acquire.storage.content import blob_values, sql_content_text
+from acquire.storage.search import ensure_search_index
 
 _engine = None
 _session_factory = None
 
 
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (url.endswith("://") or ":memory:" in url)
+
+
+def _sqlite_pragmas(settings: Settings) -> list[str]:
+    """PRAGMAs applied to every new SQLite connection.
+
+    WAL lets readers proceed while the pipeline writes, and synchronous=NORMAL
+    drops the per-commit fsync (WAL is still durable across application crashes).
+    """
+    return [
+        # Must precede journal_mode, which initialises a new database file. Lets
+        # retention reclaim space with incremental_vacuum (existing files need one VACUUM).
+        "PRAGMA auto_vacuum=INCREMENTAL",
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(settings.db_busy_timeout_ms)}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA mmap_size={int(settings.db_mmap_size)}",
+    ]
+
+
+def build_engine(url: str, settings: Settings | None = None) -> AsyncEngine:
+    """Create an async engine, applying SQLite tuning and pool sizing from settings."""
+    settings = settings or get_settings()
+
+    kwargs: dict = {"echo": False}
+    if not _is_memory_sqlite(url):
+        # In-memory SQLite uses a StaticPool, which takes no sizing arguments
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+
+    engine = create_async_engine(url, **kwargs)
+
+    if url.startswith("sqlite"):
+        pragmas = _sqlite_pragmas(settings)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+            # Used by the full-text search triggers to index compressed diff text
+            dbapi_connection.create_function("acquire_content", 3, sql_content_text, deterministic=True)
+
+    return engine
+
+
 def get_engine():
     global _engine
     if _engine is None:
@@ -18,11 +75,11 @@ def get_engine():
         url = settings.database_url
 
         # Ensure the data directory exists for SQLite
-        if "sqlite" in url:
+        if "sqlite" in url and not _is_memory_sqlite(url):
             db_path = url.split("///")[-1]
             Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        _engine = create_async_engine(url, echo=False)
+        _engine = build_engine(url, settings)
     return _engine
 
 
@@ -33,10 +90,92 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
     return _session_factory
 
 
-async def init_db():
-    engine = get_engine()
+_LEGACY_CONTENT_BATCH = 200
+
+
+def _add_column_sql(table, column, dialect) -> str:
+    """``ALTER TABLE ... ADD COLUMN`` keeping the model's default and NOT NULL.
+
+    SQLite only adds a NOT NULL column with a constant default, so a callable
+    default (e.g. a timestamp) is evaluated once and existing rows get that value.
+    """
+    ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=dialect)}"
+    if column.default is None:
+        return ddl
+    value = column.default.arg(None) if column.default.is_callable else column.default.arg
+    default = literal(value, column.type).compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    ddl += f" DEFAULT {default}"
+    return ddl if column.nullable else ddl + " NOT NULL"
+
+
+def _upgrade_schema(conn) -> bool:
+    """Bring an existing database up to the current models.
+
+    ``create_all`` only creates missing tables, so columns and indexes added to
+    existing tables are created here. Returns whether change_events still holds
+    inline text for ``_migrate_inline_content``.
+    """
+    inspector = inspect(conn)
+    legacy_content = False
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                conn.exec_driver_sql(_add_column_sql(table, column, conn.dialect))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+        if table.name == "change_events" and {"diff_text", "snapshot_text"} <= existing:
+            legacy_content = True
+    return legacy_content
+
+
+def _migrate_inline_content(conn) -> bool:
+    """Move one batch of pre-content-store diff/snapshot text out of change_events rows.
+
+    Returns False once no inline text is left.
+    """
+    rows = conn.execute(
+        text(
+            "SELECT id, diff_text, snapshot_text FROM change_events "
+            "WHERE diff_text IS NOT NULL OR snapshot_text IS NOT NULL LIMIT :limit"
+        ),
+        {"limit": _LEGACY_CONTENT_BATCH},
+    ).all()
+    for event_id, diff_text, snapshot_text in rows:
+        hashes = {}
+        for key, value in (("diff_hash", diff_text), ("snapshot_hash", snapshot_text)):
+            if value is None:
+                hashes[key] = None
+                continue
+            values = blob_values(value)
+            conn.execute(
+                sqlite_insert(ContentBlob).values(**values).on_conflict_do_nothing(index_elements=["hash"])
+            )
+            hashes[key] = values["hash"]
+        conn.execute(
+            text(
+                "UPDATE change_events SET diff_hash = :diff_hash, snapshot_hash = :snapshot_hash, "
+                "diff_text = NULL, snapshot_text = NULL WHERE id = :id"
+            ),
+            {**hashes, "id": event_id},
+        )
+    return bool(rows)
+
+
+async def init_schema(engine: AsyncEngine) -> None:
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        legacy_content = await conn.run_sync(_upgrade_schema)
+        await conn.run_sync(ensure_search_index)
+    # One transaction per batch, so a large migration never holds the write lock for long
+    while legacy_content:
+        async with engine.begin() as conn:
+            legacy_content = await conn.run_sync(_migrate_inline_content)
+
+
+async def init_db():
+    await init_schema(get_engine())
 
 
 async def get_session() -> AsyncSession:
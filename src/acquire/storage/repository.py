@@ -1,25 +1,65 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import delete, or_, text, true, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, func
 
-from acquire.models.db import ChangeEvent, CostLedger, PipelineStatus
+from acquire.models.db import (
+    CLAIMABLE_STATUSES,
+    ChangeEvent,
+    ContentBlob,
+    CostLedger,
+    CrawlCache,
+    NotificationFingerprint,
+    NotificationOutbox,
+    OutboxStatus,
+    PipelineStatus,
+    SeenUrl,
+)
+from acquire.storage.content import blob_values, decompress_text
+from acquire.storage.search import fts_query
+from acquire.utils import tracing
+
+_CONTENT_CACHE_KEY = "content_cache"
+_UNIT_OF_WORK_KEY = "unit_of_work"
+
+
+def begin_unit_of_work(session: AsyncSession) -> None:
+    """Stage writes on this session instead of committing them.
+
+    update_event() and record_cost() then only add to the session (pending rows
+    are flushed by the next query), and nothing is durable until checkpoint().
+    """
+    session.info[_UNIT_OF_WORK_KEY] = True
+
+
+async def checkpoint(session: AsyncSession) -> None:
+    """Commit everything staged on the session since the last checkpoint."""
+    with tracing.span("db.commit", checkpoint=True):
+        await session.commit()
+
+
+async def _commit(session: AsyncSession) -> None:
+    if not session.info.get(_UNIT_OF_WORK_KEY):
+        with tracing.span("db.commit"):
+            await session.commit()
 
 
 async def create_event(session: AsyncSession, watch_uuid: str, watch_url: str) -> ChangeEvent:
     event = ChangeEvent(watch_uuid=watch_uuid, watch_url=watch_url)
     session.add(event)
     await session.commit()
-    await session.refresh(event)
     return event
 
 
 async def update_event(session: AsyncSession, event: ChangeEvent) -> ChangeEvent:
+    # Sessions use expire_on_commit=False and there are no server-side defaults,
+    # so the instance already holds what was written; no refresh needed.
     session.add(event)
-    await session.commit()
-    await session.refresh(event)
+    await _commit(session)
     return event
 
 
@@ -32,16 +72,171 @@ async def get_events_count(session: AsyncSession) -> int:
     return result.scalar_one()
 
 
-async def get_events_today_count(session: AsyncSession) -> int:
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+def _utc_day_bounds(now: datetime | None = None) -> tuple[datetime, datetime]:
+    """Return the half-open [start, end) range of the UTC day containing ``now``."""
+    now = now or datetime.now(timezone.utc)
+    start = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start, start + timedelta(days=1)
+
+
+async def get_events_received_count(session: AsyncSession, start: datetime, end: datetime) -> int:
+    """Count events received in [start, end). A plain range keeps ix_change_events_received_at usable."""
     result = await session.execute(
         select(func.count(ChangeEvent.id)).where(
-            func.date(ChangeEvent.received_at) == today
+            ChangeEvent.received_at >= start,
+            ChangeEvent.received_at < end,
         )
     )
     return result.scalar_one()
 
 
+async def get_events_today_count(session: AsyncSession) -> int:
+    start, end = _utc_day_bounds()
+    return await get_events_received_count(session, start, end)
+
+
+def _content_cache(session: AsyncSession) -> dict[str, str]:
+    return session.info.setdefault(_CONTENT_CACHE_KEY, {})
+
+
+def clear_content_cache(session: AsyncSession) -> None:
+    session.info.pop(_CONTENT_CACHE_KEY, None)
+
+
+async def put_content(session: AsyncSession, text: str | None) -> str | None:
+    """Store text in the content store (once per distinct text) and return its hash.
+
+    Reusing a blob refreshes its ``created_at``, so retention does not delete it as
+    an orphan while the caller's event is still uncommitted.
+    """
+    if text is None:
+        return None
+    values = blob_values(text)
+    await session.execute(
+        sqlite_insert(ContentBlob)
+        .values(**values)
+        .on_conflict_do_update(index_elements=["hash"], set_={"created_at": values["created_at"]})
+    )
+    _content_cache(session)[values["hash"]] = text
+    return values["hash"]
+
+
+async def load_content(session: AsyncSession, content_hash: str | None) -> str | None:
+    """Load and decompress text from the content store, cached for the session's lifetime."""
+    if content_hash is None:
+        return None
+    cache = _content_cache(session)
+    if content_hash in cache:
+        return cache[content_hash]
+    blob = await session.get(ContentBlob, content_hash)
+    if blob is None:
+        return None
+    text = decompress_text(blob.data, blob.codec)
+    cache[content_hash] = text
+    return text
+
+
+async def find_events_by_agency(session: AsyncSession, agency: str, limit: int = 100) -> list[ChangeEvent]:
+    """Most recent events whose relevant_agencies contains ``agency`` (case-insensitive)."""
+    agencies = func.json_each(ChangeEvent.relevant_agencies).table_valued("value").alias("agency")
+    mentions_agency = select(agencies.c.value).where(func.lower(agencies.c.value) == agency.lower()).exists()
+    result = await session.execute(
+        select(ChangeEvent)
+        .where(ChangeEvent.relevant_agencies.is_not(None), mentions_agency)
+        .order_by(ChangeEvent.received_at.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def find_upcoming_deadlines(
+    session: AsyncSession,
+    days: int = 14,
+    today: datetime | None = None,
+) -> list[tuple[ChangeEvent, str]]:
+    """(event, key date) pairs whose date falls in [today, today + days), soonest first.
+
+    Enrichment writes key dates as "YYYY-MM-DD: description"; entries without a
+    leading ISO date are ignored.
+    """
+    start, _ = _utc_day_bounds(today)
+    end = start + timedelta(days=days)
+    key_dates = func.json_each(ChangeEvent.key_dates).table_valued("value").alias("key_date")
+    day = func.substr(key_dates.c.value, 1, 10)
+    result = await session.execute(
+        select(ChangeEvent, key_dates.c.value)
+        .join(key_dates, true())
+        .where(
+            ChangeEvent.key_dates.is_not(None),
+            day.op("GLOB")("[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"),
+            day >= start.strftime("%Y-%m-%d"),
+            day < end.strftime("%Y-%m-%d"),
+        )
+        .order_by(day, ChangeEvent.id)
+    )
+    return [(event, key_date) for event, key_date in result.all()]
+
+
+# Columns the event listing/export may return; diff/snapshot text is never included
+EVENT_LIST_COLUMNS = (
+    "id",
+    "watch_uuid",
+    "watch_url",
+    "received_at",
+    "parent_event_id",
+    "pipeline_status",
+    "error_message",
+    "classification",
+    "classification_confidence",
+    "urgency",
+    "summary",
+    "recommended_actions",
+    "key_dates",
+    "relevant_agencies",
+    "slack_message_ts",
+)
+
+
+async def list_events(
+    session: AsyncSession,
+    columns: list[str] | None = None,
+    status: list[str] | None = None,
+    classification: list[str] | None = None,
+    urgency: list[str] | None = None,
+    watch_uuid: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int = 50,
+) -> list[dict]:
+    """Events newest first, projected to ``columns``, resuming after the keyset ``after``.
+
+    ``after`` is the (received_at, id) of the last row of the previous page, so each
+    page is an index range scan rather than an OFFSET skip. ``since``/``until`` bound
+    received_at as a half-open range.
+    """
+    names = list(dict.fromkeys(["id", "received_at", *(columns or EVENT_LIST_COLUMNS)]))
+    stmt = select(*(getattr(ChangeEvent, name) for name in names))
+    if status:
+        stmt = stmt.where(ChangeEvent.pipeline_status.in_(status))
+    if classification:
+        stmt = stmt.where(ChangeEvent.classification.in_(classification))
+    if urgency:
+        stmt = stmt.where(ChangeEvent.urgency.in_(urgency))
+    if watch_uuid:
+        stmt = stmt.where(ChangeEvent.watch_uuid == watch_uuid)
+    if since:
+        stmt = stmt.where(ChangeEvent.received_at >= since)
+    if until:
+        stmt = stmt.where(ChangeEvent.received_at < until)
+    if after:
+        stmt = stmt.where(tuple_(ChangeEvent.received_at, ChangeEvent.id) < tuple_(*after))
+    stmt = stmt.order_by(ChangeEvent.received_at.desc(), ChangeEvent.id.desc()).limit(limit)
+
+    result = await session.execute(stmt)
+    return [dict(row) for row in result.mappings().all()]
+
+
 async def create_child_event(
     session: AsyncSession,
     parent: ChangeEvent,
@@ -53,12 +248,12 @@ async def create_child_event(
         watch_uuid=parent.watch_uuid,
         watch_url=url,
         parent_event_id=parent.id,
-        snapshot_text=page_text,
+        snapshot_hash=await put_content(session, page_text),
         pipeline_status=PipelineStatus.FETCHED.value,
     )
     session.add(child)
+    # Always commit: the child pipeline runs in its own session
     await session.commit()
-    await session.refresh(child)
     return child
 
 
@@ -79,7 +274,7 @@ async def record_cost(
         event_id=event_id,
     )
     session.add(entry)
-    await session.commit()
+    await _commit(session)
     return entry
 
 
@@ -92,3 +287,297 @@ async def get_daily_spend(session: AsyncSession, date: str | None = None) -> flo
         )
     )
     return result.scalar_one()
+
+
+def _lease_available(now: datetime):
+    return or_(ChangeEvent.lease_expires_at.is_(None), ChangeEvent.lease_expires_at < now)
+
+
+async def claim_event(session: AsyncSession, owner: str, lease_seconds: float, candidates: int = 5) -> int | None:
+    """Lease the oldest unfinished event that no live worker holds. Returns its id, or None.
+
+    The claim is a conditional UPDATE, so when several workers race for the same
+    row exactly one of them sees rowcount == 1.
+    """
+    now = datetime.now(timezone.utc)
+    result = await session.execute(
+        select(ChangeEvent.id)
+        .where(ChangeEvent.pipeline_status.in_(CLAIMABLE_STATUSES), _lease_available(now))
+        .order_by(ChangeEvent.id)
+        .limit(candidates)
+    )
+    for event_id in result.scalars().all():
+        claimed = await session.execute(
+            update(ChangeEvent)
+            .where(
+                ChangeEvent.id == event_id,
+                ChangeEvent.pipeline_status.in_(CLAIMABLE_STATUSES),
+                _lease_available(now),
+            )
+            .values(lease_owner=owner, lease_expires_at=now + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        if claimed.rowcount == 1:
+            return event_id
+    return None
+
+
+async def renew_lease(session: AsyncSession, event_id: int, owner: str, lease_seconds: float) -> bool:
+    """Extend a lease this owner still holds. False means the lease was lost."""
+    result = await session.execute(
+        update(ChangeEvent)
+        .where(ChangeEvent.id == event_id, ChangeEvent.lease_owner == owner)
+        .values(lease_expires_at=datetime.now(timezone.utc) + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return result.rowcount == 1
+
+
+async def holds_lease(session: AsyncSession, event_id: int, owner: str) -> bool:
+    """Whether ``owner`` still holds an unexpired lease on the event.
+
+    Checked inside the transaction about to commit, so pending writes are flushed first.
+    """
+    result = await session.execute(
+        select(ChangeEvent.id).where(
+            ChangeEvent.id == event_id,
+            ChangeEvent.lease_owner == owner,
+            ChangeEvent.lease_expires_at >= datetime.now(timezone.utc),
+        )
+    )
+    return result.first() is not None
+
+
+async def release_lease(session: AsyncSession, event_id: int, owner: str) -> None:
+    await session.execute(
+        update(ChangeEvent)
+        .where(ChangeEvent.id == event_id, ChangeEvent.lease_owner == owner)
+        .values(lease_owner=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+
+
+async def enqueue_notification(
+    session: AsyncSession, event_id: int, kind: str, destination: str = "slack"
+) -> None:
+    """Stage an outbox row for the event; it is committed with the caller's next commit.
+
+    Enqueueing the same event and destination twice is a no-op.
+    """
+    now = datetime.now(timezone.utc)
+    await session.execute(
+        sqlite_insert(NotificationOutbox)
+        .values(
+            event_id=event_id,
+            destination=destination,
+            kind=kind,
+            idempotency_key=f"{event_id}:{destination}",
+            status=OutboxStatus.PENDING.value,
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now,
+        )
+        .on_conflict_do_nothing(index_elements=["idempotency_key"])
+    )
+
+
+async def claim_notifications(
+    session: AsyncSession,
+    kind: str,
+    lease_seconds: float,
+    limit: int = 20,
+    now: datetime | None = None,
+) -> list[NotificationOutbox]:
+    """Take due pending outbox rows of ``kind``, counting an attempt on each.
+
+    Claiming pushes next_attempt_at past the lease, so concurrent senders skip the
+    rows; if the sender dies they become due again when the lease runs out.
+    """
+    now = now or datetime.now(timezone.utc)
+    due = (
+        NotificationOutbox.status == OutboxStatus.PENDING.value,
+        NotificationOutbox.kind == kind,
+        NotificationOutbox.next_attempt_at <= now,
+    )
+    result = await session.execute(
+        select(NotificationOutbox.id)
+        .where(*due)
+        .order_by(NotificationOutbox.next_attempt_at, NotificationOutbox.id)
+        .limit(limit)
+    )
+    claimed = []
+    for outbox_id in result.scalars().all():
+        updated = await session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id == outbox_id, *due)
+            .values(
+                next_attempt_at=now + timedelta(seconds=lease_seconds),
+                attempts=NotificationOutbox.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if updated.rowcount == 1:
+            claimed.append(outbox_id)
+    await session.commit()
+    if not claimed:
+        return []
+
+    result = await session.execute(
+        select(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(claimed))
+        .order_by(NotificationOutbox.id)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+async def requeue_notifications(session: AsyncSession, from_kind: str, to_kind: str) -> int:
+    """Move pending outbox rows of ``from_kind`` to ``to_kind``. Returns the number moved."""
+    result = await session.execute(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.status == OutboxStatus.PENDING.value, NotificationOutbox.kind == from_kind)
+        .values(kind=to_kind)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return result.rowcount
+
+
+async def get_notifications(session: AsyncSession, event_id: int) -> list[NotificationOutbox]:
+    result = await session.execute(
+        select(NotificationOutbox).where(NotificationOutbox.event_id == event_id).order_by(NotificationOutbox.id)
+    )
+    return list(result.scalars().all())
+
+
+async def find_fingerprint(
+    session: AsyncSession, fingerprints: list[str], destination: str, now: datetime
+) -> int | None:
+    """Event id of an unexpired fingerprint among ``fingerprints`` for the destination."""
+    result = await session.execute(
+        select(NotificationFingerprint.event_id)
+        .where(
+            NotificationFingerprint.fingerprint.in_(fingerprints),
+            NotificationFingerprint.destination == destination,
+            NotificationFingerprint.expires_at > now,
+        )
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def record_fingerprints(
+    session: AsyncSession, fingerprints: list[str], destination: str, event_id: int, expires_at: datetime
+) -> None:
+    """Store fingerprints for a notified event, replacing expired entries; the caller commits."""
+    for fingerprint in fingerprints:
+        stmt = sqlite_insert(NotificationFingerprint).values(
+            fingerprint=fingerprint, destination=destination, event_id=event_id, expires_at=expires_at
+        )
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["fingerprint", "destination"],
+                set_={"event_id": stmt.excluded.event_id, "expires_at": stmt.excluded.expires_at},
+            )
+        )
+
+
+async def delete_fingerprints(session: AsyncSession, destination: str, event_id: int) -> None:
+    await session.execute(
+        delete(NotificationFingerprint).where(
+            NotificationFingerprint.destination == destination,
+            NotificationFingerprint.event_id == event_id,
+        )
+    )
+
+
+async def delete_expired_fingerprints(session: AsyncSession, now: datetime) -> int:
+    result = await session.execute(delete(NotificationFingerprint).where(NotificationFingerprint.expires_at <= now))
+    await session.commit()
+    return result.rowcount
+
+
+async def get_crawl_cache(session: AsyncSession, url: str) -> CrawlCache | None:
+    return await session.get(CrawlCache, url, populate_existing=True)
+
+
+async def save_crawl_cache(
+    session: AsyncSession,
+    url: str,
+    text: str,
+    max_chars: int,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    validated_at: datetime | None = None,
+) -> None:
+    values = {
+        "url": url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "text": text,
+        "max_chars": max_chars,
+        "validated_at": validated_at or datetime.now(timezone.utc),
+    }
+    stmt = sqlite_insert(CrawlCache).values(**values)
+    await session.execute(
+        stmt.on_conflict_do_update(index_elements=["url"], set_={k: v for k, v in values.items() if k != "url"})
+    )
+    await _commit(session)
+
+
+async def delete_stale_crawl_cache(session: AsyncSession, cutoff: datetime) -> int:
+    result = await session.execute(delete(CrawlCache).where(CrawlCache.validated_at < cutoff))
+    await session.commit()
+    return result.rowcount
+
+
+async def find_seen_urls(session: AsyncSession, urls: list[str], now: datetime) -> set[str]:
+    """The canonical URLs among ``urls`` that were processed and have not expired."""
+    if not urls:
+        return set()
+    result = await session.execute(select(SeenUrl.url).where(SeenUrl.url.in_(urls), SeenUrl.expires_at > now))
+    return set(result.scalars().all())
+
+
+async def mark_url_seen(session: AsyncSession, url: str, event_id: int, expires_at: datetime) -> None:
+    stmt = sqlite_insert(SeenUrl).values(url=url, event_id=event_id, expires_at=expires_at)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["url"],
+            set_={"event_id": stmt.excluded.event_id, "expires_at": stmt.excluded.expires_at},
+        )
+    )
+    # Always commit, like create_child_event: other events' link discovery must see it
+    await session.commit()
+
+
+async def delete_expired_seen_urls(session: AsyncSession, now: datetime) -> int:
+    result = await session.execute(delete(SeenUrl).where(SeenUrl.expires_at <= now))
+    await session.commit()
+    return result.rowcount
+
+
+async def search_events(session: AsyncSession, query: str, limit: int = 20) -> list[dict]:
+    """Full-text search over diff text, summaries and classification reasoning.
+
+    Returns dicts ordered by bm25 relevance (summary matches weigh most), each with a
+    highlighted ``snippet`` from the best-matching column.
+    """
+    match = fts_query(query)
+    if not match:
+        return []
+    result = await session.execute(
+        text(
+            "SELECT e.id AS event_id, e.watch_url, e.received_at, e.pipeline_status, "
+            "e.classification, e.urgency, e.summary, "
+            "bm25(event_search, 1.0, 3.0, 1.5) AS rank, "
+            "snippet(event_search, -1, '<mark>', '</mark>', '…', 16) AS snippet "
+            "FROM event_search JOIN change_events AS e ON e.id = event_search.rowid "
+            "WHERE event_search MATCH :match ORDER BY rank LIMIT :limit"
+        ),
+        {"match": match, "limit": limit},
+    )
+    return [dict(row) for row in result.mappings().all()]
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import structlog
+from sqlalchemy import delete, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import select
+
+from acquire.config import get_settings
+from acquire.models.db import (
+    ChangeEvent,
+    ContentBlob,
+    CostLedger,
+    NotificationFingerprint,
+    NotificationOutbox,
+    SeenUrl,
+)
+from acquire.storage import repository
+from acquire.storage.database import get_session_factory
+
+logger = structlog.get_logger()
+
+ARCHIVE_PREFIX = "change_events-"
+
+
+def _retention_config() -> dict:
+    return get_settings().load_yaml_config().get("retention", {}) or {}
+
+
+def archive_path(archive_dir: Path, day: date) -> Path:
+    """Date-partitioned archive file for events received on ``day``."""
+    return archive_dir / f"{day:%Y}" / f"{day:%m}" / f"{ARCHIVE_PREFIX}{day:%Y-%m-%d}.jsonl.gz"
+
+
+def _append_records(archive_dir: Path, records: list[dict]) -> None:
+    by_path: dict[Path, list[dict]] = defaultdict(list)
+    for record in records:
+        received = datetime.fromisoformat(record["received_at"])
+        by_path[archive_path(archive_dir, received.date())].append(record)
+
+    for path, path_records in by_path.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Appending writes a new gzip member; gzip readers treat the file as one stream
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            for record in path_records:
+                f.write(json.dumps(record) + "\n")
+
+
+def iter_archived_events(archive_dir: Path | str, start: date | None = None, end: date | None = None) -> Iterator[dict]:
+    """Yield archived event records in date order, optionally limited to [start, end).
+
+    A record can appear twice if the job was interrupted between writing the archive
+    and committing the batch; the later record for an id supersedes earlier ones.
+    """
+    for path in sorted(Path(archive_dir).glob(f"*/*/{ARCHIVE_PREFIX}*.jsonl.gz")):
+        day = date.fromisoformat(path.name[len(ARCHIVE_PREFIX):].split(".")[0])
+        if (start and day < start) or (end and day >= end):
+            continue
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+async def restore_event(session: AsyncSession, record: dict, now: datetime | None = None) -> ChangeEvent:
+    """Put an archived event's text back into the content store, recreating the row if it was deleted.
+
+    ``restored_at`` keeps retention from archiving the event again for another
+    ``archive_after_days``.
+    """
+    event = await repository.get_event(session, record["id"])
+    if event is None:
+        fields = {k: v for k, v in record.items() if k in ChangeEvent.model_fields}
+        event = ChangeEvent.model_validate(fields)
+    event.diff_hash = await repository.put_content(session, record.get("diff_text"))
+    event.snapshot_hash = await repository.put_content(session, record.get("snapshot_text"))
+    event.archived_at = None
+    event.restored_at = now or datetime.now(timezone.utc)
+    session.add(event)
+    await session.commit()
+    return event
+
+
+async def _archive_batch(session: AsyncSession, archive_dir: Path, cutoff: datetime, batch_size: int, now: datetime) -> int:
+    result = await session.execute(
+        select(ChangeEvent)
+        .where(
+            ChangeEvent.received_at < cutoff,
+            or_(ChangeEvent.restored_at.is_(None), ChangeEvent.restored_at < cutoff),
+            or_(ChangeEvent.diff_hash.is_not(None), ChangeEvent.snapshot_hash.is_not(None)),
+        )
+        .order_by(ChangeEvent.id)
+        .limit(batch_size)
+    )
+    events = result.scalars().all()
+    if not events:
+        return 0
+
+    records = []
+    for event in events:
+        record = event.model_dump(mode="json")
+        record["diff_text"] = await repository.load_content(session, event.diff_hash)
+        record["snapshot_text"] = await repository.load_content(session, event.snapshot_hash)
+        records.append(record)
+
+    # Archive first: if the commit below fails the rows are simply archived again next run
+    await asyncio.to_thread(_append_records, archive_dir, records)
+
+    for event in events:
+        event.diff_hash = None
+        event.snapshot_hash = None
+        event.archived_at = now
+        session.add(event)
+    await session.commit()
+    # Release the batch's rows and decompressed text before the next one
+    session.expunge_all()
+    repository.clear_content_cache(session)
+    return len(events)
+
+
+async def _delete_orphan_blobs(session: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    referenced_as_diff = select(ChangeEvent.id).where(ChangeEvent.diff_hash == ContentBlob.hash).exists()
+    referenced_as_snapshot = select(ChangeEvent.id).where(ChangeEvent.snapshot_hash == ContentBlob.hash).exists()
+    result = await session.execute(
+        select(ContentBlob.hash)
+        .where(ContentBlob.created_at < cutoff, ~referenced_as_diff, ~referenced_as_snapshot)
+        .limit(batch_size)
+    )
+    hashes = result.scalars().all()
+    if hashes:
+        # Re-checked in the DELETE: a blob reused since the SELECT is no longer an orphan
+        await session.execute(
+            delete(ContentBlob).where(
+                ContentBlob.hash.in_(hashes), ContentBlob.created_at < cutoff, ~referenced_as_diff, ~referenced_as_snapshot
+            )
+        )
+        await session.commit()
+    return len(hashes)
+
+
+async def _delete_archived_events(session: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    result = await session.execute(
+        select(ChangeEvent.id)
+        .where(ChangeEvent.archived_at.is_not(None), ChangeEvent.received_at < cutoff)
+        .order_by(ChangeEvent.id)
+        .limit(batch_size)
+    )
+    ids = result.scalars().all()
+    if ids:
+        # Rows that reference the events go in the same transaction; spend history is kept
+        for model in (NotificationOutbox, NotificationFingerprint, SeenUrl):
+            await session.execute(delete(model).where(model.event_id.in_(ids)))
+        await session.execute(update(CostLedger).where(CostLedger.event_id.in_(ids)).values(event_id=None))
+        await session.execute(delete(ChangeEvent).where(ChangeEvent.id.in_(ids)))
+        await session.commit()
+    return len(ids)
+
+
+def _incremental_vacuum(conn, max_pages: int) -> int:
+    if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+        logger.info("retention_vacuum_unavailable", hint="run 'PRAGMA auto_vacuum=INCREMENTAL; VACUUM;' once")
+        return 0
+    free_pages = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+    pages = min(free_pages, max_pages)
+    # pysqlite steps a no-result statement once, and each step frees one page
+    for _ in range(pages):
+        conn.exec_driver_sql("PRAGMA incremental_vacuum(1)")
+    return pages
+
+
+async def run_retention(
+    factory: async_sessionmaker[AsyncSession] | None = None,
+    now: datetime | None = None,
+) -> dict[str, int]:
+    """Archive and prune old event data in small batches. Returns per-step counts."""
+    config = _retention_config()
+    factory = factory or get_session_factory()
+    now = now or datetime.now(timezone.utc)
+    archive_dir = Path(config.get("archive_dir", "data/archive"))
+    batch_size = config.get("batch_size", 200)
+    archive_cutoff = now - timedelta(days=config.get("archive_after_days", 90))
+    delete_after_days = config.get("delete_after_days")
+
+    stats = {
+        "archived": 0,
+        "blobs_deleted": 0,
+        "events_deleted": 0,
+        "fingerprints_deleted": 0,
+        "crawl_cache_deleted": 0,
+        "seen_urls_deleted": 0,
+        "pages_vacuumed": 0,
+    }
+
+    # Each batch is its own short transaction so webhook and pipeline writes interleave
+    async with factory() as session:
+        while archived := await _archive_batch(session, archive_dir, archive_cutoff, batch_size, now):
+            stats["archived"] += archived
+
+        while deleted := await _delete_orphan_blobs(session, archive_cutoff, batch_size):
+            stats["blobs_deleted"] += deleted
+
+        if delete_after_days is not None:
+            delete_cutoff = now - timedelta(days=delete_after_days)
+            while deleted := await _delete_archived_events(session, delete_cutoff, batch_size):
+                stats["events_deleted"] += deleted
+
+        stats["fingerprints_deleted"] = await repository.delete_expired_fingerprints(session, now)
+        cache_config = get_settings().load_yaml_config().get("link_discovery", {}).get("cache", {})
+        crawl_cache_cutoff = now - timedelta(days=cache_config.get("max_age_days", 30))
+        stats["crawl_cache_deleted"] = await repository.delete_stale_crawl_cache(session, crawl_cache_cutoff)
+        stats["seen_urls_deleted"] = await repository.delete_expired_seen_urls(session, now)
+
+        connection = await session.connection()
+        stats["pages_vacuumed"] = await connection.run_sync(_incremental_vacuum, config.get("vacuum_pages", 2000))
+        await session.commit()
+
+    logger.info("retention_complete", **stats)
+    return stats
+
+
+async def retention_loop() -> None:
+    """Run the retention job every ``retention.interval_hours`` until cancelled."""
+    config = _retention_config()
+    if not config.get("enabled", False):
+        return
+    interval = config.get("interval_hours", 24) * 3600
+    while True:
+        try:
+            await run_retention()
+        except Exception as e:
+            logger.exception("retention_error", error=str(e)[:200])
+        await asyncio.sleep(interval)
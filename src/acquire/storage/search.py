@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import structlog
+
+from acquire.config import get_settings
+
+logger = structlog.get_logger()
+
+SEARCH_TABLE = "event_search"
+
+# Diff text is looked up in the content store and inflated by the acquire_content()
+# SQL function that storage.database registers on every connection.
+_DIFF_TEXT_SQL = (
+    "(SELECT acquire_content(data, codec, {max_chars}) FROM content_blobs WHERE hash = {ref}.diff_hash)"
+)
+
+_TRIGGERS = {
+    "change_events_search_insert": """
+        CREATE TRIGGER change_events_search_insert AFTER INSERT ON change_events BEGIN
+            INSERT INTO event_search (rowid, diff_text, summary, classification_reasoning)
+            VALUES (NEW.id, {diff_text}, NEW.summary, NEW.classification_reasoning);
+        END
+    """,
+    "change_events_search_text": """
+        CREATE TRIGGER change_events_search_text AFTER UPDATE OF summary, classification_reasoning ON change_events
+        WHEN OLD.summary IS NOT NEW.summary OR OLD.classification_reasoning IS NOT NEW.classification_reasoning
+        BEGIN
+            UPDATE event_search SET summary = NEW.summary, classification_reasoning = NEW.classification_reasoning
+            WHERE rowid = NEW.id;
+        END
+    """,
+    # Retention clears diff_hash once text is archived, which drops the indexed diff too
+    "change_events_search_diff": """
+        CREATE TRIGGER change_events_search_diff AFTER UPDATE OF diff_hash ON change_events
+        WHEN OLD.diff_hash IS NOT NEW.diff_hash
+        BEGIN
+            UPDATE event_search SET diff_text = {diff_text} WHERE rowid = NEW.id;
+        END
+    """,
+    "change_events_search_delete": """
+        CREATE TRIGGER change_events_search_delete AFTER DELETE ON change_events BEGIN
+            DELETE FROM event_search WHERE rowid = OLD.id;
+        END
+    """,
+}
+
+
+def ensure_search_index(conn) -> None:
+    """Create the FTS5 index over events and the triggers that keep it in sync.
+
+    Triggers are recreated on every start so a changed ``search.max_indexed_chars``
+    applies to subsequent writes. Existing events are indexed when the table is new.
+    """
+    max_chars = int(get_settings().load_yaml_config().get("search", {}).get("max_indexed_chars", 20000))
+
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_TABLE,)
+    ).first()
+    if not exists:
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+            "diff_text, summary, classification_reasoning, tokenize = 'porter unicode61')"
+        )
+
+    # Databases from before archiving dropped the indexed diff still hold archived text
+    old_diff_trigger = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'change_events_search_diff' "
+        "AND sql LIKE '%NEW.diff_hash IS NOT NULL%'"
+    ).first()
+    if old_diff_trigger:
+        conn.exec_driver_sql(
+            f"UPDATE {SEARCH_TABLE} SET diff_text = NULL "
+            "WHERE rowid IN (SELECT id FROM change_events WHERE diff_hash IS NULL AND archived_at IS NOT NULL)"
+        )
+
+    for name, ddl in _TRIGGERS.items():
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+        conn.exec_driver_sql(
+            ddl.format(diff_text=_DIFF_TEXT_SQL.format(max_chars=max_chars, ref="NEW"))
+        )
+
+    if not exists:
+        conn.exec_driver_sql(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, diff_text, summary, classification_reasoning) "
+            f"SELECT id, {_DIFF_TEXT_SQL.format(max_chars=max_chars, ref='change_events')}, "
+            "summary, classification_reasoning FROM change_events"
+        )
+        logger.info("search_index_created")
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every term must match, ``term*`` is a prefix.
+
+    Terms are quoted, so user input can never be an FTS5 syntax error.
+    """
+    terms = []
+    for term in text.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def retry_after_seconds(value: str | None, default: float, max_wait: float) -> float:
+    """Seconds to wait from a ``Retry-After`` header, capped at ``max_wait``.
+
+    Accepts both forms: delay-seconds and an HTTP-date. An unparseable value
+    waits ``max_wait``.
+    """
+    if value is None:
+        return min(default, max_wait)
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return float(max_wait)
+    return min(max(seconds, 0.0), max_wait)
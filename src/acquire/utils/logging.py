@@ -1,18 +1,148 @@
 from __future__ import annotations
 
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from typing import TextIO
+
 import structlog
 
+from acquire.config import get_settings
+
+_writer: QueueWriter | None = None
+
+
+class QueueWriter:
+    """Writes log records as JSON lines from a background thread.
+
+    Log calls only enqueue the event dict; rendering and the stdout write happen
+    off the event loop. When the queue is full records are dropped and counted
+    rather than blocking the caller.
+    """
+
+    def __init__(self, stream: TextIO | None = None, max_queue: int = 10000, batch_size: int = 256) -> None:
+        self.stream = stream or sys.stdout
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="acquire-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, event_dict: dict) -> None:
+        try:
+            self._queue.put_nowait(event_dict)
+        except queue.Full:
+            self.dropped += 1
+
+    def _render(self, event_dict: dict) -> str:
+        return json.dumps(event_dict, default=str)
+
+    def _run(self) -> None:
+        reported = 0
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            lines = [self._render(record) for record in batch if record is not None]
+            if self.dropped != reported:
+                lines.append(self._render({"event": "log_records_dropped", "count": self.dropped - reported}))
+                reported = self.dropped
+            if lines:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            if stop:
+                return
+
+    def close(self) -> None:
+        """Write everything queued so far and stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+class _QueueLogger:
+    def __init__(self, writer: QueueWriter) -> None:
+        self._writer = writer
+
+    def msg(self, event_dict: dict) -> None:
+        self._writer.submit(event_dict)
+
+    log = debug = info = warning = warn = error = critical = exception = fatal = msg
+
+
+def _enqueue(logger, method_name: str, event_dict: dict) -> tuple:
+    # Hands the dict itself to _QueueLogger; the writer thread renders it
+    return (event_dict,), {}
+
+
+def _sample_debug(rate: float):
+    def sample(logger, method_name: str, event_dict: dict) -> dict:
+        if method_name == "debug" and random.random() >= rate:
+            raise structlog.DropEvent
+        return event_dict
+
+    return sample
+
+
+def _stop_writer() -> None:
+    global _writer
+    if _writer is not None:
+        writer, _writer = _writer, None
+        writer.close()
+
+
+atexit.register(_stop_writer)
+
+
+def setup_logging(
+    log_format: str | None = None,
+    level: str | None = None,
+    debug_sample_rate: float | None = None,
+    stream: TextIO | None = None,
+):
+    """Configure structlog from LOG_FORMAT, LOG_LEVEL and LOG_DEBUG_SAMPLE_RATE.
+
+    ``console`` (the default) renders colored lines synchronously for development.
+    ``json`` renders one JSON object per line on a background writer thread.
+    """
+    global _writer
+    settings = get_settings()
+    log_format = log_format or settings.log_format
+    level = level or settings.log_level
+    rate = settings.log_debug_sample_rate if debug_sample_rate is None else debug_sample_rate
+
+    processors = [structlog.contextvars.merge_contextvars, structlog.processors.add_log_level]
+    if rate < 1:
+        processors.append(_sample_debug(rate))
+
+    if log_format == "json":
+        if _writer is None or (stream is not None and _writer.stream is not stream):
+            _stop_writer()
+            _writer = QueueWriter(stream)
+        writer = _writer
+        processors += [
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            # Tracebacks must be captured while the exception is current
+            structlog.processors.format_exc_info,
+            _enqueue,
+        ]
+        logger_factory = lambda *args: _QueueLogger(writer)  # noqa: E731
+    else:
+        _stop_writer()
+        processors += [structlog.processors.TimeStamper(fmt="iso"), structlog.dev.ConsoleRenderer()]
+        logger_factory = structlog.PrintLoggerFactory(stream)
 
-def setup_logging():
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer() if True else structlog.processors.JSONRenderer(),
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(0),
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(level.upper())),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
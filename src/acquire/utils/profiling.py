@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import structlog
+
+from acquire.config import get_settings
+
+logger = structlog.get_logger()
+
+PROFILE_KINDS = ("pipeline", "request")
+
+
+class Profile:
+    """Stack samples taken while one asyncio task was running on the loop."""
+
+    def __init__(self, kind: str, labels: dict) -> None:
+        self.kind = kind
+        self.labels = labels
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.started = time.perf_counter()
+        self.wall = 0.0
+
+    def label(self, **labels) -> None:
+        self.labels.update(labels)
+
+    def render(self, interval: float) -> str:
+        on_loop = self.samples * interval
+        share = on_loop / self.wall * 100 if self.wall else 0.0
+        lines = [
+            f"# {self.kind} " + " ".join(f"{k}={v}" for k, v in self.labels.items()),
+            f"# wall_ms={self.wall * 1000:.1f} on_loop_ms={on_loop * 1000:.1f} ({share:.0f}%) "
+            f"samples={self.samples} interval_ms={interval * 1000:g}",
+            "# the rest of the wall time was spent awaiting I/O, locks or other tasks",
+            "# collapsed stacks (flamegraph.pl / speedscope):",
+        ]
+        lines += [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n"
+
+
+def _collapse(frame) -> str:
+    """``file:function`` frames, outermost first, below the event loop's handle dispatch."""
+    names = []
+    for f, _ in traceback.walk_stack(frame):
+        code = f.f_code
+        if code.co_name == "_run" and code.co_filename.endswith(os.path.join("asyncio", "events.py")):
+            break
+        names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+    return ";".join(reversed(names))
+
+
+class Sampler:
+    """Samples the event loop thread's stack and credits it to the task being run.
+
+    A thread wakes every ``interval`` seconds while any profile is active, so
+    profiled code runs unmodified and the overhead is one stack walk per sample.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._active: dict[asyncio.Task, list[Profile]] = {}
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id = 0
+        self._thread: threading.Thread | None = None
+
+    def start(self, profile: Profile) -> None:
+        task = asyncio.current_task()
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._thread_id = threading.get_ident()
+            self._active.setdefault(task, []).append(profile)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="acquire-profiler", daemon=True)
+                self._thread.start()
+
+    def stop(self, profile: Profile) -> None:
+        task = asyncio.current_task()
+        with self._lock:
+            profiles = self._active.get(task, [])
+            if profile in profiles:
+                profiles.remove(profile)
+            if not profiles:
+                self._active.pop(task, None)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                task = asyncio.current_task(self._loop)
+                profiles = self._active.get(task)
+                frame = sys._current_frames().get(self._thread_id) if profiles else None
+                if frame is not None:
+                    stack = _collapse(frame)
+                    for profile in profiles:
+                        profile.samples += 1
+                        profile.stacks[stack] += 1
+
+
+class Profiler:
+    """Runtime-adjustable sampling of pipeline runs and webhook requests."""
+
+    def __init__(self, config: dict, pipeline_rate: float, request_rate: float) -> None:
+        self.rates = {"pipeline": pipeline_rate, "request": request_rate}
+        self.output_dir = Path(config.get("output_dir", "data/profiles"))
+        self.sampler = Sampler(config.get("sample_interval_ms", 5) / 1000)
+        self.written = 0
+
+    def set_rates(self, pipeline: float | None = None, request: float | None = None) -> None:
+        if pipeline is not None:
+            self.rates["pipeline"] = pipeline
+        if request is not None:
+            self.rates["request"] = request
+
+    def _write(self, profile: Profile) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        event = f"-event{profile.labels['event_id']}" if profile.labels.get("event_id") else ""
+        path = self.output_dir / f"{profile.kind}{event}-{stamp}.txt"
+        path.write_text(profile.render(self.sampler.interval))
+        self.written += 1
+        return path
+
+    @asynccontextmanager
+    async def profile(self, kind: str, **labels):
+        """Profile the enclosed block with probability ``rates[kind]``; yields the Profile or None."""
+        if random.random() >= self.rates.get(kind, 0.0):
+            yield None
+            return
+        current = Profile(kind, labels)
+        self.sampler.start(current)
+        try:
+            yield current
+        finally:
+            self.sampler.stop(current)
+            current.wall = time.perf_counter() - current.started
+            # Off the loop: a slow disk must not show up as the lag being measured
+            path = await asyncio.to_thread(self._write, current)
+            logger.info("profile_written", kind=kind, path=str(path), wall_ms=round(current.wall * 1000, 1), **labels)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs a timer; a late timer means something blocked it.
+
+    When the loop stays blocked past ``warn_ms`` a watchdog thread logs the loop
+    thread's stack, naming the blocking call.
+    """
+
+    def __init__(self, interval: float = 0.5, warn_ms: float = 100, window: int = 120) -> None:
+        self.interval = interval
+        self.warn = warn_ms / 1000
+        self.lags: deque[float] = deque(maxlen=window)
+        self._beat = time.monotonic()
+        self._thread_id = 0
+
+    def stats(self) -> dict:
+        lags = sorted(self.lags)
+        if not lags:
+            return {"samples": 0, "last_ms": None, "p99_ms": None, "max_ms": None}
+        return {
+            "samples": len(lags),
+            "last_ms": round(self.lags[-1] * 1000, 1),
+            "p99_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000, 1),
+            "max_ms": round(lags[-1] * 1000, 1),
+        }
+
+    def _watchdog(self, stop: threading.Event) -> None:
+        reported = None
+        while not stop.wait(self.warn / 2):
+            beat = self._beat
+            if time.monotonic() - beat > self.interval + self.warn and reported != beat:
+                reported = beat
+                frame = sys._current_frames().get(self._thread_id)
+                if frame is not None:
+                    logger.warning(
+                        "event_loop_blocked",
+                        blocked_ms=round((time.monotonic() - beat - self.interval) * 1000),
+                        stack=_collapse(frame).replace(";", " > ")[-1000:],
+                    )
+
+    async def run(self) -> None:
+        self._thread_id = threading.get_ident()
+        stop = threading.Event()
+        threading.Thread(target=self._watchdog, args=(stop,), name="acquire-loop-watchdog", daemon=True).start()
+        try:
+            while True:
+                self._beat = time.monotonic()
+                await asyncio.sleep(self.interval)
+                lag = max(0.0, time.monotonic() - self._beat - self.interval)
+                self.lags.append(lag)
+                if lag > self.warn:
+                    logger.warning("event_loop_lag", lag_ms=round(lag * 1000, 1))
+        finally:
+            stop.set()
+
+
+def profiling_config() -> dict:
+    return get_settings().load_yaml_config().get("profiling", {}) or {}
+
+
+_profiler: Profiler | None = None
+_monitor: LoopLagMonitor | None = None
+
+
+def get_profiler() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        settings = get_settings()
+        _profiler = Profiler(profiling_config(), settings.profile_pipeline_rate, settings.profile_request_rate)
+    return _profiler
+
+
+def profile(kind: str, **labels):
+    return get_profiler().profile(kind, **labels)
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    global _monitor
+    if _monitor is None:
+        config = profiling_config().get("loop_lag", {})
+        _monitor = LoopLagMonitor(config.get("interval_seconds", 0.5), config.get("warn_ms", 100))
+    return _monitor
+
+
+async def loop_lag_loop() -> None:
+    """Background task: event-loop lag monitor."""
+    await get_loop_monitor().run()
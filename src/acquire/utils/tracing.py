@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import atexit
+import contextvars
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+import structlog
+
+from acquire.config import get_settings
+
+logger = structlog.get_logger()
+
+# Copied from a span to the spans started inside it
+INHERITED_ATTRIBUTES = ("event_id", "parent_event_id")
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("acquire_span", default=None)
+_processor: BatchProcessor | None = None
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, name: str, trace_id: str, span_id: str, parent_id: str | None, attributes: dict) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: str | None = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+def _random_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+def event_trace_id(event_id: int) -> str:
+    """Trace id of an event's pipeline; derived, so a child run in another process can join it."""
+    return hashlib.sha256(f"acquire-event:{event_id}".encode()).hexdigest()[:32]
+
+
+def event_span_id(event_id: int) -> str:
+    """Span id of the root ``pipeline`` span of an event that has no parent."""
+    return hashlib.sha256(f"acquire-event-span:{event_id}".encode()).hexdigest()[:16]
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, *, trace_id: str | None = None, parent_id: str | None = None, span_id: str | None = None, **attributes):
+    """Time the enclosed block as a span nested under the current one.
+
+    ``trace_id``/``parent_id`` start the span under a remote parent instead when
+    there is no current span. Yields None (and records nothing) when tracing is off.
+    """
+    if _processor is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    if parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+        attributes = {k: parent.attributes[k] for k in INHERITED_ATTRIBUTES if k in parent.attributes} | attributes
+    current = Span(name, trace_id or _random_id(16), span_id or _random_id(8), parent_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {str(e)[:200]}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        _processor.submit(current)
+
+
+@lru_cache(maxsize=1)
+def _transport_class():
+    # Built on first use so importing this module (every repository user does) skips httpx
+    import httpx
+
+    class TracingTransport(httpx.AsyncBaseTransport):
+        """Wraps an httpx transport with an ``http`` span per request.
+
+        The span ends when the response headers arrive; streamed bodies are read after it.
+        """
+
+        def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+            self._transport = transport
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            url = request.url
+            with span(f"http {request.method}", method=request.method, host=url.host, path=url.path) as current:
+                response = await self._transport.handle_async_request(request)
+                if current is not None:
+                    current.set(status=response.status_code)
+                return response
+
+        async def aclose(self) -> None:
+            await self._transport.aclose()
+
+    return TracingTransport
+
+
+def transport(**kwargs):
+    """An ``httpx.AsyncHTTPTransport(**kwargs)`` that records spans."""
+    import httpx
+
+    return _transport_class()(httpx.AsyncHTTPTransport(**kwargs))
+
+
+class FileExporter:
+    """Appends spans to a file as JSON lines."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: list[Span]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            for s in spans:
+                f.write(json.dumps(s.to_dict(), default=str) + "\n")
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpExporter:
+    """Posts spans to an OTLP/HTTP collector (``/v1/traces``) as OTLP JSON."""
+
+    def __init__(self, endpoint: str, service_name: str) -> None:
+        import httpx
+
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._client = httpx.Client(timeout=10.0)
+
+    def _span(self, s: Span) -> dict:
+        otlp = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items() if v is not None],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            otlp["parentSpanId"] = s.parent_id
+        return otlp
+
+    def export(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "acquire"}, "spans": [self._span(s) for s in spans]}],
+            }]
+        }
+        self._client.post(self.endpoint, json=payload).raise_for_status()
+
+
+class BatchProcessor:
+    """Queues finished spans and exports them in batches from a background thread.
+
+    Spans end on the event loop; file and network writes happen off it.
+    """
+
+    _STOP = object()
+
+    def __init__(self, exporter, batch_size: int = 256, flush_interval: float = 2.0, max_queue: int = 10000) -> None:
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="acquire-tracing", daemon=True)
+        self._thread.start()
+
+    def submit(self, s: Span) -> None:
+        try:
+            self._queue.put_nowait(s)
+        except queue.Full:
+            self.dropped += 1
+
+    def _export(self, batch: list[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            logger.warning("trace_export_failed", spans=len(batch), error=str(e)[:200])
+
+    def _run(self) -> None:
+        batch: list[Span] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is self._STOP:
+                break
+            if item is not None:
+                batch.append(item)
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._export(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+        if batch:
+            self._export(batch)
+
+    def shutdown(self) -> None:
+        """Export everything queued so far and stop the thread."""
+        self._queue.put(self._STOP)
+        self._thread.join(timeout=10)
+
+
+def tracing_config() -> dict:
+    return get_settings().load_yaml_config().get("tracing", {}) or {}
+
+
+def setup_tracing(config: dict | None = None) -> None:
+    """Start exporting spans if ``tracing.enabled``; a no-op when already set up."""
+    global _processor
+    config = tracing_config() if config is None else config
+    if _processor is not None or not config.get("enabled", False):
+        return
+
+    if config.get("exporter", "file") == "otlp":
+        exporter = OtlpExporter(
+            config.get("otlp_endpoint", "http://localhost:4318/v1/traces"),
+            config.get("service_name", "acquire"),
+        )
+    else:
+        exporter = FileExporter(config.get("file_path", "data/traces.jsonl"))
+    _processor = BatchProcessor(
+        exporter,
+        batch_size=config.get("batch_size", 256),
+        flush_interval=config.get("flush_interval_seconds", 2.0),
+    )
+    atexit.register(shutdown_tracing)
+    logger.info("tracing_enabled", exporter=type(exporter).__name__)
+
+
+def shutdown_tracing() -> None:
+    global _processor
+    if _processor is not None:
+        processor, _processor = _processor, None
+        processor.shutdown()
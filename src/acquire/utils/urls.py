@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that identify a campaign or visitor, never the page. Session-like
+# query names (``sid``) are kept: procurement sites use ``?sid=`` for solicitation ids.
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "_ga", "_gl",
+    "_hsenc", "_hsmi", "mkt_tok", "igshid", "yclid",
+})
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_")
+
+_SESSION_PATH_PARAM = re.compile(r";(jsessionid|phpsessid|sid)=[^/?#]*", re.IGNORECASE)
+_INDEX_PAGE = re.compile(r"/(index|default)\.(html?|php|aspx?)$", re.IGNORECASE)
+_PERCENT_ESCAPE = re.compile(r"%[0-9a-fA-F]{2}")
+
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalise a URL so trivially different spellings of a page compare equal.
+
+    Lowercases the scheme and host and drops ``www.``, default ports, fragments,
+    tracking parameters, session ids in the path, ``index.html``-style
+    filenames and trailing slashes. Percent-escapes are uppercased and the query
+    string is sorted. A malformed URL (an invalid IPv6 host or a port out of range)
+    is returned stripped but otherwise unchanged, so it only ever equals itself.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    netloc = host
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+
+    path = _SESSION_PATH_PARAM.sub("", parts.path)
+    path = _INDEX_PAGE.sub("/", path)
+    path = _PERCENT_ESCAPE.sub(lambda m: m.group(0).upper(), path).rstrip("/")
+    query = urlencode(
+        sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k))
+    )
+    return urlunsplit((scheme, netloc, path, query, ""))
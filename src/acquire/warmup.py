@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import AsyncExitStack
+
+import structlog
+from sqlalchemy import text
+
+from acquire.config import get_settings
+from acquire.storage.database import _is_memory_sqlite, get_engine
+
+logger = structlog.get_logger()
+
+
+def warm_up_config() -> dict:
+    return get_settings().load_yaml_config().get("startup", {}) or {}
+
+
+async def _open_db_connections(count: int) -> None:
+    # Held together so the pool keeps ``count`` distinct, initialised connections
+    async with AsyncExitStack() as stack:
+        connections = [await stack.enter_async_context(get_engine().connect()) for _ in range(count)]
+        for conn in connections:
+            await conn.execute(text("SELECT 1"))
+
+
+async def warm_up() -> None:
+    """Pay the first event's one-off costs at startup: imports, prompt templates, parsers, DB connections."""
+    start = time.perf_counter()
+
+    import acquire.pipeline.orchestrator  # noqa: F401  imports the whole pipeline
+    from acquire.llm.prompts import PROMPT_NAMES, get_template
+    from acquire.pipeline.extraction import html_to_text
+
+    for name in PROMPT_NAMES:
+        get_template(name)
+    html_to_text("<p>warm-up</p>")
+
+    settings = get_settings()
+    if not _is_memory_sqlite(settings.database_url):
+        await _open_db_connections(settings.db_pool_size)
+
+    logger.info("warm_up_complete", ms=round((time.perf_counter() - start) * 1000, 1))
+
+
+async def open_connections() -> None:
+    """Background task: connect to external APIs so the first event reuses the connection."""
+    from acquire.llm.client import open_connection
+
+    await asyncio.wait_for(open_connection(), timeout=warm_up_config().get("connect_timeout_seconds", 10))
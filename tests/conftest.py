@@ -4,8 +4,7 @@ import os
 import pytest
 from unittest.mock import patch
 
-from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from httpx import AsyncClient, ASGITransport
 
 # Override settings before importing app
@@ -17,15 +16,14 @@ os.environ["SLACK_WEBHOOK_URL"] = "https://hooks.slack.com/test"
 os.environ["WEBHOOK_SECRET"] = ""
 
 from acquire.main import app
-from acquire.storage.database import get_session
+from acquire.storage.database import build_engine, get_session, get_session_factory, init_schema
 from acquire.config import get_settings
 
 
 @pytest.fixture
 async def engine():
-    engine = create_async_engine("sqlite+aiosqlite://", echo=False)
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+    engine = build_engine("sqlite+aiosqlite://")
+    await init_schema(engine)
     yield engine
     await engine.dispose()
 
@@ -46,6 +44,7 @@ async def client(engine):
             yield session
 
     app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_session_factory] = lambda: factory
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from acquire.config import Settings
+from acquire.utils.profiling import get_profiler
+
+
+@pytest.fixture
+def admin_token():
+    with patch("acquire.api.admin.get_settings", return_value=Settings(admin_token="t0ken")):
+        yield {"x-admin-token": "t0ken"}
+    get_profiler().set_rates(pipeline=0.0, request=0.0)
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints_are_disabled_without_a_token(client):
+    with patch("acquire.api.admin.get_settings", return_value=Settings(admin_token="")):
+        resp = await client.get("/admin/profiling")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_profiling_rates_change_at_runtime(client, admin_token):
+    resp = await client.put("/admin/profiling", json={"pipeline_rate": 0.5}, headers={"x-admin-token": "wrong"})
+    assert resp.status_code == 401
+
+    resp = await client.put("/admin/profiling", json={"pipeline_rate": 0.5}, headers=admin_token)
+    assert resp.status_code == 200
+    assert resp.json()["pipeline_rate"] == 0.5
+    assert resp.json()["request_rate"] == 0.0
+    assert get_profiler().rates["pipeline"] == 0.5
+
+    resp = await client.put("/admin/profiling", json={"request_rate": 2}, headers=admin_token)
+    assert resp.status_code == 422
+
+    resp = await client.get("/admin/profiling", headers=admin_token)
+    assert set(resp.json()["loop_lag"]) == {"samples", "last_ms", "p99_ms", "max_ms"}
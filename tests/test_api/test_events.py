@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from acquire.config import Settings
+from acquire.models.db import ChangeEvent
+from acquire.storage import repository
+
+
+@pytest.fixture(autouse=True)
+def admin_token():
+    with patch("acquire.api.admin.get_settings", return_value=Settings(admin_token="t0ken")):
+        yield {"x-admin-token": "t0ken"}
+
+
+@pytest.fixture
+def client(client, admin_token):
+    client.headers.update(admin_token)
+    return client
+
+
+@pytest.fixture
+def anonymous(client):
+    client.headers.pop("x-admin-token")
+    return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/events", "/events/export", "/events/search?q=x", "/events/by-agency?agency=USDA", "/events/deadlines"])
+async def test_event_endpoints_require_the_admin_token(anonymous, path):
+    assert (await anonymous.get(path)).status_code == 401
+    assert (await anonymous.get(path, headers={"x-admin-token": "wrong"})).status_code == 401
+
+
+async def _add_event(session, diff: str | None = None, **fields) -> ChangeEvent:
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://www.usda.gov/reconnect",
+        diff_hash=await repository.put_content(session, diff),
+        **fields,
+    )
+    session.add(event)
+    await session.commit()
+    return event
+
+
+@pytest.mark.asyncio
+async def test_search_finds_diff_summary_and_reasoning(client, session):
+    from_diff = await _add_event(session, "+ ReConnect broadband loans now accepting applications")
+    from_summary = await _add_event(session, summary="USDA opens broadband grant round")
+    await _add_event(session, "+ Cookie banner updated", summary="Navigation change")
+
+    resp = await client.get("/events/search", params={"q": "broadband"})
+
+    assert resp.status_code == 200
+    hits = resp.json()
+    assert {h["event_id"] for h in hits} == {from_diff.id, from_summary.id}
+    # Summary matches are weighted above diff matches
+    assert hits[0]["event_id"] == from_summary.id
+    assert "<mark>broadband</mark>" in hits[0]["snippet"]
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_pipeline_updates(client, session):
+    event = await _add_event(session)
+    event.diff_hash = await repository.put_content(session, "+ New NOFO for rural health clinics")
+    event.classification_reasoning = "Funding opportunity with deadline"
+    await repository.update_event(session, event)
+
+    assert [h["event_id"] for h in (await client.get("/events/search", params={"q": "clinic*"})).json()] == [event.id]
+    assert [h["event_id"] for h in (await client.get("/events/search", params={"q": "deadline"})).json()] == [event.id]
+
+    # Archiving clears diff_hash, and the indexed diff text with it; summaries stay searchable
+    event.diff_hash = None
+    await repository.update_event(session, event)
+    assert (await client.get("/events/search", params={"q": "nofo"})).json() == []
+    assert [h["event_id"] for h in (await client.get("/events/search", params={"q": "deadline"})).json()] == [event.id]
+
+
+@pytest.mark.asyncio
+async def test_search_treats_query_syntax_as_text(client, session):
+    await _add_event(session, summary='Solicitation "AND" OR NEAR(x)')
+
+    resp = await client.get("/events/search", params={"q": 'NEAR( "AND'})
+
+    assert resp.status_code == 200
+    assert len(resp.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_indexes_bounded_prefix_of_large_diffs(session):
+    filler = "lorem " * 10000
+    await _add_event(session, f"+ {filler} needle")
+
+    assert await repository.search_events(session, "needle") == []
+    assert len(await repository.search_events(session, "lorem")) == 1
+
+
+async def _add_listed_events(session, count: int, **fields) -> list[ChangeEvent]:
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    events = [
+        ChangeEvent(
+            watch_uuid="test-uuid",
+            watch_url="https://www.usda.gov/reconnect",
+            # Pairs share a timestamp so the id tiebreak is exercised
+            received_at=start + timedelta(hours=i // 2),
+            **fields,
+        )
+        for i in range(count)
+    ]
+    session.add_all(events)
+    await session.commit()
+    return events
+
+
+@pytest.mark.asyncio
+async def test_list_events_pages_with_cursor(client, session):
+    events = await _add_listed_events(session, 7)
+    expected = [e.id for e in sorted(events, key=lambda e: (e.received_at, e.id), reverse=True)]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get("/events", params=params)).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+@pytest.mark.asyncio
+async def test_list_events_filters_and_projects(client, session):
+    await _add_listed_events(session, 3, pipeline_status="notified", classification="FUNDING_OPPORTUNITY")
+    await _add_listed_events(session, 2, pipeline_status="filtered_out")
+
+    resp = await client.get(
+        "/events",
+        params={
+            "status": "notified",
+            "since": "2026-03-01T00:00:00Z",
+            "until": "2026-03-01T01:00:00Z",
+            "fields": "classification",
+        },
+    )
+
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert len(items) == 2
+    assert set(items[0]) == {"id", "received_at", "classification"}
+    assert (await client.get("/events", params={"fields": "diff_hash"})).status_code == 400
+    assert (await client.get("/events", params={"cursor": "not-a-cursor"})).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_events_bounds_are_utc(client, session):
+    events = await _add_listed_events(session, 4)
+
+    first_pair = sorted(e.id for e in events[:2])
+
+    # 05:00+05:00 is 00:00 UTC: the first hour holds the first pair of events
+    resp = await client.get("/events", params={"since": "2026-03-01T05:00:00+05:00", "until": "2026-03-01T06:00:00+05:00"})
+    assert sorted(item["id"] for item in resp.json()["items"]) == first_pair
+
+    # Without an offset the bounds are UTC
+    resp = await client.get("/events", params={"since": "2026-03-01T00:00:00", "until": "2026-03-01T01:00:00"})
+    assert resp.status_code == 200
+    assert sorted(item["id"] for item in resp.json()["items"]) == first_pair
+
+
+@pytest.mark.asyncio
+async def test_export_streams_ndjson_in_batches(client, session, monkeypatch):
+    from acquire.api import events as events_api
+
+    monkeypatch.setattr(events_api, "EXPORT_BATCH_SIZE", 2)
+    events = await _add_listed_events(session, 5, urgency="HIGH")
+    await _add_listed_events(session, 1, urgency="LOW")
+
+    resp = await client.get("/events/export", params={"urgency": "HIGH"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert sorted(line["id"] for line in lines) == sorted(e.id for e in events)
+    assert all(line["urgency"] == "HIGH" for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_events_by_agency(client, session):
+    usda = await _add_event(session, relevant_agencies=["USDA", "Rural Utilities Service"])
+    await _add_event(session, relevant_agencies=["HHS"])
+
+    resp = await client.get("/events/by-agency", params={"agency": "usda"})
+
+    assert resp.status_code == 200
+    [item] = resp.json()
+    assert item["id"] == usda.id
+    assert item["relevant_agencies"] == ["USDA", "Rural Utilities Service"]
+
+
+@pytest.mark.asyncio
+async def test_upcoming_deadlines(client, session):
+    today = datetime.now(timezone.utc).date()
+    soon = f"{today + timedelta(days=3):%Y-%m-%d}: Application deadline"
+    later = f"{today + timedelta(days=30):%Y-%m-%d}: Award date"
+    event = await _add_event(session, key_dates=[later, soon], urgency="HIGH")
+
+    resp = await client.get("/events/deadlines", params={"days": 14})
+
+    assert resp.status_code == 200
+    assert resp.json() == [{
+        "event_id": event.id,
+        "key_date": soon,
+        "watch_url": event.watch_url,
+        "classification": None,
+        "urgency": "HIGH",
+        "summary": None,
+    }]
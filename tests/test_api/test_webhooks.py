@@ -10,7 +10,7 @@ from acquire.config import Settings
 
 @pytest.mark.asyncio
 async def test_webhook_creates_event(client):
-    with patch("acquire.api.webhooks.run_pipeline", new_callable=AsyncMock):
+    with patch("acquire.api.webhooks._run_pipeline", new_callable=AsyncMock):
         resp = await client.post("/webhooks/change", json={
             "watch_uuid": "abc-123",
             "watch_url": "https://example.gov/page",
@@ -34,6 +34,22 @@ async def test_webhook_rejects_bad_secret(client):
     assert resp.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_rejected_webhooks_are_not_profiled(client):
+    secret_settings = Settings(webhook_secret="real-secret")
+    with (
+        patch("acquire.api.webhooks.get_settings", return_value=secret_settings),
+        patch("acquire.api.webhooks.profiling.profile") as profile,
+    ):
+        resp = await client.post(
+            "/webhooks/change",
+            json={"watch_uuid": "abc-123", "watch_url": "https://example.gov"},
+            headers={"x-webhook-secret": "wrong-secret"},
+        )
+    assert resp.status_code == 401
+    profile.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_health_endpoint(client):
     resp = await client.get("/health")
@@ -41,3 +57,20 @@ async def test_health_endpoint(client):
     data = resp.json()
     assert data["status"] == "ok"
     assert "events_total" in data
+
+
+@pytest.mark.asyncio
+async def test_webhook_only_ingests_in_worker_mode(client):
+    worker_settings = Settings()
+    with (
+        patch.object(Settings, "load_yaml_config", return_value={"worker": {"enabled": True}}),
+        patch("acquire.api.webhooks.get_settings", return_value=worker_settings),
+        patch("acquire.api.webhooks._run_pipeline", new_callable=AsyncMock) as mock_pipeline,
+    ):
+        resp = await client.post("/webhooks/change", json={
+            "watch_uuid": "abc-123",
+            "watch_url": "https://example.gov/page",
+        })
+
+    assert resp.status_code == 200
+    mock_pipeline.assert_not_called()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+import yaml
+
+from acquire import config
+from acquire.config import Settings
+
+
+def test_yaml_config_is_parsed_once_per_file_version(tmp_path, monkeypatch):
+    path = tmp_path / "settings.yaml"
+    path.write_text("worker:\n  enabled: false\n")
+    monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+    settings = Settings()
+
+    with patch("acquire.config.yaml.safe_load", wraps=yaml.safe_load) as parse:
+        assert settings.load_yaml_config() == {"worker": {"enabled": False}}
+        assert settings.load_yaml_config() == {"worker": {"enabled": False}}
+        assert parse.call_count == 1
+
+        path.write_text("worker:\n  enabled: true\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert settings.load_yaml_config() == {"worker": {"enabled": True}}
+        assert parse.call_count == 2
+
+
+def test_missing_yaml_config_is_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+    assert Settings().load_yaml_config() == {}
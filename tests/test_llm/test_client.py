@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import asyncio
+
+from acquire.llm import client
+
+
+def test_llm_client_is_pooled_per_event_loop():
+    async def use_client():
+        first, second = client.get_client(), client.get_client()
+        assert first is second
+        await client.close_client()
+        assert first.is_closed
+        return first
+
+    assert asyncio.run(use_client()) is not asyncio.run(use_client())
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from acquire import warmup
+from acquire.llm import prompts
+
+# Loaded on first use (or by the warm-up), never by importing the app
+DEFERRED_MODULES = (
+    "jinja2",
+    "httpx",
+    "selectolax",
+    "tiktoken",
+    "acquire.pipeline.orchestrator",
+    "acquire.pipeline.crawler",
+    "acquire.llm.client",
+)
+
+# Import time of acquire's own modules, over the framework imports they need anyway
+IMPORT_BUDGET_SECONDS = 0.5
+
+_PROBE = """
+import json, sys, time
+import fastapi, pydantic_settings, sqlalchemy.ext.asyncio, sqlmodel, structlog, yaml
+start = time.perf_counter()
+import acquire.main
+print(json.dumps({"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}))
+"""
+
+
+def _import_app() -> dict:
+    env = os.environ | {"PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_importing_the_app_defers_heavy_modules():
+    probe = _import_app()
+    loaded = set(probe["modules"])
+    assert [name for name in DEFERRED_MODULES if name in loaded] == []
+    assert probe["seconds"] < IMPORT_BUDGET_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_the_pipeline_and_compiles_prompts():
+    prompts._compile.cache_clear()
+    await warmup.warm_up()
+
+    assert "acquire.pipeline.orchestrator" in sys.modules
+    assert prompts._compile.cache_info().currsize == len(prompts.PROMPT_NAMES)
+
+
+@pytest.mark.asyncio
+async def test_open_connections_connects_to_openrouter():
+    with patch("acquire.llm.client.open_connection", new_callable=AsyncMock) as open_connection:
+        await warmup.open_connections()
+    open_connection.assert_awaited_once()
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from acquire.pipeline import notifier
+
+# SLACK_WEBHOOK_URL as set by tests/conftest.py
+SLACK_URL = "https://hooks.slack.com/test"
+
+
+@pytest.fixture
+def no_rate_limit(monkeypatch):
+    monkeypatch.setattr(notifier, "_get_limiter", lambda destination="slack": notifier.RateLimiter(0))
+
+
+@pytest.fixture
+def factory(engine):
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
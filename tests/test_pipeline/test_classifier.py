@@ -7,6 +7,7 @@ import pytest
 
 from acquire.models.db import ChangeEvent, PipelineStatus
 from acquire.pipeline.classifier import classify
+from acquire.storage import repository
 
 
 @pytest.mark.asyncio
@@ -14,7 +15,7 @@ async def test_classify_rfp(session):
     event = ChangeEvent(
         watch_uuid="test-uuid",
         watch_url="https://www.usda.gov/reconnect",
-        diff_text="NOTICE OF FUNDING OPPORTUNITY - ReConnect Program Round 5 - Application Deadline March 15, 2026",
+        diff_hash=await repository.put_content(session, "NOTICE OF FUNDING OPPORTUNITY - ReConnect Program Round 5 - Application Deadline March 15, 2026"),
         pipeline_status=PipelineStatus.FETCHED.value,
     )
     session.add(event)
@@ -48,7 +49,7 @@ async def test_classify_skips_on_budget_exceeded(session):
     event = ChangeEvent(
         watch_uuid="test-uuid",
         watch_url="https://example.gov",
-        diff_text="Some diff content that is long enough to process",
+        diff_hash=await repository.put_content(session, "Some diff content that is long enough to process"),
         pipeline_status=PipelineStatus.FETCHED.value,
     )
     session.add(event)
@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
 import pytest
 import respx
 import httpx
 
-from acquire.pipeline.crawler import html_to_text, fetch_page_text
+from acquire.pipeline import crawler
+from acquire.pipeline.crawler import CrawlScheduler, html_to_text, fetch_page_text
+from acquire.storage import repository
+from acquire.utils.urls import canonicalize_url
+
+
+@pytest.fixture(autouse=True)
+def scheduler(monkeypatch):
+    """No delays or robots.txt lookups unless a test asks for them."""
+    instance = CrawlScheduler(min_delay=0, respect_robots=False)
+    monkeypatch.setattr(crawler, "get_scheduler", lambda: instance)
+    return instance
 
 
 class TestHtmlToText:
@@ -112,3 +127,186 @@ class TestFetchPageText:
 
         result = await fetch_page_text("https://example.gov/slow")
         assert result is None
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_rejects_disallowed_content_type(self):
+        respx.get("https://example.gov/nofo.pdf").mock(
+            return_value=httpx.Response(200, content=b"%PDF-1.7 ...", headers={"content-type": "application/pdf"})
+        )
+
+        assert await fetch_page_text("https://example.gov/nofo.pdf") is None
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_rejects_oversized_content_length(self):
+        respx.get("https://example.gov/huge").mock(
+            return_value=httpx.Response(200, text="<p>small</p>", headers={"content-type": "text/html", "content-length": "50000000"})
+        )
+
+        assert await fetch_page_text("https://example.gov/huge", max_bytes=1024) is None
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_stops_streaming_once_enough_text(self):
+        sent = []
+
+        async def body():
+            for i in range(1000):
+                sent.append(i)
+                yield f"<p>Paragraph {i} of a very long agency page</p>".encode() * 50
+
+        respx.get("https://example.gov/long-page").mock(
+            return_value=httpx.Response(200, content=body(), headers={"content-type": "text/html"})
+        )
+
+        result = await fetch_page_text("https://example.gov/long-page", max_chars=500)
+
+        assert result is not None
+        assert len(result) == 500
+        assert len(sent) < 10
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_stops_at_byte_budget(self):
+        sent = []
+
+        async def body():
+            for i in range(1000):
+                sent.append(i)
+                yield b"<script>" + b"x" * 4096 + b"</script>"
+
+        respx.get("https://example.gov/scripts").mock(
+            return_value=httpx.Response(200, content=body(), headers={"content-type": "text/html"})
+        )
+
+        # No visible text within the byte budget
+        assert await fetch_page_text("https://example.gov/scripts", max_bytes=64 * 1024) is None
+        assert len(sent) < 20
+
+
+class TestCrawlCache:
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_fresh_entry_skips_request(self, session):
+        route = respx.get("https://www.grants.gov/opp?id=1").mock(
+            return_value=httpx.Response(200, text="<p>Opportunity</p>", headers={"content-type": "text/html"})
+        )
+
+        first = await fetch_page_text("https://www.grants.gov/opp?id=1", session=session)
+        # Different spelling of the same canonical URL
+        second = await fetch_page_text("https://grants.gov/opp?id=1#top", session=session)
+
+        assert first == second == "Opportunity"
+        assert route.call_count == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_stale_entry_is_revalidated(self, session):
+        await repository.save_crawl_cache(
+            session,
+            canonicalize_url("https://sam.gov/opp/1"),
+            "Cached notice text",
+            max_chars=8000,
+            etag='"v1"',
+            last_modified="Mon, 02 Mar 2026 10:00:00 GMT",
+            validated_at=datetime.now(timezone.utc) - timedelta(days=2),
+        )
+        route = respx.get("https://sam.gov/opp/1").mock(return_value=httpx.Response(304))
+
+        assert await fetch_page_text("https://sam.gov/opp/1", session=session) == "Cached notice text"
+
+        request = route.calls[0].request
+        assert request.headers["If-None-Match"] == '"v1"'
+        assert request.headers["If-Modified-Since"] == "Mon, 02 Mar 2026 10:00:00 GMT"
+        entry = await repository.get_crawl_cache(session, canonicalize_url("https://sam.gov/opp/1"))
+        assert entry.validated_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) - timedelta(minutes=1)
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_revalidated_entry_respects_callers_limit(self, session):
+        key = canonicalize_url("https://sam.gov/opp/3")
+        await repository.save_crawl_cache(
+            session, key, "x" * 8000, max_chars=8000, etag='"v1"', validated_at=datetime.now(timezone.utc) - timedelta(days=2)
+        )
+        respx.get("https://sam.gov/opp/3").mock(return_value=httpx.Response(304))
+
+        assert await fetch_page_text("https://sam.gov/opp/3", max_chars=100, session=session) == "x" * 100
+        # The entry keeps its longer text for callers that want more
+        assert (await repository.get_crawl_cache(session, key)).max_chars == 8000
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_changed_page_replaces_entry(self, session):
+        await repository.save_crawl_cache(
+            session,
+            canonicalize_url("https://sam.gov/opp/2"),
+            "Old text",
+            max_chars=8000,
+            etag='"v1"',
+            validated_at=datetime.now(timezone.utc) - timedelta(days=2),
+        )
+        respx.get("https://sam.gov/opp/2").mock(
+            return_value=httpx.Response(200, text="New text", headers={"content-type": "text/plain", "etag": '"v2"'})
+        )
+
+        assert await fetch_page_text("https://sam.gov/opp/2", session=session) == "New text"
+        entry = await repository.get_crawl_cache(session, canonicalize_url("https://sam.gov/opp/2"))
+        assert (entry.text, entry.etag) == ("New text", '"v2"')
+
+
+class TestCrawlScheduler:
+    @pytest.mark.asyncio
+    async def test_caps_concurrency_and_spaces_requests_per_host(self):
+        scheduler = CrawlScheduler(max_per_host=1, min_delay=0.05, respect_robots=False)
+        in_flight, peak = 0, 0
+        starts: dict[str, list[float]] = {"sam.gov": [], "grants.gov": []}
+
+        async def request(host, path):
+            nonlocal in_flight, peak
+            async with scheduler.slot(f"https://{host}/{path}"):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                starts[host].append(time.monotonic())
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(request("sam.gov", f"opp/{i}") for i in range(3)), request("grants.gov", "a"))
+
+        # One sam.gov request at a time, running alongside grants.gov
+        assert peak == 2
+        sam = starts["sam.gov"]
+        assert all(later - earlier >= 0.045 for earlier, later in zip(sam, sam[1:]))
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_robots_txt_is_honoured_and_cached(self, monkeypatch):
+        instance = CrawlScheduler(min_delay=0)
+        monkeypatch.setattr(crawler, "get_scheduler", lambda: instance)
+        robots = respx.get("https://example.gov/robots.txt").mock(
+            return_value=httpx.Response(200, text="User-agent: *\nDisallow: /private/\n")
+        )
+        respx.get("https://example.gov/public").mock(
+            return_value=httpx.Response(200, text="Public page", headers={"content-type": "text/plain"})
+        )
+        private = respx.get("https://example.gov/private/doc")
+
+        assert await fetch_page_text("https://example.gov/public") == "Public page"
+        assert await fetch_page_text("https://example.gov/private/doc") is None
+        assert robots.call_count == 1
+        assert private.call_count == 0
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_throttled_request_waits_and_retries(self, scheduler):
+        route = respx.get("https://sam.gov/busy").mock(
+            side_effect=[
+                httpx.Response(429, headers={"Retry-After": "0.05"}),
+                httpx.Response(200, text="Finally", headers={"content-type": "text/plain"}),
+            ]
+        )
+
+        start = time.monotonic()
+        assert await fetch_page_text("https://sam.gov/busy") == "Finally"
+        assert route.call_count == 2
+        assert time.monotonic() - start >= 0.05
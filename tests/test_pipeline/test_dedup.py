@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from acquire.config import get_settings
+from acquire.models.db import ChangeEvent, NotificationKind, OutboxStatus, PipelineStatus
+from acquire.pipeline import dedup
+from acquire.pipeline.dedup import event_fingerprints
+from acquire.pipeline.delivery import deliver_pending
+from acquire.storage import repository
+from acquire.storage.database import build_engine, init_schema
+from tests.test_pipeline.conftest import SLACK_URL
+
+SUMMARY = "USDA opens ReConnect Round 5 — $1.1B in loans and grants."
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+def _event(url: str, summary: str = SUMMARY, dates=("2026-03-15: Applications due",)) -> ChangeEvent:
+    return ChangeEvent(
+        watch_uuid="test",
+        watch_url=url,
+        classification="RFP",
+        urgency="HIGH",
+        summary=summary,
+        key_dates=list(dates),
+        pipeline_status=PipelineStatus.ENRICHED.value,
+    )
+
+
+def test_fingerprints_ignore_formatting_but_not_dates():
+    original = event_fingerprints(_event("https://www.usda.gov/reconnect/"))
+    reworded = event_fingerprints(_event("https://usda.gov/reconnect", summary="usda opens reconnect round 5  $1.1b in loans and grants"))
+    mirror = event_fingerprints(_event("https://mirror.example.org/reconnect"))
+    new_deadline = event_fingerprints(_event("https://usda.gov/reconnect", dates=["Deadline 2026-04-01"]))
+
+    assert original == reworded
+    assert original[1] == mirror[1]
+    assert not set(original) & set(new_deadline)
+
+
+async def _queue(session, event: ChangeEvent) -> int:
+    session.add(event)
+    await session.commit()
+    await repository.enqueue_notification(session, event.id, NotificationKind.IMMEDIATE.value)
+    await session.commit()
+    return event.id
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_duplicate_is_suppressed(session, factory):
+    route = respx.post(SLACK_URL).mock(return_value=httpx.Response(200, text="ok"))
+    parent_id = await _queue(session, _event("https://www.usda.gov/reconnect"))
+    assert await deliver_pending(factory) == 1
+
+    child_id = await _queue(session, _event("https://grants.gov/reconnect-round5"))
+    assert await deliver_pending(factory) == 0
+
+    assert route.call_count == 1
+    session.expire_all()
+    child = await repository.get_event(session, child_id)
+    assert child.duplicate_of_event_id == parent_id
+    [row] = await repository.get_notifications(session, child_id)
+    assert row.status == OutboxStatus.SUPPRESSED.value
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_duplicate_is_threaded(session, factory, monkeypatch):
+    monkeypatch.setattr(dedup, "dedup_config", lambda: {"enabled": True, "mode": "thread", "ttl_days": 14})
+    route = respx.post(SLACK_URL).mock(return_value=httpx.Response(200, text="ok"))
+    # Queued together: the second is matched against the first within the batch
+    parent_id = await _queue(session, _event("https://www.usda.gov/reconnect"))
+    child_id = await _queue(session, _event("https://grants.gov/reconnect-round5"))
+
+    assert await deliver_pending(factory) == 2
+
+    pointer = route.calls[-1].request.content.decode()
+    assert f"same as Event #{parent_id}" in pointer
+    session.expire_all()
+    assert (await repository.get_event(session, child_id)).duplicate_of_event_id == parent_id
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_failed_delivery_does_not_block_later_duplicate(session, factory):
+    respx.post(SLACK_URL).mock(side_effect=[httpx.Response(500), httpx.Response(200, text="ok")])
+    await _queue(session, _event("https://www.usda.gov/reconnect"))
+    assert await deliver_pending(factory) == 0
+
+    other_id = await _queue(session, _event("https://grants.gov/reconnect-round5"))
+    assert await deliver_pending(factory) == 1
+    session.expire_all()
+    assert (await repository.get_event(session, other_id)).duplicate_of_event_id is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_sends_do_not_hold_the_write_lock(tmp_path):
+    # A file database with no busy timeout: a write during the send fails if
+    # delivery still holds the fingerprint claims' transaction open
+    settings = get_settings().model_copy(update={"db_busy_timeout_ms": 0})
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'dedup.db'}", settings)
+    await init_schema(engine)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        await _queue(session, _event("https://www.usda.gov/reconnect"))
+
+    async def write_during_send(request):
+        async with factory() as other:
+            other.add(ChangeEvent(watch_uuid="webhook", watch_url="https://example.gov"))
+            await other.commit()
+        return httpx.Response(200, text="ok")
+
+    respx.post(SLACK_URL).mock(side_effect=write_during_send)
+    assert await deliver_pending(factory) == 1
+    await engine.dispose()
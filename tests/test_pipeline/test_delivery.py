@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+import respx
+
+from acquire.models.db import ChangeEvent, NotificationKind, OutboxStatus, PipelineStatus
+from acquire.pipeline.delivery import backoff_delay, deliver_pending
+from acquire.storage import repository
+from tests.test_pipeline.conftest import SLACK_URL
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+async def _enriched_event(session) -> int:
+    event = ChangeEvent(
+        watch_uuid="test",
+        watch_url="https://www.usda.gov/reconnect",
+        classification="RFP",
+        urgency="HIGH",
+        pipeline_status=PipelineStatus.ENRICHED.value,
+    )
+    session.add(event)
+    await session.commit()
+    await repository.enqueue_notification(session, event.id, NotificationKind.IMMEDIATE.value)
+    await session.commit()
+    return event.id
+
+
+@pytest.mark.asyncio
+async def test_enqueue_is_idempotent_per_destination(session):
+    event_id = await _enriched_event(session)
+
+    await repository.enqueue_notification(session, event_id, NotificationKind.IMMEDIATE.value)
+    await repository.enqueue_notification(session, event_id, NotificationKind.IMMEDIATE.value, destination="oncall")
+    await session.commit()
+
+    rows = await repository.get_notifications(session, event_id)
+    assert [row.idempotency_key for row in rows] == [f"{event_id}:slack", f"{event_id}:oncall"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_delivery_marks_event_notified(session, factory):
+    event_id = await _enriched_event(session)
+    respx.post(SLACK_URL).mock(return_value=httpx.Response(200, text="ok"))
+
+    assert await deliver_pending(factory) == 1
+    # Nothing left to send
+    assert await deliver_pending(factory) == 0
+
+    session.expire_all()
+    event = await repository.get_event(session, event_id)
+    assert event.pipeline_status == PipelineStatus.NOTIFIED.value
+    assert event.slack_message_ts == "ok"
+    [row] = await repository.get_notifications(session, event_id)
+    assert row.status == OutboxStatus.SENT.value
+    assert row.attempts == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_failed_delivery_backs_off_without_erroring_event(session, factory):
+    event_id = await _enriched_event(session)
+    respx.post(SLACK_URL).mock(return_value=httpx.Response(500, text="error"))
+
+    before = datetime.now(timezone.utc)
+    assert await deliver_pending(factory) == 0
+
+    session.expire_all()
+    [row] = await repository.get_notifications(session, event_id)
+    assert row.status == OutboxStatus.PENDING.value
+    assert row.attempts == 1
+    assert row.next_attempt_at.replace(tzinfo=timezone.utc) >= before + timedelta(seconds=29)
+    assert (await repository.get_event(session, event_id)).pipeline_status == PipelineStatus.ENRICHED.value
+    # Not due yet
+    assert await deliver_pending(factory) == 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_delivery_gives_up_after_max_attempts(session, factory, monkeypatch):
+    from acquire.pipeline import delivery
+
+    monkeypatch.setattr(delivery, "notification_config", lambda: {"max_attempts": 2, "backoff_base_seconds": 0})
+    event_id = await _enriched_event(session)
+    respx.post(SLACK_URL).mock(return_value=httpx.Response(500, text="error"))
+
+    await deliver_pending(factory)
+    await deliver_pending(factory)
+
+    session.expire_all()
+    [row] = await repository.get_notifications(session, event_id)
+    assert row.status == OutboxStatus.FAILED.value
+    assert row.attempts == 2
+
+
+def test_backoff_doubles_and_caps():
+    config = {"backoff_base_seconds": 30, "backoff_max_seconds": 100}
+    assert [backoff_delay(n, config) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_destinations_are_delivered_concurrently(session, factory, monkeypatch):
+    from acquire.pipeline import routing
+
+    monkeypatch.setattr(
+        routing,
+        "routing_config",
+        lambda: {"destinations": {"rfp": {"url": "https://hooks.test/rfp"}, "oncall": {"url": "https://hooks.test/oncall"}}},
+    )
+    event_id = await _enriched_event(session)
+    for destination in ("rfp", "oncall"):
+        await repository.enqueue_notification(session, event_id, NotificationKind.IMMEDIATE.value, destination)
+    await session.commit()
+
+    # Counting overlapping sends rather than timing the run keeps this stable on a loaded machine
+    in_flight, peak = 0, 0
+
+    async def slow_ok(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(200, text="ok")
+
+    respx.post(SLACK_URL).mock(side_effect=slow_ok)
+    respx.post("https://hooks.test/rfp").mock(side_effect=slow_ok)
+    respx.post("https://hooks.test/oncall").mock(return_value=httpx.Response(500, text="error"))
+
+    assert await deliver_pending(factory) == 2
+    assert peak == 2
+
+    session.expire_all()
+    rows = {row.destination: row for row in await repository.get_notifications(session, event_id)}
+    assert rows["slack"].status == OutboxStatus.SENT.value
+    assert rows["rfp"].status == OutboxStatus.SENT.value
+    assert rows["oncall"].status == OutboxStatus.PENDING.value
+    assert rows["oncall"].last_error == "Slack notification failed"
+    assert (await repository.get_event(session, event_id)).pipeline_status == PipelineStatus.NOTIFIED.value
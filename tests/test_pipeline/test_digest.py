@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+
+from acquire.models.db import ChangeEvent, NotificationKind, OutboxStatus, PipelineStatus
+from acquire.pipeline.digest import MAX_BLOCKS_PER_MESSAGE, build_digest_messages, send_digest, should_digest
+from acquire.storage import repository
+from tests.test_pipeline.conftest import SLACK_URL
+
+pytestmark = pytest.mark.usefixtures("no_rate_limit")
+
+
+def _event(i: int, **fields) -> ChangeEvent:
+    return ChangeEvent(
+        id=i,
+        watch_uuid="test",
+        watch_url=f"https://www.usda.gov/page-{i}",
+        classification="RFI",
+        urgency="MEDIUM",
+        summary="x" * 5000,
+        **fields,
+    )
+
+
+def test_should_digest_only_lower_urgencies():
+    assert should_digest(_event(1))
+    assert should_digest(_event(2).model_copy(update={"urgency": "LOW"}))
+    assert not should_digest(_event(3).model_copy(update={"urgency": "HIGH"}))
+    assert not should_digest(_event(4).model_copy(update={"urgency": "CRITICAL"}))
+
+
+def test_digest_messages_respect_block_limits():
+    events = [_event(i) for i in range(1, 121)]
+
+    messages = build_digest_messages(events)
+
+    assert len(messages) == 3
+    assert sum(len(chunk) for chunk, _ in messages) == 120
+    for _, payload in messages:
+        assert len(payload["blocks"]) <= MAX_BLOCKS_PER_MESSAGE
+        assert all(len(b["text"]["text"]) <= 3000 for b in payload["blocks"])
+    assert messages[0][1]["blocks"][0]["text"]["text"].endswith("(1/3)")
+
+
+async def _queue_digest_events(session, count: int) -> list[int]:
+    ids = []
+    for i in range(count):
+        event = ChangeEvent(watch_uuid="test", watch_url=f"https://www.usda.gov/page-{i}", urgency="LOW")
+        session.add(event)
+        await session.commit()
+        await repository.enqueue_notification(session, event.id, NotificationKind.DIGEST.value)
+        ids.append(event.id)
+    await session.commit()
+    return ids
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_send_digest_delivers_outbox_rows(session, factory):
+    ids = await _queue_digest_events(session, 3)
+    route = respx.post(SLACK_URL).mock(return_value=httpx.Response(200, text="ok"))
+
+    assert await send_digest(factory) == 3
+
+    assert route.call_count == 1
+    session.expire_all()
+    for event_id in ids:
+        assert (await repository.get_event(session, event_id)).pipeline_status == PipelineStatus.NOTIFIED.value
+        [row] = await repository.get_notifications(session, event_id)
+        assert row.status == OutboxStatus.SENT.value
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_failed_digest_is_retried_next_run(session, factory):
+    [event_id] = await _queue_digest_events(session, 1)
+    respx.post(SLACK_URL).mock(side_effect=[httpx.Response(500, text="error"), httpx.Response(200, text="ok")])
+
+    assert await send_digest(factory) == 0
+    session.expire_all()
+    [row] = await repository.get_notifications(session, event_id)
+    assert row.status == OutboxStatus.PENDING.value
+    assert row.attempts == 1
+
+    assert await send_digest(factory) == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_network_error_on_one_destination_does_not_abort_digest(session, factory, monkeypatch):
+    from acquire.pipeline import routing
+
+    monkeypatch.setattr(routing, "routing_config", lambda: {"destinations": {"oncall": {"url": "https://hooks.test/oncall"}}})
+    [event_id] = await _queue_digest_events(session, 1)
+    await repository.enqueue_notification(session, event_id, NotificationKind.DIGEST.value, destination="oncall")
+    await session.commit()
+    respx.post(SLACK_URL).mock(return_value=httpx.Response(200, text="ok"))
+    respx.post("https://hooks.test/oncall").mock(side_effect=httpx.ConnectTimeout("timed out"))
+
+    assert await send_digest(factory) == 1
+
+    session.expire_all()
+    rows = {row.destination: row for row in await repository.get_notifications(session, event_id)}
+    assert rows["slack"].status == OutboxStatus.SENT.value
+    assert rows["oncall"].status == OutboxStatus.PENDING.value
+    assert rows["oncall"].last_error == "timed out"
+
+
+@pytest.mark.asyncio
+async def test_row_for_deleted_event_is_marked_failed(session, factory):
+    await repository.enqueue_notification(session, 999, NotificationKind.DIGEST.value)
+    await session.commit()
+
+    assert await send_digest(factory) == 0
+
+    session.expire_all()
+    [row] = await repository.get_notifications(session, 999)
+    assert row.status == OutboxStatus.FAILED.value
+    assert row.last_error == "Event no longer exists"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_disabled_digest_hands_queued_rows_to_immediate_delivery(session, factory, monkeypatch):
+    from acquire.pipeline import digest
+    from acquire.pipeline.delivery import deliver_pending
+
+    [event_id] = await _queue_digest_events(session, 1)
+    respx.post(SLACK_URL).mock(return_value=httpx.Response(200, text="ok"))
+    monkeypatch.setattr(digest, "digest_config", lambda: {"enabled": False})
+    monkeypatch.setattr(digest, "get_session_factory", lambda: factory)
+
+    await digest.digest_loop()
+    assert await deliver_pending(factory) == 1
+
+    session.expire_all()
+    [row] = await repository.get_notifications(session, event_id)
+    assert (row.kind, row.status) == (NotificationKind.IMMEDIATE.value, OutboxStatus.SENT.value)
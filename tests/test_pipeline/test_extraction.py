@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from acquire.pipeline.extraction import BACKENDS, get_extractor, html_to_text
+
+PAGE = """
+<html><head><title>Ignored</title><style>p { color: red; }</style></head>
+<body>
+  <nav><ul><li><a href="/">Home</a></li><li><a href="/grants">Grants</a></li></ul></nav>
+  <h1>ReConnect   Program</h1>
+  <p>The USDA is accepting <b>applications</b> for
+     Round&nbsp;5.</p>
+  <script>trackPageView();</script>
+  <table>
+    <tr><th>Milestone</th><th>Date</th></tr>
+    <tr><td>Applications due</td><td>2026-03-15</td></tr>
+  </table>
+  Eligible&nbsp;areas<br>Rural communities
+</body></html>
+"""
+
+EXPECTED = "\n".join([
+    "- Home",
+    "- Grants",
+    "ReConnect Program",
+    "The USDA is accepting applications for Round 5.",
+    "Milestone | Date",
+    "Applications due | 2026-03-15",
+    "Eligible areas",
+    "Rural communities",
+])
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_preserves_block_structure(backend):
+    assert html_to_text(PAGE, backend=backend) == EXPECTED
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_incremental_feed_matches_one_shot(backend):
+    extractor = get_extractor(backend)
+    for i in range(0, len(PAGE), 7):
+        extractor.feed(PAGE[i : i + 7])
+    extractor.close()
+    assert extractor.get_text() == EXPECTED
+    assert extractor.text_length > 0
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_empty_and_plain_text(backend):
+    assert html_to_text("", backend=backend) == ""
+    assert html_to_text("Just plain text", backend=backend) == "Just plain text"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="not available"):
+        get_extractor("beautifulsoup")
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from acquire.pipeline.links import extract_link_candidates
+
+CONFIG = {
+    "domains": {"grants.gov": 5, "sam.gov": 5},
+    "keywords": {"nofo": 4, "solicitation": 4, "grant": 1},
+    "min_score": 1,
+    "max_candidates": 10,
+}
+
+
+def test_extracts_links_from_added_lines_only():
+    diff = "\n".join([
+        "- Removed: https://grants.gov/old-nofo",
+        '+ <a href="/programs/nofo-2026.html">FY26 NOFO &amp; guidance</a>',
+        "+ Solicitation posted at https://sam.gov/opp/123/view.",
+        "+ [Newsletter](https://example.gov/news)",
+        "+ ![logo](https://grants.gov/logo.png)",
+    ])
+    candidates = extract_link_candidates(diff, "https://www.example.gov/page", CONFIG)
+
+    assert [(c.url, c.text) for c in candidates] == [
+        ("https://sam.gov/opp/123/view", "Solicitation posted at"),
+        ("https://www.example.gov/programs/nofo-2026.html", "FY26 NOFO & guidance"),
+    ]
+    assert candidates[0].score == 9
+
+
+def test_snapshot_is_all_new():
+    snapshot = "Funding\n- Posted March 2025\nNew NOFO: https://grants.gov/search/opp/123"
+    candidates = extract_link_candidates(snapshot, "https://example.gov", CONFIG, is_diff=False)
+    assert [c.url for c in candidates] == ["https://grants.gov/search/opp/123"]
+
+
+def test_candidates_are_deduplicated_by_canonical_url_and_capped():
+    diff = "\n".join(
+        ["+ https://grants.gov/g/1?utm_source=a", "+ NOFO: https://www.grants.gov/g/1/", "+ https://example.gov"]
+        + [f"+ https://grants.gov/g/{i}" for i in range(2, 20)]
+    )
+    candidates = extract_link_candidates(diff, "https://example.gov", {**CONFIG, "max_candidates": 5})
+
+    assert len(candidates) == 5
+    assert candidates[0].url == "https://www.grants.gov/g/1/"
+    assert candidates[0].score == 9
+
+
+def test_malformed_urls_are_skipped():
+    diff = "\n".join([
+        "+ NOFO: https://grants.gov:99999/nofo",
+        '+ <a href="http://[broken/nofo">NOFO</a>',
+        "+ Solicitation: https://sam.gov/opp/123/view",
+    ])
+    candidates = extract_link_candidates(diff, "https://example.gov", CONFIG)
+    assert [c.url for c in candidates] == ["https://sam.gov/opp/123/view"]
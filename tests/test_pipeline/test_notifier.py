@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-import json
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+import respx
 
 from acquire.models.db import ChangeEvent
+from acquire.pipeline import notifier
 from acquire.pipeline.notifier import _build_slack_blocks
 
 
@@ -15,10 +21,10 @@ def test_build_slack_blocks():
         classification_confidence=0.95,
         classification_model="anthropic/claude-sonnet-4",
         summary="USDA announces $1.1B ReConnect Round 5 NOFO",
-        recommended_actions='["Register for industry day", "Prepare application"]',
+        recommended_actions=["Register for industry day", "Prepare application"],
         urgency="HIGH",
-        key_dates='["2026-03-15: Application deadline", "2026-02-20: Industry day"]',
-        relevant_agencies='["USDA", "Rural Utilities Service"]',
+        key_dates=["2026-03-15: Application deadline", "2026-02-20: Industry day"],
+        relevant_agencies=["USDA", "Rural Utilities Service"],
         enrichment_model="deepseek/deepseek-v3.2",
     )
 
@@ -73,7 +79,7 @@ def test_build_slack_blocks_child_event():
         classification_confidence=0.97,
         classification_model="deepseek/deepseek-v3.2",
         summary="Official NOFO for ReConnect Round 5",
-        recommended_actions='["Download full NOFO", "Identify eligible areas"]',
+        recommended_actions=["Download full NOFO", "Identify eligible areas"],
         urgency="CRITICAL",
         parent_event_id=42,
         enrichment_model="deepseek/deepseek-v3.2",
@@ -106,3 +112,47 @@ def test_build_slack_blocks_minimal():
     # Should not crash, and should have context at the end
     context_block = next(b for b in blocks if b["type"] == "context")
     assert "Event #1" in context_block["elements"][0]["text"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_notify_slack_retries_after_rate_limit(monkeypatch):
+    monkeypatch.setattr(notifier, "_get_limiter", lambda destination="slack": notifier.RateLimiter(0))
+    monkeypatch.setattr(notifier.asyncio, "sleep", AsyncMock())
+    route = respx.post("https://hooks.slack.com/test").mock(
+        side_effect=[httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200, text="ok")]
+    )
+
+    event = ChangeEvent(id=7, watch_uuid="test", watch_url="https://www.usda.gov", urgency="HIGH")
+
+    assert await notifier.notify_slack(event) == "ok"
+    assert route.call_count == 2
+    notifier.asyncio.sleep.assert_awaited_with(2.0)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_notify_slack_accepts_http_date_retry_after(monkeypatch):
+    monkeypatch.setattr(notifier, "_get_limiter", lambda destination="slack": notifier.RateLimiter(0))
+    monkeypatch.setattr(notifier.asyncio, "sleep", AsyncMock())
+    respx.post("https://hooks.slack.com/test").mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+            httpx.Response(200, text="ok"),
+        ]
+    )
+
+    event = ChangeEvent(id=7, watch_uuid="test", watch_url="https://www.usda.gov", urgency="HIGH")
+
+    assert await notifier.notify_slack(event) == "ok"
+    # A date in the past means retry now
+    notifier.asyncio.sleep.assert_awaited_with(0.0)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_calls():
+    limiter = notifier.RateLimiter(0.05)
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.wait()
+    assert time.monotonic() - start >= 0.1
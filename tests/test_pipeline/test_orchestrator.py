@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, AsyncMock, MagicMock
 
 import pytest
 
-from acquire.models.db import ChangeEvent, PipelineStatus
+from acquire.models.db import ChangeEvent, NotificationKind, OutboxStatus, PipelineStatus
 from acquire.pipeline.orchestrator import run_pipeline
 from acquire.storage import repository
 
@@ -54,12 +56,12 @@ def _classify_response(classification="RFP", confidence=0.95):
     }
 
 
-def _enrich_response():
+def _enrich_response(urgency="HIGH"):
     return {
         "content": {
             "summary": "Test summary of procurement opportunity",
             "recommended_actions": ["Action 1", "Action 2"],
-            "urgency": "HIGH",
+            "urgency": urgency,
             "key_dates": [],
             "relevant_agencies": [],
         },
@@ -72,11 +74,11 @@ def _enrich_response():
 
 @pytest.mark.asyncio
 async def test_parent_event_full_pipeline(session):
-    """Parent event flows through triage → classify → enrich → notify."""
+    """Parent event flows through triage → classify → enrich and queues its notification."""
     event = ChangeEvent(
         watch_uuid="test-uuid",
         watch_url="https://www.usda.gov/reconnect",
-        diff_text="+ New NOFO: ReConnect Round 5 now open for applications.",
+        diff_hash=await repository.put_content(session, "+ New NOFO: ReConnect Round 5 now open for applications."),
         pipeline_status=PipelineStatus.FETCHED.value,
     )
     session.add(event)
@@ -94,18 +96,20 @@ async def test_parent_event_full_pipeline(session):
         patch("acquire.pipeline.classifier.check_budget", new_callable=AsyncMock, return_value=True),
         patch("acquire.pipeline.enricher.chat_completion", new_callable=AsyncMock, return_value=_enrich_response()),
         patch("acquire.pipeline.enricher.check_budget", new_callable=AsyncMock, return_value=True),
-        patch("acquire.pipeline.orchestrator.notify_slack", new_callable=AsyncMock, return_value="ok") as mock_notify,
     ):
         await run_pipeline(event_id)
 
     # Refresh from DB
     updated = await repository.get_event(session, event_id)
     assert updated is not None
-    assert updated.pipeline_status == PipelineStatus.NOTIFIED.value
+    assert updated.pipeline_status == PipelineStatus.ENRICHED.value
     assert updated.classification == "RFP"
     assert updated.summary == "Test summary of procurement opportunity"
     assert updated.urgency == "HIGH"
-    assert updated.slack_message_ts == "ok"
+
+    [notification] = await repository.get_notifications(session, event_id)
+    assert notification.kind == NotificationKind.IMMEDIATE.value
+    assert notification.status == OutboxStatus.PENDING.value
 
 
 @pytest.mark.asyncio
@@ -114,7 +118,7 @@ async def test_non_meaningful_triage_still_processes_links(session):
     event = ChangeEvent(
         watch_uuid="test-uuid",
         watch_url="https://example.gov",
-        diff_text="+ Updated page with link to https://grants.gov/opportunity",
+        diff_hash=await repository.put_content(session, "+ Updated page with link to https://grants.gov/opportunity"),
         pipeline_status=PipelineStatus.FETCHED.value,
     )
     session.add(event)
@@ -140,7 +144,6 @@ async def test_non_meaningful_triage_still_processes_links(session):
         patch("acquire.pipeline.classifier.check_budget", new_callable=AsyncMock, return_value=True),
         patch("acquire.pipeline.enricher.chat_completion", new_callable=AsyncMock, return_value=_enrich_response()),
         patch("acquire.pipeline.enricher.check_budget", new_callable=AsyncMock, return_value=True),
-        patch("acquire.pipeline.orchestrator.notify_slack", new_callable=AsyncMock, return_value="ok"),
     ):
         await run_pipeline(event_id)
 
@@ -160,7 +163,7 @@ async def test_non_meaningful_triage_still_processes_links(session):
     child = children[0]
     assert child.watch_url == "https://grants.gov/opportunity"
     assert child.parent_event_id == event_id
-    assert child.pipeline_status == PipelineStatus.NOTIFIED.value
+    assert child.pipeline_status == PipelineStatus.ENRICHED.value
 
 
 @pytest.mark.asyncio
@@ -195,7 +198,6 @@ async def test_child_event_skips_triage(session):
         patch("acquire.pipeline.classifier.check_budget", new_callable=AsyncMock, return_value=True),
         patch("acquire.pipeline.enricher.chat_completion", new_callable=AsyncMock, return_value=_enrich_response()),
         patch("acquire.pipeline.enricher.check_budget", new_callable=AsyncMock, return_value=True),
-        patch("acquire.pipeline.orchestrator.notify_slack", new_callable=AsyncMock, return_value="ok"),
     ):
         await run_pipeline(child_id)
 
@@ -204,6 +206,235 @@ async def test_child_event_skips_triage(session):
 
     updated = await repository.get_event(session, child_id)
     assert updated is not None
-    assert updated.pipeline_status == PipelineStatus.NOTIFIED.value
+    assert updated.pipeline_status == PipelineStatus.ENRICHED.value
     assert updated.classification == "RFP"
     assert updated.parent_event_id == parent.id
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once_per_stage(session, engine):
+    """Stage results and cost rows share a commit; no per-write commits or refreshes."""
+    from sqlalchemy import event as sa_event
+
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://www.usda.gov/reconnect",
+        diff_hash=await repository.put_content(session, "+ New NOFO: ReConnect Round 5 now open for applications."),
+        pipeline_status=PipelineStatus.FETCHED.value,
+    )
+    session.add(event)
+    await session.commit()
+    event_id = event.id
+
+    commits = []
+    sa_event.listen(engine.sync_engine, "commit", lambda conn: commits.append(1))
+
+    with (
+        patch("acquire.pipeline.orchestrator.get_session_factory", return_value=_mock_session_factory(session)),
+        patch("acquire.pipeline.triage.chat_completion", new_callable=AsyncMock, return_value=_triage_response()),
+        patch("acquire.pipeline.triage.check_budget", new_callable=AsyncMock, return_value=True),
+        patch("acquire.pipeline.classifier.chat_completion", new_callable=AsyncMock, return_value=_classify_response()),
+        patch("acquire.pipeline.classifier.check_budget", new_callable=AsyncMock, return_value=True),
+        patch("acquire.pipeline.enricher.chat_completion", new_callable=AsyncMock, return_value=_enrich_response()),
+        patch("acquire.pipeline.enricher.check_budget", new_callable=AsyncMock, return_value=True),
+    ):
+        await run_pipeline(event_id)
+
+    # Checkpoints after triage, classify, and enrich together with the outbox row
+    assert len(commits) == 3
+
+    from acquire.models.db import CostLedger
+    from sqlmodel import select
+
+    ledger = (await session.execute(select(CostLedger).where(CostLedger.event_id == event_id))).scalars().all()
+    assert len(ledger) == 3
+    assert (await repository.get_event(session, event_id)).pipeline_status == PipelineStatus.ENRICHED.value
+    assert len(await repository.get_notifications(session, event_id)) == 1
+
+
+@pytest.mark.asyncio
+async def test_medium_urgency_notification_goes_to_digest(session):
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://www.usda.gov/reconnect",
+        diff_hash=await repository.put_content(session, "+ New NOFO: ReConnect Round 5 now open for applications."),
+        pipeline_status=PipelineStatus.FETCHED.value,
+    )
+    session.add(event)
+    await session.commit()
+    event_id = event.id
+
+    with (
+        patch("acquire.pipeline.orchestrator.get_session_factory", return_value=_mock_session_factory(session)),
+        patch("acquire.pipeline.triage.chat_completion", new_callable=AsyncMock, return_value=_triage_response()),
+        patch("acquire.pipeline.triage.check_budget", new_callable=AsyncMock, return_value=True),
+        patch("acquire.pipeline.classifier.chat_completion", new_callable=AsyncMock, return_value=_classify_response()),
+        patch("acquire.pipeline.classifier.check_budget", new_callable=AsyncMock, return_value=True),
+        patch(
+            "acquire.pipeline.enricher.chat_completion",
+            new_callable=AsyncMock,
+            return_value=_enrich_response(urgency="MEDIUM"),
+        ),
+        patch("acquire.pipeline.enricher.check_budget", new_callable=AsyncMock, return_value=True),
+    ):
+        await run_pipeline(event_id)
+
+    [notification] = await repository.get_notifications(session, event_id)
+    assert notification.kind == NotificationKind.DIGEST.value
+
+
+@pytest.mark.asyncio
+async def test_seen_links_are_not_fetched_again(session):
+    """A link processed from one event is skipped, before any fetch, when rediscovered."""
+    event_ids = []
+    for url in ("https://example.gov/a", "https://example.gov/b"):
+        event = ChangeEvent(
+            watch_uuid="test-uuid",
+            watch_url=url,
+            diff_hash=await repository.put_content(session, "+ Updated page with link to https://grants.gov/opportunity"),
+            pipeline_status=PipelineStatus.FETCHED.value,
+        )
+        session.add(event)
+        await session.commit()
+        await session.refresh(event)
+        event_ids.append(event.id)
+
+    links = [
+        [
+            {"url": "https://grants.gov/opportunity/", "reason": "Linked opportunity"},
+            {"url": "https://GRANTS.gov/opportunity?utm_source=email#apply", "reason": "Same link"},
+        ],
+        [{"url": "https://grants.gov/opportunity?utm_campaign=x", "reason": "Linked again"}],
+    ]
+    fetch = AsyncMock(return_value="Page content about a grant opportunity")
+
+    with (
+        patch("acquire.pipeline.orchestrator.get_session_factory", return_value=_mock_session_factory(session)),
+        patch("acquire.pipeline.triage.check_budget", new_callable=AsyncMock, return_value=True),
+        patch("acquire.pipeline.orchestrator.fetch_page_text", fetch),
+        patch("acquire.pipeline.classifier.chat_completion", new_callable=AsyncMock, return_value=_classify_response()),
+        patch("acquire.pipeline.classifier.check_budget", new_callable=AsyncMock, return_value=True),
+        patch("acquire.pipeline.enricher.chat_completion", new_callable=AsyncMock, return_value=_enrich_response()),
+        patch("acquire.pipeline.enricher.check_budget", new_callable=AsyncMock, return_value=True),
+    ):
+        for event_id, event_links in zip(event_ids, links):
+            triage_resp = _triage_response(meaningful=False, links=event_links)
+            with patch("acquire.pipeline.triage.chat_completion", new_callable=AsyncMock, return_value=triage_resp):
+                await run_pipeline(event_id)
+
+    assert fetch.await_count == 1
+    from sqlmodel import select
+
+    result = await session.execute(select(ChangeEvent).where(ChangeEvent.parent_event_id.is_not(None)))
+    children = result.scalars().all()
+    assert [child.parent_event_id for child in children] == [event_ids[0]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [PipelineStatus.TRIAGED, PipelineStatus.CLASSIFIED])
+async def test_reclaimed_event_resumes_after_committed_stages(session, status):
+    """An event a previous run left at TRIAGED or CLASSIFIED does not pay for those LLM calls again."""
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://www.usda.gov/reconnect",
+        diff_hash=await repository.put_content(session, "+ New NOFO: ReConnect Round 5 now open for applications."),
+        triage_result={"meaningful": True, "triage_reasoning": "New NOFO"},
+        pipeline_status=status.value,
+    )
+    if status == PipelineStatus.CLASSIFIED:
+        event.classification = "RFP"
+        event.classification_confidence = 0.9
+        event.classification_reasoning = "Open solicitation"
+    session.add(event)
+    await session.commit()
+    event_id = event.id
+
+    triage_llm = AsyncMock(return_value=_triage_response())
+    classify_llm = AsyncMock(return_value=_classify_response())
+    with (
+        patch("acquire.pipeline.orchestrator.get_session_factory", return_value=_mock_session_factory(session)),
+        patch("acquire.pipeline.triage.chat_completion", triage_llm),
+        patch("acquire.pipeline.classifier.chat_completion", classify_llm),
+        patch("acquire.pipeline.classifier.check_budget", new_callable=AsyncMock, return_value=True),
+        patch("acquire.pipeline.enricher.chat_completion", new_callable=AsyncMock, return_value=_enrich_response()),
+        patch("acquire.pipeline.enricher.check_budget", new_callable=AsyncMock, return_value=True),
+    ):
+        await run_pipeline(event_id)
+
+    triage_llm.assert_not_awaited()
+    assert classify_llm.await_count == (1 if status == PipelineStatus.TRIAGED else 0)
+    updated = await repository.get_event(session, event_id)
+    assert updated.pipeline_status == PipelineStatus.ENRICHED.value
+    assert updated.classification == "RFP"
+
+
+async def _leased_event(session, owner: str) -> int:
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://www.usda.gov/reconnect",
+        diff_hash=await repository.put_content(session, "+ New NOFO: ReConnect Round 5 now open for applications."),
+        pipeline_status=PipelineStatus.FETCHED.value,
+        lease_owner=owner,
+        lease_expires_at=datetime.now(timezone.utc) + timedelta(minutes=2),
+    )
+    session.add(event)
+    await session.commit()
+    return event.id
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_discards_staged_writes(session):
+    """A worker whose lease was taken over commits nothing, not even its error state."""
+    event_id = await _leased_event(session, owner="worker-b")
+
+    with (
+        patch("acquire.pipeline.orchestrator.get_session_factory", return_value=_mock_session_factory(session)),
+        patch("acquire.pipeline.triage.chat_completion", new_callable=AsyncMock, return_value=_triage_response()),
+        patch("acquire.pipeline.triage.check_budget", new_callable=AsyncMock, return_value=True),
+        patch("acquire.pipeline.classifier.chat_completion", new_callable=AsyncMock) as classify_llm,
+    ):
+        await run_pipeline(event_id, lease_owner="worker-a")
+
+    classify_llm.assert_not_awaited()
+    session.expire_all()
+    event = await repository.get_event(session, event_id)
+    assert event.pipeline_status == PipelineStatus.FETCHED.value
+    assert event.triage_result is None
+    assert event.lease_owner == "worker-b"
+
+    from acquire.models.db import CostLedger
+    from sqlmodel import select
+
+    assert (await session.execute(select(CostLedger))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_run_is_rolled_back(session):
+    """The worker cancels a run whose lease it lost; the run then checkpoints nothing."""
+    event_id = await _leased_event(session, owner="worker-a")
+    started = asyncio.Event()
+
+    async def hang(**kwargs):
+        started.set()
+        await asyncio.sleep(10)
+
+    checkpoint = AsyncMock(side_effect=repository.checkpoint)
+    with (
+        patch("acquire.pipeline.orchestrator.get_session_factory", return_value=_mock_session_factory(session)),
+        patch("acquire.pipeline.orchestrator.repository.checkpoint", checkpoint),
+        patch("acquire.pipeline.triage.chat_completion", new_callable=AsyncMock, return_value=_triage_response()),
+        patch("acquire.pipeline.triage.check_budget", new_callable=AsyncMock, return_value=True),
+        patch("acquire.pipeline.classifier.chat_completion", side_effect=hang),
+        patch("acquire.pipeline.classifier.check_budget", new_callable=AsyncMock, return_value=True),
+    ):
+        run = asyncio.create_task(run_pipeline(event_id, lease_owner="worker-a"))
+        await asyncio.wait_for(started.wait(), timeout=5)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+    # Only the triage checkpoint, taken while the lease was held
+    assert checkpoint.await_count == 1
+    session.expire_all()
+    event = await repository.get_event(session, event_id)
+    assert event.pipeline_status == PipelineStatus.TRIAGED.value
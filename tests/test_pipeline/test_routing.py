@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+
+from acquire.config import get_settings
+from acquire.models.db import ChangeEvent
+from acquire.pipeline import routing
+from acquire.pipeline.routing import destination_url, route_event
+
+CONFIG = {
+    "destinations": {
+        "slack": {"url_env": "SLACK_WEBHOOK_URL"},
+        "rfp": {"url": "https://hooks.slack.com/rfp"},
+        "oncall": {"url_env": "ONCALL_WEBHOOK_URL"},
+    },
+    "routes": [
+        {"classification": ["RFP"], "destinations": ["rfp"]},
+        {"urgency": ["CRITICAL"], "destinations": ["oncall"]},
+        {"domain": ["usda.gov"], "destinations": ["slack"]},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def routes(monkeypatch):
+    monkeypatch.setattr(routing, "routing_config", lambda: CONFIG)
+
+
+def _event(watch_url: str = "https://www.rd.usda.gov/reconnect", **fields) -> ChangeEvent:
+    return ChangeEvent(watch_uuid="test", watch_url=watch_url, **fields)
+
+
+def test_route_collects_every_matching_rule():
+    assert route_event(_event(classification="RFP", urgency="CRITICAL")) == ["rfp", "oncall", "slack"]
+    assert route_event(_event(classification="rfi", urgency="LOW")) == ["slack"]
+
+
+def test_domain_rule_matches_subdomains_only():
+    event = _event(classification="RFI", urgency="LOW", watch_url="https://notusda.gov/page")
+    assert route_event(event) == []
+
+
+def test_route_defaults_to_slack_without_rules(monkeypatch):
+    monkeypatch.setattr(routing, "routing_config", lambda: {})
+    assert route_event(_event(classification="RFI")) == ["slack"]
+
+
+def test_destination_url_resolution(monkeypatch):
+    monkeypatch.setenv("ONCALL_WEBHOOK_URL", "https://oncall.example/hook")
+    assert destination_url("rfp") == "https://hooks.slack.com/rfp"
+    assert destination_url("oncall") == "https://oncall.example/hook"
+    assert destination_url("slack") == "https://hooks.slack.com/test"
+    assert destination_url("unknown") is None
+
+
+def test_default_destination_uses_settings_url(monkeypatch):
+    # SLACK_WEBHOOK_URL from .env reaches Settings but not os.environ
+    monkeypatch.delenv("SLACK_WEBHOOK_URL", raising=False)
+    settings = get_settings().model_copy(update={"slack_webhook_url": "https://hooks.slack.com/from-dotenv"})
+    monkeypatch.setattr(routing, "get_settings", lambda: settings)
+    assert destination_url("slack") == "https://hooks.slack.com/from-dotenv"
+    assert destination_url("oncall") is None
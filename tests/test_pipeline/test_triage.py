@@ -6,6 +6,7 @@ import pytest
 
 from acquire.models.db import ChangeEvent, PipelineStatus
 from acquire.pipeline.triage import triage
+from acquire.storage import repository
 
 
 @pytest.mark.asyncio
@@ -13,7 +14,7 @@ async def test_triage_meaningful_with_links(session):
     event = ChangeEvent(
         watch_uuid="test-uuid",
         watch_url="https://www.usda.gov/reconnect",
-        diff_text="+ New NOFO: ReConnect Round 5 now open. See https://www.grants.gov/reconnect-round5 for details.",
+        diff_hash=await repository.put_content(session, "+ New NOFO: ReConnect Round 5 now open. See https://www.grants.gov/reconnect-round5 for details."),
         pipeline_status=PipelineStatus.FETCHED.value,
     )
     session.add(event)
@@ -55,7 +56,7 @@ async def test_triage_not_meaningful(session):
     event = ChangeEvent(
         watch_uuid="test-uuid",
         watch_url="https://example.gov",
-        diff_text="- Last updated: Jan 1\n+ Last updated: Feb 1",
+        diff_hash=await repository.put_content(session, "- Last updated: Jan 1\n+ Last updated: Feb 1"),
         pipeline_status=PipelineStatus.FETCHED.value,
     )
     session.add(event)
@@ -88,7 +89,7 @@ async def test_triage_skips_on_budget_exceeded(session):
     event = ChangeEvent(
         watch_uuid="test-uuid",
         watch_url="https://example.gov",
-        diff_text="Some content",
+        diff_hash=await repository.put_content(session, "Some content"),
         pipeline_status=PipelineStatus.FETCHED.value,
     )
     session.add(event)
@@ -106,7 +107,9 @@ async def test_triage_enforces_max_links(session):
     event = ChangeEvent(
         watch_uuid="test-uuid",
         watch_url="https://example.gov",
-        diff_text="Lots of links",
+        diff_hash=await repository.put_content(
+            session, "\n".join(f"+ Solicitation {i}: https://example.gov/link{i}" for i in range(5))
+        ),
         pipeline_status=PipelineStatus.FETCHED.value,
     )
     session.add(event)
@@ -135,3 +138,146 @@ async def test_triage_enforces_max_links(session):
     assert result is not None
     # Default max_links_per_event is 3
     assert len(result.discovered_links) == 3
+
+
+@pytest.mark.asyncio
+async def test_triage_only_offers_and_keeps_candidate_links(session):
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://example.gov",
+        diff_hash=await repository.put_content(
+            session,
+            "- Old [NOFO](https://grants.gov/old)\n"
+            "+ New [NOFO for rural broadband](https://www.grants.gov/nofo-42?utm_source=x)\n"
+            "+ [Contact us](/contact)",
+        ),
+        pipeline_status=PipelineStatus.FETCHED.value,
+    )
+    session.add(event)
+    await session.commit()
+    await session.refresh(event)
+
+    mock_response = {
+        "content": {
+            "meaningful": True,
+            "triage_reasoning": "New NOFO",
+            "discovered_links": [
+                {"url": "https://grants.gov/nofo-42", "reason": "NOFO"},
+                {"url": "https://grants.gov/invented", "reason": "Not in the diff"},
+            ],
+        },
+        "model": "deepseek/deepseek-v3.2",
+        "prompt_tokens": 300,
+        "completion_tokens": 100,
+        "total_tokens": 400,
+    }
+
+    with patch("acquire.pipeline.triage.chat_completion", new_callable=AsyncMock, return_value=mock_response) as llm:
+        with patch("acquire.pipeline.triage.check_budget", new_callable=AsyncMock, return_value=True):
+            result = await triage(session, event)
+
+    prompt = llm.await_args.kwargs["messages"][1]["content"]
+    assert "https://www.grants.gov/nofo-42?utm_source=x — NOFO for rural broadband" in prompt
+    assert "/old" not in prompt.split("## Questions")[1]
+    assert "/contact" not in prompt.split("## Questions")[1]
+    assert [link.url for link in result.discovered_links] == ["https://grants.gov/nofo-42"]
+
+
+@pytest.mark.asyncio
+async def test_triage_without_candidates_skips_link_discovery(session):
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://example.gov",
+        diff_hash=await repository.put_content(session, "+ Office hours are now 9-5. See https://example.gov/hours"),
+        pipeline_status=PipelineStatus.FETCHED.value,
+    )
+    session.add(event)
+    await session.commit()
+    await session.refresh(event)
+
+    mock_response = {
+        "content": {
+            "meaningful": False,
+            "triage_reasoning": "Office hours",
+            "discovered_links": [{"url": "https://example.gov/hours", "reason": "Hours"}],
+        },
+        "model": "deepseek/deepseek-v3.2",
+        "prompt_tokens": 300,
+        "completion_tokens": 100,
+        "total_tokens": 400,
+    }
+
+    with patch("acquire.pipeline.triage.chat_completion", new_callable=AsyncMock, return_value=mock_response) as llm:
+        with patch("acquire.pipeline.triage.check_budget", new_callable=AsyncMock, return_value=True):
+            result = await triage(session, event)
+
+    assert "There are no candidate links" in llm.await_args.kwargs["messages"][1]["content"]
+    assert result.discovered_links == []
+    assert event.discovered_links is None
+
+
+@pytest.mark.asyncio
+async def test_triage_offers_snapshot_links_on_first_detection(session):
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://www.usda.gov/reconnect",
+        snapshot_hash=await repository.put_content(
+            session, "Funding\n- Posted March 2025\nNew NOFO: https://grants.gov/search/opp/123"
+        ),
+        pipeline_status=PipelineStatus.FETCHED.value,
+    )
+    session.add(event)
+    await session.commit()
+
+    mock_response = {
+        "content": {"meaningful": True, "triage_reasoning": "New NOFO", "discovered_links": []},
+        "model": "deepseek/deepseek-v3.2",
+        "prompt_tokens": 300,
+        "completion_tokens": 80,
+        "total_tokens": 380,
+    }
+
+    with (
+        patch("acquire.pipeline.triage.chat_completion", new_callable=AsyncMock, return_value=mock_response) as completion,
+        patch("acquire.pipeline.triage.check_budget", new_callable=AsyncMock, return_value=True),
+    ):
+        await triage(session, event)
+
+    prompt = completion.call_args.kwargs["messages"][1]["content"]
+    assert "- https://grants.gov/search/opp/123" in prompt
+    assert "There are no candidate links" not in prompt
+
+
+@pytest.mark.asyncio
+async def test_triage_treats_snapshot_stored_as_diff_as_first_detection(session):
+    # fetch_diff returns the snapshot as the diff when the watch has a single snapshot
+    snapshot_hash = await repository.put_content(
+        session, "ReConnect Program\nNew NOFO: https://www.grants.gov/search/opp/456 applications open"
+    )
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://www.usda.gov/reconnect",
+        diff_hash=snapshot_hash,
+        snapshot_hash=snapshot_hash,
+        pipeline_status=PipelineStatus.FETCHED.value,
+    )
+    session.add(event)
+    await session.commit()
+
+    mock_response = {
+        "content": {"meaningful": True, "triage_reasoning": "New NOFO", "discovered_links": []},
+        "model": "deepseek/deepseek-v3.2",
+        "prompt_tokens": 300,
+        "completion_tokens": 80,
+        "total_tokens": 380,
+    }
+
+    with (
+        patch("acquire.pipeline.triage.chat_completion", new_callable=AsyncMock, return_value=mock_response) as completion,
+        patch("acquire.pipeline.triage.check_budget", new_callable=AsyncMock, return_value=True),
+    ):
+        await triage(session, event)
+
+    prompt = completion.call_args.kwargs["messages"][1]["content"]
+    assert "- https://www.grants.gov/search/opp/456" in prompt
+    assert "There are no candidate links" not in prompt
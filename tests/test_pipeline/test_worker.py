@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from acquire.models.db import ChangeEvent, PipelineStatus
+from acquire.pipeline.worker import _run_leased, run_worker
+from acquire.storage import repository
+from acquire.storage.database import build_engine, init_schema
+
+
+async def _add_event(session, **fields) -> int:
+    event = ChangeEvent(watch_uuid="test-uuid", watch_url="https://example.gov", **fields)
+    session.add(event)
+    await session.commit()
+    return event.id
+
+
+@pytest.mark.asyncio
+async def test_claim_is_exclusive(session):
+    event_id = await _add_event(session)
+
+    assert await repository.claim_event(session, "worker-a", lease_seconds=60) == event_id
+    assert await repository.claim_event(session, "worker-b", lease_seconds=60) is None
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_finished_events(session):
+    await _add_event(session, pipeline_status=PipelineStatus.NOTIFIED.value)
+    pending = await _add_event(session, pipeline_status=PipelineStatus.FETCHED.value)
+
+    assert await repository.claim_event(session, "worker-a", lease_seconds=60) == pending
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_can_be_reclaimed(session):
+    event_id = await _add_event(
+        session,
+        pipeline_status=PipelineStatus.TRIAGED.value,
+        lease_owner="crashed-worker",
+        lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+    )
+
+    assert await repository.claim_event(session, "worker-b", lease_seconds=60) == event_id
+    assert not await repository.renew_lease(session, event_id, "crashed-worker", 60)
+    assert await repository.renew_lease(session, event_id, "worker-b", 60)
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_and_releases_claimed_events(tmp_path):
+    # A file database: the in-memory fixture shares one connection between sessions,
+    # so concurrent sessions would commit and roll back each other's work
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'worker.db'}")
+    await init_schema(engine)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        first = await _add_event(session)
+        second = await _add_event(session)
+
+    ran = []
+    stop = asyncio.Event()
+
+    async def fake_pipeline(event_id, lease_owner=None):
+        ran.append(event_id)
+        async with factory() as s:
+            event = await s.get(ChangeEvent, event_id)
+            event.pipeline_status = PipelineStatus.NOTIFIED.value
+            await s.commit()
+        if len(ran) == 2:
+            stop.set()
+
+    config = {"concurrency": 2, "lease_seconds": 60, "heartbeat_seconds": 30, "poll_interval_seconds": 0.01}
+    with (
+        patch("acquire.pipeline.worker.worker_config", return_value=config),
+        patch("acquire.pipeline.worker.get_session_factory", return_value=factory),
+        patch("acquire.pipeline.worker.run_pipeline", side_effect=fake_pipeline),
+    ):
+        await asyncio.wait_for(run_worker(stop), timeout=5)
+
+    assert sorted(ran) == [first, second]
+    async with factory() as session:
+        for event_id in (first, second):
+            event = await repository.get_event(session, event_id)
+            assert event.lease_owner is None
+            assert event.lease_expires_at is None
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_cancels_the_pipeline():
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def slow_pipeline(event_id, lease_owner=None):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with (
+        patch("acquire.pipeline.worker.run_pipeline", side_effect=slow_pipeline),
+        patch("acquire.pipeline.worker.repository.renew_lease", new_callable=AsyncMock, return_value=False),
+        patch("acquire.pipeline.worker.repository.release_lease", new_callable=AsyncMock) as release,
+    ):
+        await asyncio.wait_for(_run_leased(1, "worker-a", {"lease_seconds": 60, "heartbeat_seconds": 0.01}), timeout=5)
+
+    assert started.is_set() and cancelled.is_set()
+    release.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_renewal_errors_are_retried():
+    renewals = AsyncMock(side_effect=[RuntimeError("database is locked"), True, True, True])
+
+    async def pipeline(event_id, lease_owner=None):
+        while renewals.await_count < 3:
+            await asyncio.sleep(0.01)
+
+    with (
+        patch("acquire.pipeline.worker.run_pipeline", side_effect=pipeline),
+        patch("acquire.pipeline.worker.repository.renew_lease", renewals),
+        patch("acquire.pipeline.worker.repository.release_lease", new_callable=AsyncMock),
+    ):
+        await asyncio.wait_for(_run_leased(1, "worker-a", {"lease_seconds": 60, "heartbeat_seconds": 0.01}), timeout=5)
+
+    assert renewals.await_count >= 3
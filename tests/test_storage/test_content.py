@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import select, func
+
+from acquire.models.db import ContentBlob
+from acquire.storage import database, repository
+from acquire.storage.content import content_hash, decompress_text
+from acquire.storage.database import build_engine, init_schema
+
+
+@pytest.mark.asyncio
+async def test_identical_text_stored_once(session):
+    page = "Notice of Funding Opportunity\n" * 200
+
+    first = await repository.put_content(session, page)
+    second = await repository.put_content(session, page)
+    await session.commit()
+
+    assert first == second == content_hash(page)
+    count = (await session.execute(select(func.count()).select_from(ContentBlob))).scalar_one()
+    assert count == 1
+
+    blob = await session.get(ContentBlob, first)
+    assert blob.size == len(page.encode("utf-8"))
+    assert len(blob.data) < blob.size
+    assert decompress_text(blob.data, blob.codec) == page
+
+
+@pytest.mark.asyncio
+async def test_load_content_round_trip(session):
+    content_ref = await repository.put_content(session, "Grant text")
+    await session.commit()
+    session.info.clear()
+
+    assert await repository.load_content(session, content_ref) == "Grant text"
+    assert await repository.load_content(session, None) is None
+    assert await repository.put_content(session, None) is None
+
+
+@pytest.mark.asyncio
+async def test_upgrade_moves_inline_text_to_content_store(monkeypatch):
+    # One row per batch, so the migration runs as several transactions
+    monkeypatch.setattr(database, "_LEGACY_CONTENT_BATCH", 1)
+    engine = build_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE change_events (id INTEGER PRIMARY KEY, watch_uuid VARCHAR NOT NULL, "
+                "watch_url VARCHAR NOT NULL, received_at DATETIME NOT NULL, diff_text VARCHAR, "
+                "snapshot_text VARCHAR, pipeline_status VARCHAR NOT NULL)"
+            ))
+            await conn.execute(text(
+                "INSERT INTO change_events VALUES (1, 'u', 'https://a.gov', '2026-01-01 00:00:00', "
+                "'+ added line', 'same page', 'notified'), "
+                "(2, 'u', 'https://a.gov', '2026-01-02 00:00:00', NULL, 'same page', 'notified')"
+            ))
+
+        await init_schema(engine)
+
+        async with engine.connect() as conn:
+            rows = (await conn.execute(text(
+                "SELECT diff_hash, snapshot_hash, diff_text, snapshot_text FROM change_events ORDER BY id"
+            ))).all()
+            blob_count = (await conn.execute(text("SELECT count(*) FROM content_blobs"))).scalar_one()
+
+        assert rows[0] == (content_hash("+ added line"), content_hash("same page"), None, None)
+        assert rows[1] == (None, content_hash("same page"), None, None)
+        assert blob_count == 2
+    finally:
+        await engine.dispose()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from acquire.config import Settings
+from acquire.storage.database import build_engine, init_schema
+
+
+@pytest.mark.asyncio
+async def test_file_engine_applies_pragmas(tmp_path):
+    settings = Settings(db_busy_timeout_ms=1234, db_pool_size=3, db_max_overflow=2)
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'acquire.db'}", settings)
+    try:
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar_one()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar_one()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar_one()
+            temp_store = (await conn.execute(text("PRAGMA temp_store"))).scalar_one()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+        assert busy_timeout == 1234
+        assert temp_store == 2  # MEMORY
+        assert engine.pool.size() == 3
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_memory_engine_ignores_pool_sizing():
+    engine = build_engine("sqlite+aiosqlite://", Settings(db_pool_size=3))
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT 1"))).scalar_one() == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_upgrade_drops_archived_diff_text_from_search_index():
+    engine = build_engine("sqlite+aiosqlite://")
+    try:
+        await init_schema(engine)
+        async with engine.begin() as conn:
+            # As an older release left it: archived, yet its diff still indexed
+            await conn.execute(text(
+                "INSERT INTO change_events (id, watch_uuid, watch_url, received_at, pipeline_status, archived_at) "
+                "VALUES (1, 'u', 'https://a.gov', '2026-01-01 00:00:00', 'notified', '2026-04-01 00:00:00')"
+            ))
+            await conn.execute(text("UPDATE event_search SET diff_text = '+ old diff' WHERE rowid = 1"))
+            await conn.execute(text("DROP TRIGGER change_events_search_diff"))
+            await conn.execute(text(
+                "CREATE TRIGGER change_events_search_diff AFTER UPDATE OF diff_hash ON change_events "
+                "WHEN NEW.diff_hash IS NOT NULL AND OLD.diff_hash IS NOT NEW.diff_hash "
+                "BEGIN SELECT 1; END"
+            ))
+
+        await init_schema(engine)
+
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT diff_text FROM event_search WHERE rowid = 1"))).scalar_one() is None
+    finally:
+        await engine.dispose()
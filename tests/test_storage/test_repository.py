@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event as sa_event, text
+
+from acquire.models.db import ChangeEvent, PipelineStatus
+from acquire.storage import repository
+from acquire.storage.database import build_engine, init_schema
+
+
+async def _query_plan(engine, run_query) -> str:
+    """Run a repository query, then EXPLAIN QUERY PLAN the SQL it executed."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    sa_event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await run_query()
+    finally:
+        sa_event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    statement, parameters = captured[-1]
+    async with engine.connect() as conn:
+        rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_events_today_count_uses_half_open_range(session):
+    now = datetime.now(timezone.utc)
+    start, end = repository._utc_day_bounds(now)
+    session.add_all([
+        ChangeEvent(watch_uuid="a", received_at=start),
+        ChangeEvent(watch_uuid="b", received_at=end - timedelta(microseconds=1)),
+        ChangeEvent(watch_uuid="c", received_at=end),
+        ChangeEvent(watch_uuid="d", received_at=start - timedelta(microseconds=1)),
+    ])
+    await session.commit()
+
+    assert await repository.get_events_received_count(session, start, end) == 2
+
+
+@pytest.mark.asyncio
+async def test_events_today_count_uses_received_at_index(engine, session):
+    plan = await _query_plan(engine, lambda: repository.get_events_today_count(session))
+    assert "ix_change_events_received_at" in plan
+    assert "SCAN change_events" not in plan
+
+
+@pytest.mark.asyncio
+async def test_daily_spend_uses_date_model_index(engine, session):
+    plan = await _query_plan(engine, lambda: repository.get_daily_spend(session))
+    assert "ix_cost_ledger_date_model" in plan
+
+
+@pytest.mark.asyncio
+async def test_upgrade_adds_indexes_to_existing_tables():
+    engine = build_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE cost_ledger (id INTEGER PRIMARY KEY, date VARCHAR NOT NULL, model VARCHAR NOT NULL, "
+                "prompt_tokens INTEGER NOT NULL, completion_tokens INTEGER NOT NULL, "
+                "estimated_cost_usd FLOAT NOT NULL, event_id INTEGER, created_at DATETIME NOT NULL)"
+            ))
+
+        await init_schema(engine)
+
+        async with engine.connect() as conn:
+            indexes = {
+                row[0] for row in (await conn.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name IN ('cost_ledger', 'change_events')"
+                ))).all()
+            }
+        assert {
+            "ix_cost_ledger_date_model",
+            "ix_change_events_received_at",
+            "ix_change_events_pipeline_status",
+            "ix_change_events_watch_uuid_received_at",
+        } <= indexes
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_upgrade_keeps_defaults_and_not_null_on_added_columns():
+    engine = build_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE change_events (id INTEGER PRIMARY KEY, watch_uuid VARCHAR NOT NULL, "
+                "watch_url VARCHAR NOT NULL, received_at DATETIME NOT NULL)"
+            ))
+            await conn.execute(text("INSERT INTO change_events VALUES (1, 'u', 'https://a.gov', '2026-01-01 00:00:00')"))
+
+        await init_schema(engine)
+
+        async with engine.connect() as conn:
+            columns = {row[1]: row for row in (await conn.execute(text("PRAGMA table_info(change_events)"))).all()}
+            status = (await conn.execute(text("SELECT pipeline_status FROM change_events"))).scalar_one()
+        # (cid, name, type, notnull, dflt_value, pk)
+        assert columns["pipeline_status"][3] == 1
+        assert status == PipelineStatus.RECEIVED.value
+        assert columns["summary"][3] == 0
+    finally:
+        await engine.dispose()
+
+
+async def _add_enriched(session, **fields) -> int:
+    event = ChangeEvent(watch_uuid="test-uuid", watch_url="https://example.gov", **fields)
+    session.add(event)
+    await session.commit()
+    return event.id
+
+
+@pytest.mark.asyncio
+async def test_json_fields_round_trip_as_native_values(session):
+    event_id = await _add_enriched(
+        session,
+        recommended_actions=["Register", "Apply"],
+        triage_result={"meaningful": True, "triage_reasoning": "New NOFO"},
+        discovered_links=[{"url": "https://grants.gov/x", "reason": "NOFO"}],
+    )
+    session.expunge_all()
+
+    event = await repository.get_event(session, event_id)
+    assert event.recommended_actions == ["Register", "Apply"]
+    assert event.triage_result["meaningful"] is True
+    assert event.discovered_links[0]["url"] == "https://grants.gov/x"
+    assert event.key_dates is None
+
+    raw = (await session.execute(text("SELECT key_dates, json_type(triage_result) FROM change_events"))).one()
+    assert raw == (None, "object")
+
+
+@pytest.mark.asyncio
+async def test_find_events_by_agency(engine, session):
+    usda = await _add_enriched(session, relevant_agencies=["USDA", "Rural Utilities Service"])
+    await _add_enriched(session, relevant_agencies=["HHS"])
+    await _add_enriched(session)
+
+    events = await repository.find_events_by_agency(session, "usda")
+    assert [e.id for e in events] == [usda]
+
+    plan = await _query_plan(engine, lambda: repository.find_events_by_agency(session, "USDA"))
+    assert "ix_change_events_has_agencies" in plan
+
+
+@pytest.mark.asyncio
+async def test_find_upcoming_deadlines(engine, session):
+    today = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    soon = await _add_enriched(session, key_dates=["2026-03-10: Application deadline", "2026-05-01: Award date"])
+    sooner = await _add_enriched(session, key_dates=["Spring 2026: Webinar", "2026-03-02: Industry day"])
+    await _add_enriched(session, key_dates=["2026-02-27: Closed"])
+
+    results = await repository.find_upcoming_deadlines(session, days=14, today=today)
+    assert [(e.id, d) for e, d in results] == [
+        (sooner, "2026-03-02: Industry day"),
+        (soon, "2026-03-10: Application deadline"),
+    ]
+
+    plan = await _query_plan(engine, lambda: repository.find_upcoming_deadlines(session, today=today))
+    assert "ix_change_events_has_key_dates" in plan
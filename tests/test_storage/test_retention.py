@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import text
+from sqlmodel import select
+
+from acquire.models.db import ChangeEvent, ContentBlob, NotificationFingerprint, NotificationKind
+from acquire.storage import repository
+from acquire.storage.retention import iter_archived_events, restore_event, run_retention
+
+# Far enough ahead that content blobs written during the test fall before the cutoff
+NOW = datetime.now(timezone.utc) + timedelta(days=31)
+
+
+def _config(tmp_path, **overrides):
+    config = {
+        "archive_after_days": 30,
+        "delete_after_days": None,
+        "batch_size": 1,
+        "archive_dir": str(tmp_path / "archive"),
+    }
+    config.update(overrides)
+    return patch("acquire.storage.retention._retention_config", return_value=config)
+
+
+async def _add_event(session, received_at, diff, snapshot):
+    event = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://example.gov",
+        received_at=received_at,
+        diff_hash=await repository.put_content(session, diff),
+        snapshot_hash=await repository.put_content(session, snapshot),
+        summary=f"summary for {diff}",
+    )
+    session.add(event)
+    await session.commit()
+    return event.id
+
+
+@pytest.mark.asyncio
+async def test_retention_archives_old_text_and_prunes_blobs(engine, session, tmp_path):
+    old_a = await _add_event(session, NOW - timedelta(days=60), "+ old diff a", "shared page")
+    old_b = await _add_event(session, NOW - timedelta(days=45), "+ old diff b", "shared page")
+    recent = await _add_event(session, NOW - timedelta(days=1), "+ recent diff", "recent page")
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with _config(tmp_path):
+        stats = await run_retention(factory, now=NOW)
+
+    assert stats["archived"] == 2
+    assert stats["events_deleted"] == 0
+
+    session.expire_all()
+    for event_id in (old_a, old_b):
+        event = await repository.get_event(session, event_id)
+        assert event.diff_hash is None and event.snapshot_hash is None
+        assert event.archived_at is not None
+    assert (await repository.get_event(session, recent)).diff_hash is not None
+
+    # Only the recent event's blobs are still referenced
+    assert stats["blobs_deleted"] == 3
+    hashes = set((await session.execute(select(ContentBlob.hash))).scalars().all())
+    recent_event = await repository.get_event(session, recent)
+    assert hashes == {recent_event.diff_hash, recent_event.snapshot_hash}
+
+    records = {r["id"]: r for r in iter_archived_events(tmp_path / "archive")}
+    assert set(records) == {old_a, old_b}
+    assert records[old_a]["diff_text"] == "+ old diff a"
+    assert records[old_b]["snapshot_text"] == "shared page"
+    assert records[old_a]["summary"] == "summary for + old diff a"
+    day = (NOW - timedelta(days=60)).date()
+    assert (tmp_path / "archive" / f"{day:%Y}" / f"{day:%m}" / f"change_events-{day:%Y-%m-%d}.jsonl.gz").exists()
+
+
+@pytest.mark.asyncio
+async def test_deleted_events_are_recoverable_from_archive(engine, session, tmp_path):
+    event_id = await _add_event(session, NOW - timedelta(days=400), "+ ancient diff", "ancient page")
+    await repository.enqueue_notification(session, event_id, NotificationKind.IMMEDIATE.value)
+    session.add(NotificationFingerprint(fingerprint="f" * 64, destination="slack", event_id=event_id, expires_at=NOW))
+    await session.commit()
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with _config(tmp_path, delete_after_days=365):
+        stats = await run_retention(factory, now=NOW)
+
+    assert stats["archived"] == 1
+    assert stats["events_deleted"] == 1
+    session.expunge_all()
+    assert await repository.get_event(session, event_id) is None
+    # Rows referencing the deleted event go with it
+    assert await repository.get_notifications(session, event_id) == []
+    assert (await session.execute(select(NotificationFingerprint))).scalars().all() == []
+
+    record = next(iter_archived_events(tmp_path / "archive"))
+    restored = await restore_event(session, record)
+    repository.clear_content_cache(session)
+
+    assert restored.id == event_id
+    assert restored.summary == "summary for + ancient diff"
+    assert await repository.load_content(session, restored.diff_hash) == "+ ancient diff"
+    assert await repository.load_content(session, restored.snapshot_hash) == "ancient page"
+
+
+@pytest.mark.asyncio
+async def test_restored_event_survives_the_next_retention_run(engine, session, tmp_path):
+    event_id = await _add_event(session, NOW - timedelta(days=400), "+ ancient diff", "ancient page")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with _config(tmp_path, delete_after_days=365):
+        await run_retention(factory, now=NOW)
+        record = next(iter_archived_events(tmp_path / "archive"))
+        await restore_event(session, record, now=NOW)
+
+        # The next pass (e.g. at startup) neither archives nor deletes it again
+        stats = await run_retention(factory, now=NOW + timedelta(days=1))
+
+    assert stats["archived"] == 0
+    assert stats["events_deleted"] == 0
+    session.expire_all()
+    repository.clear_content_cache(session)
+    event = await repository.get_event(session, event_id)
+    assert event.archived_at is None
+    assert await repository.load_content(session, event.diff_hash) == "+ ancient diff"
+
+
+@pytest.mark.asyncio
+async def test_reused_blob_is_not_pruned(engine, session, tmp_path):
+    content_hash = await repository.put_content(session, "page seen long ago")
+    blob = await session.get(ContentBlob, content_hash)
+    blob.created_at = datetime.now(timezone.utc) - timedelta(days=60)
+    await session.commit()
+
+    # A pipeline reuses the blob inside its (not yet committed) unit of work
+    assert await repository.put_content(session, "page seen long ago") == content_hash
+    await session.commit()
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with _config(tmp_path):
+        stats = await run_retention(factory, now=datetime.now(timezone.utc))
+
+    assert stats["blobs_deleted"] == 0
+    session.expunge_all()
+    assert await session.get(ContentBlob, content_hash) is not None
+
+
+@pytest.mark.asyncio
+async def test_archived_diff_text_leaves_search_index(engine, session, tmp_path):
+    event_id = await _add_event(session, NOW - timedelta(days=60), "+ ReConnect broadband loans", "page")
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with _config(tmp_path):
+        await run_retention(factory, now=NOW)
+
+    async with engine.connect() as conn:
+        diff_text = (await conn.execute(
+            text("SELECT diff_text FROM event_search WHERE rowid = :id"), {"id": event_id}
+        )).scalar_one()
+    assert diff_text is None
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from acquire.utils.http import retry_after_seconds
+
+
+def test_retry_after_seconds_forms():
+    assert retry_after_seconds("3", 1, 60) == 3.0
+    assert retry_after_seconds(None, 1, 60) == 1.0
+    assert retry_after_seconds("600", 1, 60) == 60.0
+    assert retry_after_seconds("soon", 1, 60) == 60.0
+
+    in_ten = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True)
+    assert 8 <= retry_after_seconds(in_ten, 1, 60) <= 10
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT", 1, 60) == 0.0
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+
+import pytest
+import structlog
+
+from acquire.utils import logging as acquire_logging
+from acquire.utils.logging import QueueWriter, setup_logging
+
+
+@pytest.fixture
+def json_logs():
+    """Log as JSON into a buffer; call the fixture value to flush and read the records."""
+    stream = io.StringIO()
+
+    def configure(**kwargs) -> None:
+        setup_logging(log_format="json", level="debug", stream=stream, **kwargs)
+
+    def read() -> list[dict]:
+        acquire_logging._stop_writer()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    configure.read = read
+    yield configure
+    setup_logging(log_format="console", debug_sample_rate=1.0)
+
+
+def test_json_mode_writes_one_object_per_line(json_logs):
+    json_logs(debug_sample_rate=1.0)
+    logger = structlog.get_logger()
+    logger.info("pipeline_fetch", event_id=7)
+    try:
+        raise ValueError("bad JSON")
+    except ValueError:
+        logger.exception("pipeline_error", event_id=7)
+
+    fetch, error = json_logs.read()
+    assert fetch["event"] == "pipeline_fetch"
+    assert fetch["event_id"] == 7
+    assert fetch["level"] == "info"
+    assert fetch["timestamp"].endswith("Z")
+    assert error["level"] == "error"
+    assert "ValueError: bad JSON" in error["exception"]
+
+
+def test_debug_records_are_sampled(json_logs):
+    json_logs(debug_sample_rate=0.0)
+    logger = structlog.get_logger()
+    for _ in range(50):
+        logger.debug("crawl_cache_hit")
+    logger.info("pipeline_complete")
+
+    assert [record["event"] for record in json_logs.read()] == ["pipeline_complete"]
+
+
+class _BlockingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.writing.set()
+        self.release.wait(5)
+        return super().write(text)
+
+
+def test_full_queue_drops_and_reports_records():
+    stream = _BlockingStream()
+    writer = QueueWriter(stream, max_queue=1)
+    writer.submit({"event": "first"})
+    stream.writing.wait(5)
+    # The writer thread is stuck writing "first": one record fits in the queue
+    for _ in range(100):
+        writer.submit({"event": "burst"})
+    stream.release.set()
+    writer.close()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert writer.dropped == 99
+    assert records == [{"event": "first"}, {"event": "burst"}, {"event": "log_records_dropped", "count": 99}]
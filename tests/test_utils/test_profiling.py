@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from acquire.utils.profiling import LoopLagMonitor, Profiler
+
+
+def _burn(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def test_sampled_profile_splits_cpu_from_waiting(tmp_path):
+    profiler = Profiler({"output_dir": str(tmp_path), "sample_interval_ms": 2}, pipeline_rate=1.0, request_rate=0.0)
+
+    async with profiler.profile("pipeline", event_id=42) as profile:
+        _burn(0.1)
+        await asyncio.sleep(0.1)
+
+    assert profile.samples > 0
+    assert any("test_profiling:_burn" in stack for stack in profile.stacks)
+    assert 0 < profile.samples * 0.002 < profile.wall
+
+    (path,) = tmp_path.iterdir()
+    assert path.name.startswith("pipeline-event42-")
+    text = path.read_text()
+    assert text.startswith("# pipeline event_id=42\n# wall_ms=")
+    assert "test_profiling:_burn" in text
+
+
+async def test_other_tasks_are_not_credited(tmp_path):
+    profiler = Profiler({"output_dir": str(tmp_path), "sample_interval_ms": 2}, pipeline_rate=1.0, request_rate=0.0)
+
+    async def busy_neighbour():
+        await asyncio.sleep(0.01)
+        _burn(0.1)
+
+    neighbour = asyncio.create_task(busy_neighbour())
+    async with profiler.profile("pipeline", event_id=1) as profile:
+        await asyncio.sleep(0.15)
+    await neighbour
+
+    assert not any("_burn" in stack for stack in profile.stacks)
+
+
+async def test_unsampled_kinds_write_nothing(tmp_path):
+    profiler = Profiler({"output_dir": str(tmp_path)}, pipeline_rate=1.0, request_rate=0.0)
+
+    async with profiler.profile("request") as profile:
+        pass
+
+    assert profile is None
+    assert profiler.written == 0
+    profiler.set_rates(request=1.0)
+    async with profiler.profile("request") as profile:
+        pass
+    assert profile is not None
+    assert profiler.written == 1
+
+
+async def test_profiles_are_written_off_the_event_loop(tmp_path):
+    profiler = Profiler({"output_dir": str(tmp_path)}, pipeline_rate=1.0, request_rate=0.0)
+    write = profiler._write
+    writer_threads = []
+
+    def recording_write(profile):
+        writer_threads.append(threading.get_ident())
+        return write(profile)
+
+    profiler._write = recording_write
+    async with profiler.profile("pipeline", event_id=1):
+        pass
+
+    assert writer_threads and writer_threads[0] != threading.get_ident()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+async def test_loop_lag_monitor_sees_blocking_calls():
+    monitor = LoopLagMonitor(interval=0.01, warn_ms=20)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    time.sleep(0.1)  # blocks the loop
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    stats = monitor.stats()
+    assert stats["samples"] >= 3
+    assert stats["max_ms"] >= 80
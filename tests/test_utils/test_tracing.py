@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import respx
+
+from acquire.models.db import ChangeEvent, PipelineStatus
+from acquire.pipeline.orchestrator import run_pipeline
+from acquire.storage import repository
+from acquire.utils import tracing
+
+from tests.test_pipeline.test_orchestrator import _classify_response, _enrich_response, _mock_session_factory
+
+
+@pytest.fixture
+def spans(tmp_path):
+    """Export spans to a file; call the fixture value to flush and read them."""
+    path = tmp_path / "traces.jsonl"
+    tracing.setup_tracing({"enabled": True, "exporter": "file", "file_path": str(path), "flush_interval_seconds": 60})
+
+    def read() -> list[dict]:
+        tracing.shutdown_tracing()
+        return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+    yield read
+    tracing.shutdown_tracing()
+
+
+def test_spans_nest_and_inherit_event_attributes(spans):
+    with tracing.span("pipeline", event_id=7, parent_event_id=3):
+        with tracing.span("classify", model="m"):
+            pass
+        with pytest.raises(ValueError), tracing.span("enrich"):
+            raise ValueError("bad JSON")
+
+    by_name = {span["name"]: span for span in spans()}
+    root = by_name["pipeline"]
+    assert root["parent_span_id"] is None
+    for name in ("classify", "enrich"):
+        assert by_name[name]["trace_id"] == root["trace_id"]
+        assert by_name[name]["parent_span_id"] == root["span_id"]
+        assert by_name[name]["attributes"]["event_id"] == 7
+        assert by_name[name]["attributes"]["parent_event_id"] == 3
+    assert by_name["classify"]["attributes"]["model"] == "m"
+    assert by_name["enrich"]["error"] == "ValueError: bad JSON"
+    assert root["duration_ms"] >= by_name["classify"]["duration_ms"]
+
+
+def test_span_is_a_no_op_when_tracing_is_off():
+    with tracing.span("pipeline", event_id=1) as span:
+        assert span is None
+    assert tracing.current_span() is None
+
+
+@respx.mock
+async def test_transport_records_http_spans(spans):
+    respx.get("https://api.example.gov/items").mock(return_value=httpx.Response(204))
+
+    with tracing.span("fetch", event_id=1):
+        async with httpx.AsyncClient(transport=tracing.transport()) as client:
+            await client.get("https://api.example.gov/items?q=1")
+
+    http = next(span for span in spans() if span["name"] == "http GET")
+    assert http["attributes"] == {
+        "event_id": 1, "method": "GET", "host": "api.example.gov", "path": "/items", "status": 204,
+    }
+
+
+@pytest.mark.asyncio
+async def test_child_pipeline_joins_parent_trace(session, spans):
+    parent = ChangeEvent(watch_uuid="test-uuid", watch_url="https://example.gov")
+    session.add(parent)
+    await session.commit()
+    child = ChangeEvent(
+        watch_uuid="test-uuid",
+        watch_url="https://grants.gov/opportunity",
+        parent_event_id=parent.id,
+        snapshot_hash=await repository.put_content(session, "A grant opportunity for rural broadband"),
+        pipeline_status=PipelineStatus.FETCHED.value,
+    )
+    session.add(child)
+    await session.commit()
+
+    # As a worker would: the child runs on its own, outside the parent's pipeline
+    with (
+        patch("acquire.pipeline.orchestrator.get_session_factory", return_value=_mock_session_factory(session)),
+        patch("acquire.pipeline.classifier.chat_completion", new_callable=AsyncMock, return_value=_classify_response()),
+        patch("acquire.pipeline.classifier.check_budget", new_callable=AsyncMock, return_value=True),
+        patch("acquire.pipeline.enricher.chat_completion", new_callable=AsyncMock, return_value=_enrich_response()),
+        patch("acquire.pipeline.enricher.check_budget", new_callable=AsyncMock, return_value=True),
+    ):
+        await run_pipeline(child.id)
+
+    recorded = spans()
+    root = next(span for span in recorded if span["name"] == "pipeline")
+    assert root["trace_id"] == tracing.event_trace_id(parent.id)
+    assert root["parent_span_id"] == tracing.event_span_id(parent.id)
+    assert root["attributes"]["status"] == PipelineStatus.ENRICHED.value
+
+    names = [span["name"] for span in recorded]
+    assert {"classify", "enrich", "notify_queue", "db.commit"} <= set(names)
+    assert "triage" not in names
+    for span in recorded:
+        assert span["trace_id"] == root["trace_id"]
+        assert span["attributes"]["event_id"] == child.id
+        assert span["attributes"]["parent_event_id"] == parent.id
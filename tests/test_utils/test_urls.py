@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from acquire.utils.urls import canonicalize_url
+
+
+def test_canonicalize_equivalent_spellings():
+    variants = [
+        "https://www.Grants.gov/search/?b=2&a=1",
+        "https://grants.gov:443/search?a=1&b=2#results",
+        "HTTPS://grants.gov/search?utm_source=email&a=1&b=2",
+    ]
+    assert {canonicalize_url(url) for url in variants} == {"https://grants.gov/search?a=1&b=2"}
+
+
+def test_canonicalize_keeps_meaningful_differences():
+    assert canonicalize_url("http://sam.gov:8080/opp") == "http://sam.gov:8080/opp"
+    assert canonicalize_url("https://sam.gov/opp?id=1") != canonicalize_url("https://sam.gov/opp?id=2")
+    # ?sid= is often a solicitation id, not a session
+    assert canonicalize_url("https://bids.example.gov/view?sid=4411") != canonicalize_url(
+        "https://bids.example.gov/view?sid=4412"
+    )
+
+
+def test_canonicalize_drops_tracking_and_session_noise():
+    variants = [
+        "https://sam.gov/opp/123/view?fbclid=abc&utm_campaign=x",
+        "https://sam.gov/opp/123/view;jsessionid=A1B2C3?gclid=1",
+        "https://sam.gov/opp/123/view/index.html",
+        "https://SAM.gov./opp/123/view/?_ga=2.1",
+    ]
+    assert {canonicalize_url(url) for url in variants} == {"https://sam.gov/opp/123/view"}
+
+
+def test_canonicalize_normalizes_percent_escapes():
+    assert canonicalize_url("https://grants.gov/a%2fb") == canonicalize_url("https://grants.gov/a%2Fb")
+
+
+def test_canonicalize_leaves_malformed_urls_unchanged():
+    assert canonicalize_url(" https://grants.gov:99999/nofo ") == "https://grants.gov:99999/nofo"
+    assert canonicalize_url("http://[broken") == "http://[broken"